@@ -1,15 +1,26 @@
 #!/usr/bin/env python3
 """
-Oficialus Activision API - naudojant call-of-duty-api biblioteką
+Oficialus Activision API - naudojant call-of-duty-api biblioteką.
+Host'as atidedamas bendru backoff planuotoju (kaip HTTP tiekėjai), o viršijus minutės
+limitą užklausa praleidžiama, nelaukiant event loop'e.
 """
 
 import asyncio
 import json
 import time
 import os
-import subprocess
+import tempfile
 from typing import Dict, Optional, List
 
+from backoff import shared_scheduler
+from logs import get_logger
+from player_stats import PlayerStats
+
+log = get_logger('activision_api')
+
+# Host'as, į kurį kreipiasi call-of-duty-api (backoff planuotojo raktas)
+ACTIVISION_HOST = 'my.callofduty.com'
+
 class ActivisionAPI:
     def __init__(self, sso_token: str = None):
         """
@@ -19,64 +30,96 @@ class ActivisionAPI:
         self.sso_token = sso_token or os.getenv('ACT_SSO_COOKIE') or os.getenv('COD_SSO')
         self.request_times = []
         self.max_requests_per_minute = 20
-        self.retry_attempts = 3
+        # Bazinis atidėjimas po nesėkmės (toliau - eksponentiškai, žr. BackoffScheduler)
         self.retry_delay = 2
+        self.scheduler = shared_scheduler
+        # Paskutinio Node.js paleidimo informacija (diagnostikai)
+        self.last_returncode = None
+        self.last_output_size = 0
+
+    def _available(self) -> bool:
+        """
+        Ar galima kreiptis dabar: host'as neatidėtas ir neviršytas minutės limitas.
+        Niekada nelaukia - jei ne, užklausa praleidžiama.
+        """
+        remaining = self.scheduler.remaining(ACTIVISION_HOST)
+        if remaining > 0:
+            log.debug("Host'as atidėtas - praleidžiame", provider='activision', remaining_s=round(remaining))
+            return False
 
-    def _check_rate_limit(self):
-        """Patikrina rate limiting"""
         current_time = time.time()
         self.request_times = [t for t in self.request_times if current_time - t < 60]
-        
         if len(self.request_times) >= self.max_requests_per_minute:
-            sleep_time = 60 - (current_time - self.request_times[0])
-            if sleep_time > 0:
-                print(f"Rate limit pasiektas. Palaukiame {sleep_time:.1f} sekundžių...")
-                time.sleep(sleep_time)
-        
+            wait = 60 - (current_time - self.request_times[0])
+            log.info("Rate limit pasiektas - praleidžiame", provider='activision', wait_s=round(wait, 1))
+            return False
+
         self.request_times.append(current_time)
+        return True
 
     async def _run_node_script(self, script_content: str) -> Optional[Dict]:
         """Paleidžia Node.js skriptą ir grąžina rezultatą"""
+        script_file = None
         try:
-            # Sukuriame laikiną .js failą
-            script_file = "temp_activision_script.js"
-            with open(script_file, 'w') as f:
+            # Sukuriame laikiną .js failą (unikalus vardas - galima leisti lygiagrečiai)
+            with tempfile.NamedTemporaryFile('w', suffix='.js', prefix='temp_activision_', dir='.', delete=False) as f:
                 f.write(script_content)
+                script_file = f.name
             
-            # Paleidžiame Node.js skriptą
-            result = subprocess.run(
-                ['node', script_file],
-                capture_output=True,
-                text=True,
-                timeout=30
+            # Paleidžiame Node.js skriptą neblokuodami event loop
+            process = await asyncio.create_subprocess_exec(
+                'node', script_file,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=30)
+            except asyncio.TimeoutError:
+                delay = self.scheduler.record_failure(ACTIVISION_HOST, None, None, self.retry_delay)
+                log.warning("Node.js skriptas užtruko per ilgai, host'as atidėtas", provider='activision',
+                            delay_s=round(delay))
+                return None
+            finally:
+                # Pasibaigus laikui arba atšaukus (pvz. diagnostikos timeout) procesas nutraukiamas
+                # prieš ištrinant jo vykdomą skriptą
+                if process.returncode is None:
+                    try:
+                        process.kill()
+                    except ProcessLookupError:
+                        pass
+                    await asyncio.shield(process.wait())
             
-            # Išvalome laikiną failą
-            if os.path.exists(script_file):
-                os.remove(script_file)
+            self.last_returncode = process.returncode
+            self.last_output_size = len(stdout)
+            output = stdout.decode('utf-8', errors='replace').strip()
             
-            if result.returncode == 0 and result.stdout.strip():
-                return json.loads(result.stdout)
+            if process.returncode == 0 and output:
+                self.scheduler.record_success(ACTIVISION_HOST)
+                return json.loads(output)
             else:
-                print(f"Node.js klaida: {result.stderr}")
+                delay = self.scheduler.record_failure(ACTIVISION_HOST, None, None, self.retry_delay)
+                log.warning("Node.js klaida, host'as atidėtas", provider='activision', returncode=process.returncode,
+                            delay_s=round(delay), stderr=stderr.decode('utf-8', errors='replace').strip()[:500])
                 return None
                 
-        except subprocess.TimeoutExpired:
-            print("Node.js skriptas užtruko per ilgai")
-            return None
         except Exception as e:
-            print(f"Klaida paleidžiant Node.js skriptą: {str(e)}")
+            log.exception("Klaida paleidžiant Node.js skriptą", provider='activision')
             return None
+        finally:
+            # Išvalome laikiną failą
+            if script_file and os.path.exists(script_file):
+                os.remove(script_file)
 
-    async def get_player_stats(self, username: str, platform: str = "battlenet") -> Optional[Dict]:
+    async def get_player_stats(self, username: str, platform: str = "battlenet") -> Optional[PlayerStats]:
         """
         Gauna žaidėjo statistiką iš oficialaus Activision API
         """
         try:
-            self._check_rate_limit()
-            
             if not self.sso_token:
-                print("❌ COD_SSO token nerastas!")
+                log.warning("COD_SSO token nerastas", provider='activision')
+                return None
+
+            if not self._available():
                 return None
             
             # Normalizuojame platformą
@@ -89,7 +132,7 @@ class ActivisionAPI:
             # Nustatome platformą pagal Activision API
             cod_platform = "battle" if platform == "battlenet" else platform
             
-            print(f"Bandome gauti statistiką iš oficialaus Activision API: {clean_username} ({cod_platform})")
+            log.debug("Užklausa", provider='activision', player=clean_username, platform=cod_platform)
             
             # Node.js skriptas žaidėjo statistikos gavimui
             script = f"""
@@ -120,13 +163,12 @@ async function getPlayerStats() {{
             wins: stats.lifetime.all.properties.wins || 0,
             games_played: stats.lifetime.all.properties.gamesPlayed || 0,
             kd_ratio: stats.lifetime.all.properties.kdRatio || 0,
-            avg_life: stats.lifetime.all.properties.avgLifeTime || 0,
+            avg_life_time: stats.lifetime.all.properties.avgLifeTime || 0,
             score_per_minute: stats.lifetime.all.properties.scorePerMinute || 0,
             damage_done: stats.lifetime.all.properties.damageDone || 0,
             damage_taken: stats.lifetime.all.properties.damageTaken || 0,
             headshots: stats.lifetime.all.properties.headshots || 0,
-            accuracy: stats.lifetime.all.properties.accuracy || 0,
-            source: 'Activision API'
+            source: 'activision_api'
         }};
         
         console.log(JSON.stringify(result));
@@ -142,15 +184,15 @@ getPlayerStats();
             result = await self._run_node_script(script)
             
             if result and 'error' not in result:
-                print("✅ Oficialus Activision API sėkmingas!")
-                return result
+                log.debug("Statistika gauta", provider='activision', player=clean_username)
+                return PlayerStats.from_dict(result)
             else:
                 error_msg = result.get('error', 'Nežinoma klaida') if result else 'Nepavyko gauti duomenų'
-                print(f"❌ Oficialus Activision API klaida: {error_msg}")
+                log.warning("Activision API klaida", provider='activision', player=clean_username, error=error_msg)
                 return None
                 
         except Exception as e:
-            print(f"Klaida gaunant statistiką iš oficialaus Activision API: {str(e)}")
+            log.exception("Klaida gaunant statistiką", provider='activision', player=username)
             return None
 
     async def search_player(self, username: str, platform: str = "battlenet") -> Optional[Dict]:
@@ -158,10 +200,11 @@ getPlayerStats();
         Ieško žaidėjo pagal vardą
         """
         try:
-            self._check_rate_limit()
-            
             if not self.sso_token:
-                print("❌ COD_SSO token nerastas!")
+                log.warning("COD_SSO token nerastas", provider='activision')
+                return None
+
+            if not self._available():
                 return None
             
             # Normalizuojame platformą
@@ -174,7 +217,7 @@ getPlayerStats();
             # Nustatome platformą pagal Activision API
             cod_platform = "battle" if platform == "battlenet" else platform
             
-            print(f"Ieškome žaidėjo: {clean_username} ({cod_platform})")
+            log.debug("Ieškome žaidėjo", provider='activision', player=clean_username, platform=cod_platform)
             
             # Node.js skriptas žaidėjo paieškai
             script = f"""
@@ -210,15 +253,15 @@ searchPlayer();
             result = await self._run_node_script(script)
             
             if result and result.get('found', False):
-                print("✅ Žaidėjas rastas!")
+                log.debug("Žaidėjas rastas", provider='activision', player=clean_username)
                 return result
             else:
                 error_msg = result.get('error', 'Nežinoma klaida') if result else 'Nepavyko rasti žaidėjo'
-                print(f"❌ Žaidėjo paieškos klaida: {error_msg}")
+                log.warning("Žaidėjo paieškos klaida", provider='activision', player=clean_username, error=error_msg)
                 return None
                 
         except Exception as e:
-            print(f"Klaida ieškant žaidėjo: {str(e)}")
+            log.exception("Klaida ieškant žaidėjo", provider='activision', player=username)
             return None
 
 # Testavimo funkcija
@@ -256,11 +299,11 @@ async def test_activision_api():
             
             if stats:
                 print("✅ Statistikos gavimas sėkmingas!")
-                print(f"   Žudymai: {stats.get('kills', 0):,}")
-                print(f"   Mirtys: {stats.get('deaths', 0):,}")
-                print(f"   K/D: {stats.get('kd_ratio', 0):.2f}")
-                print(f"   Perėmimai: {stats.get('wins', 0):,}")
-                print(f"   Žaidimai: {stats.get('games_played', 0):,}")
+                print(f"   Žudymai: {stats.kills:,}")
+                print(f"   Mirtys: {stats.deaths:,}")
+                print(f"   K/D: {stats.kd_ratio:.2f}")
+                print(f"   Perėmimai: {stats.wins:,}")
+                print(f"   Žaidimai: {stats.games_played:,}")
             else:
                 print("❌ Statistikos gavimas nepavyko")
         else:
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Bendras backoff planuotojas - pagal Retry-After ir x-ratelimit-* antraštes
+bei eksponentinį laukimą su jitter nustato, kada vėl galima kreiptis į kiekvieną host'ą
+"""
+
+import random
+import time
+import urllib.parse
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+# Kodai, po kurių host'as atidedamas (kiti klaidų kodai - pvz. 404 - host'o neblokuoja)
+BACKOFF_STATUSES = (403, 408, 425, 429, 500, 502, 503, 504)
+
+# Ribos likučio ir atsinaujinimo antraštės (RapidAPI naudoja x-ratelimit-requests-*)
+RATELIMIT_HEADERS = (
+    ('x-ratelimit-remaining', 'x-ratelimit-reset'),
+    ('x-ratelimit-requests-remaining', 'x-ratelimit-requests-reset'),
+)
+
+
+class BackoffScheduler:
+    def __init__(self, base_delay: float = 2, max_delay: float = 900, jitter: float = 0.5):
+        """
+        Inicializuoja planuotoją
+        :param base_delay: pirmo atidėjimo trukmė sekundėmis (dvigubėja po kiekvienos nesėkmės)
+        :param max_delay: ilgiausias atidėjimas
+        :param jitter: kokia atidėjimo dalis parenkama atsitiktinai (0 - be jitter)
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        # host -> {'failures', 'next_allowed', 'reason'}
+        self.hosts: Dict[str, Dict] = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urllib.parse.urlsplit(url).netloc
+
+    def next_allowed(self, host: str) -> float:
+        """Laikas (time.time()), nuo kurio host'ą vėl galima užklausti"""
+        state = self.hosts.get(host)
+        return state['next_allowed'] if state else 0.0
+
+    def remaining(self, host: str, now: Optional[float] = None) -> float:
+        """Kiek sekundžių dar liko laukti (0 - galima kreiptis)"""
+        now = now if now is not None else time.time()
+        return max(0.0, self.next_allowed(host) - now)
+
+    def failures(self, host: str) -> int:
+        state = self.hosts.get(host)
+        return state['failures'] if state else 0
+
+    @staticmethod
+    def parse_retry_after(headers: Mapping[str, str], now: Optional[float] = None) -> Optional[float]:
+        """
+        Retry-After gali būti sekundės arba HTTP data
+        """
+        value = headers.get('Retry-After')
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            moment = parsedate_to_datetime(value).timestamp()
+        except (TypeError, ValueError):
+            return None
+        now = now if now is not None else time.time()
+        return max(0.0, moment - now)
+
+    @staticmethod
+    def parse_ratelimit(headers: Mapping[str, str], now: Optional[float] = None) -> Optional[float]:
+        """
+        Jei x-ratelimit-*-remaining lygus 0, grąžina kiek sekundžių iki reset
+        (reset gali būti sekundės arba unix laikas)
+        """
+        now = now if now is not None else time.time()
+        for remaining_header, reset_header in RATELIMIT_HEADERS:
+            remaining = headers.get(remaining_header)
+            if remaining is None:
+                continue
+            try:
+                if float(remaining) > 0:
+                    return None
+                reset = float(headers.get(reset_header, 60))
+            except ValueError:
+                return None
+            # Didelės reikšmės - unix laikas, mažos - sekundės
+            return max(0.0, reset - now) if reset > 10 ** 9 else reset
+        return None
+
+    def _backoff_delay(self, failures: int, base_delay: Optional[float]) -> float:
+        """Eksponentinis atidėjimas su jitter"""
+        delay = min(self.max_delay, (base_delay or self.base_delay) * (2 ** (failures - 1)))
+        return delay * (1 - self.jitter * random.random())
+
+    def record_success(self, host: str, headers: Optional[Mapping[str, str]] = None, now: Optional[float] = None):
+        """
+        Sėkminga užklausa - nuliname nesėkmes, bet gerbiame išnaudotą ribą
+        """
+        now = now if now is not None else time.time()
+        state = self.hosts.setdefault(host, {'failures': 0, 'next_allowed': 0.0, 'reason': ''})
+        state['failures'] = 0
+        state['next_allowed'] = 0.0
+        state['reason'] = ''
+
+        delay = self.parse_ratelimit(headers or {}, now)
+        if delay:
+            state['next_allowed'] = now + delay
+            state['reason'] = 'ratelimit'
+
+    def record_failure(self, host: str, status: Optional[int] = None,
+                       headers: Optional[Mapping[str, str]] = None,
+                       base_delay: Optional[float] = None, now: Optional[float] = None) -> float:
+        """
+        Nesėkminga užklausa - atidedame host'ą. Grąžina atidėjimą sekundėmis.
+        :param status: HTTP kodas (None - tinklo klaida)
+        :param base_delay: tiekėjo bazinis atidėjimas (None - planuotojo numatytasis)
+        """
+        now = now if now is not None else time.time()
+        headers = headers or {}
+        state = self.hosts.setdefault(host, {'failures': 0, 'next_allowed': 0.0, 'reason': ''})
+        state['failures'] += 1
+
+        delay = self.parse_retry_after(headers, now)
+        if delay is None:
+            delay = self.parse_ratelimit(headers, now)
+        if delay is None:
+            delay = self._backoff_delay(state['failures'], base_delay)
+        delay = min(delay, self.max_delay)
+
+        state['next_allowed'] = max(state['next_allowed'], now + delay)
+        state['reason'] = str(status) if status else 'tinklas'
+        return delay
+
+    def format_status(self, now: Optional[float] = None) -> str:
+        """
+        Formatuoja atidėtų host'ų sąrašą
+        """
+        now = now if now is not None else time.time()
+        blocked = [(host, state) for host, state in self.hosts.items() if state['next_allowed'] > now]
+        if not blocked:
+            return "⏱️ Visi API host'ai pasiekiami"
+
+        lines = ["⏱️ Atidėti API host'ai:"]
+        for host, state in sorted(blocked, key=lambda item: item[1]['next_allowed']):
+            lines.append(
+                f"• `{host}` - dar {state['next_allowed'] - now:.0f} s "
+                f"({state['reason']}, nesėkmių: {state['failures']})"
+            )
+        return "\n".join(lines)
+
+
+# Bendras planuotojas visiems tiekėjams
+shared_scheduler = BackoffScheduler()
@@ -0,0 +1,7 @@
+"""
+Benchmark'ai - paleidžiami iš repozitorijos šakninio katalogo:
+
+    python -m bench fetch --rosters 10,100,1000
+
+Rezultatai rašomi į bench/results/*.json, kad paleidimus būtų galima palyginti.
+"""
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark'ų paleidimas: python -m bench <suite> [parametrai]
+"""
+
+import argparse
+import asyncio
+import tempfile
+
+from bench import database, fetch, startup
+from bench.common import write_results
+from logs import configure_logging
+
+
+def _list(value: str):
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def run_fetch(args):
+    rosters = [int(size) for size in _list(args.rosters)]
+    failures = _list(args.failures)
+    latencies = _list(args.latencies)
+    for name in failures:
+        if name not in fetch.FAILURE_MIXES:
+            raise SystemExit(f"Nežinomas klaidų mišinys: {name} ({', '.join(fetch.FAILURE_MIXES)})")
+    for name in latencies:
+        if name not in fetch.LATENCY_PROFILES:
+            raise SystemExit(f"Nežinomas vėlinimo profilis: {name} ({', '.join(fetch.LATENCY_PROFILES)})")
+
+    if args.verbose:
+        configure_logging('DEBUG')
+    print(fetch.format_header())
+    runs = asyncio.run(fetch.sweep(rosters, failures, latencies, args.limits, args.seed, args.verbose))
+    config = {'rosters': rosters, 'failures': failures, 'latencies': latencies,
+              'limits': args.limits, 'seed': args.seed}
+    print(f"\n📄 Rezultatai: {write_results('fetch', config, runs, args.output)}")
+
+
+def run_db(args):
+    sizes = [int(rows) for rows in _list(args.rows)]
+    runs = []
+    with tempfile.TemporaryDirectory(dir=args.workdir) as workdir:
+        for rows in sizes:
+            run = database.run_size(rows, args.players, args.days, args.samples, workdir, args.seed)
+            runs.append(run)
+            print(database.format_run(run) + "\n")
+    config = {'rows': sizes, 'players': args.players, 'days': args.days, 'samples': args.samples, 'seed': args.seed}
+    print(f"📄 Rezultatai: {write_results('db', config, runs, args.output)}")
+
+
+def run_startup(args):
+    result = startup.run(args.samples, args.module, args.top)
+    print(startup.format_run(result))
+    config = {'samples': args.samples, 'module': args.module}
+    print(f"\n📄 Rezultatai: {write_results('startup', config, [result], args.output)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Warzone boto benchmark'ai")
+    suites = parser.add_subparsers(dest='suite', required=True)
+
+    fetch_parser = suites.add_parser('fetch', help="StatsFetcher prieš API imitatorių")
+    fetch_parser.add_argument('--rosters', default='10,100,1000', help="žaidėjų skaičiai, pvz. 10,100,1000")
+    fetch_parser.add_argument('--failures', default='none,flaky', help=f"{', '.join(fetch.FAILURE_MIXES)}")
+    fetch_parser.add_argument('--latencies', default='lan', help=f"{', '.join(fetch.LATENCY_PROFILES)}")
+    fetch_parser.add_argument('--limits', action='store_true', help="palikti tiekėjų minutės limitus")
+    fetch_parser.add_argument('--seed', type=int, default=1)
+    fetch_parser.add_argument('--output', help="rezultatų JSON failas (numatyta bench/results/)")
+    fetch_parser.add_argument('--verbose', action='store_true', help="rodyti tiekėjų išvestį")
+    fetch_parser.set_defaults(run=run_fetch)
+
+    db_parser = suites.add_parser('db', help="WarzoneDatabase su sintetiniais žaidimais")
+    db_parser.add_argument('--rows', default='10000,100000,1000000', help="wz_valid_games eilučių skaičiai")
+    db_parser.add_argument('--players', type=int, default=300)
+    db_parser.add_argument('--days', type=int, default=180, help="per kiek dienų paskirstomi žaidimai")
+    db_parser.add_argument('--samples', type=int, default=50, help="kiek kartų kviečiamas kiekvienas metodas")
+    db_parser.add_argument('--seed', type=int, default=1)
+    db_parser.add_argument('--workdir', help="katalogas laikinoms DB (reikia vietos milijonams eilučių)")
+    db_parser.add_argument('--output', help="rezultatų JSON failas (numatyta bench/results/)")
+    db_parser.set_defaults(run=run_db)
+
+    startup_parser = suites.add_parser('startup', help="šaltas paleidimas (import bot naujame procese)")
+    startup_parser.add_argument('--samples', type=int, default=5, help="kiek kartų paleisti")
+    startup_parser.add_argument('--module', default='bot', help="importuojamas modulis")
+    startup_parser.add_argument('--top', type=int, default=10, help="kiek importų rodyti")
+    startup_parser.add_argument('--output', help="rezultatų JSON failas (numatyta bench/results/)")
+    startup_parser.set_defaults(run=run_startup)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Bendros benchmark'ų pagalbinės funkcijos - procentiliai, atminties pikas, rezultatų failai
+"""
+
+import contextlib
+import json
+import logging
+import os
+import platform
+import resource
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Procentilis su tiesine interpoliacija (q nuo 0 iki 100)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def latency_summary(values_ms: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/max milisekundėmis"""
+    return {
+        'p50_ms': round(percentile(values_ms, 50), 2),
+        'p95_ms': round(percentile(values_ms, 95), 2),
+        'p99_ms': round(percentile(values_ms, 99), 2),
+        'max_ms': round(max(values_ms), 2) if values_ms else 0.0
+    }
+
+
+def reset_peak_rss() -> str:
+    """
+    Nustato RSS piką iš naujo prieš paleidimą (Linux: /proc/self/clear_refs, VmHWM).
+    :return: peak_rss_mb apimtis - 'run' (šio paleidimo pikas) arba 'process' (viso proceso,
+             kai atstatyti negalima, pvz. macOS - tada sweep'e reikšmė tik auga)
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return 'run'
+    except OSError:
+        return 'process'
+
+
+def peak_rss_mb() -> float:
+    """
+    Atminties (RSS) pikas MB nuo paskutinio reset_peak_rss() (Linux VmHWM),
+    kitur - viso proceso ru_maxrss (Linux - KB, macOS - baitai)
+    """
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak /= 1024
+    return round(peak / 1024, 1)
+
+
+@contextlib.contextmanager
+def quiet(enabled: bool = True):
+    """Nutildo tiekėjų žurnalą ir print() išvestį matavimo metu"""
+    if not enabled:
+        yield
+        return
+    logging.disable(logging.CRITICAL)
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+@contextlib.contextmanager
+def working_directory(path: str):
+    """Laikinai pakeičia darbinį katalogą (botas rašo būsenos failus į jį)"""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def write_results(name: str, config: Dict, runs: List[Dict], output: Optional[str] = None) -> str:
+    """
+    Įrašo rezultatus į JSON failą ir grąžina jo kelią
+    """
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{name}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    report = {
+        'benchmark': name,
+        'created_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': config,
+        'runs': runs
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    return output
+
+
+class Timer:
+    """Paprastas laikmatis: with Timer() as t: ...; t.seconds"""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.start
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+WarzoneDatabase benchmark'as su sintetiniais žaidimais - metodų trukmė skirtingais
+duomenų kiekiais ir kiekvieno vykdomo SQL sakinio EXPLAIN QUERY PLAN
+"""
+
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from bench.common import Timer, latency_summary, peak_rss_mb, reset_peak_rss
+from bench.synthetic_games import generate_game, populate
+from database import WarzoneDatabase
+from mock_upstream import synthetic_stats
+
+
+class TracedDatabase(WarzoneDatabase):
+    """WarzoneDatabase, kuri gali užfiksuoti vykdomus SQL sakinius (su įstatytais parametrais)"""
+
+    def __init__(self, db_path: str):
+        self.statements = None
+        super().__init__(db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = super()._connect()
+        if self.statements is not None:
+            conn.set_trace_callback(self.statements.append)
+        return conn
+
+    def capture(self, method: Callable, *args) -> List[str]:
+        """Iškviečia metodą ir grąžina jo vykdytus SQL sakinius (be BEGIN/COMMIT)"""
+        self.statements = []
+        try:
+            method(*args)
+            return [sql for sql in self.statements
+                    if sql.lstrip().split(None, 1)[0].upper() in ('SELECT', 'INSERT', 'UPDATE', 'DELETE')]
+        finally:
+            self.statements = None
+
+    def explain(self, sql: str) -> List[str]:
+        """EXPLAIN QUERY PLAN eilutės (detail stulpelis)"""
+        with sqlite3.connect(self.db_path) as conn:
+            return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()]
+
+
+def _time_calls(method: Callable, calls: List[tuple]) -> List[float]:
+    """Kiekvieno iškvietimo trukmė milisekundėmis"""
+    timings = []
+    for args in calls:
+        start = time.perf_counter()
+        method(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def run_size(rows: int, player_count: int, days: int, samples: int, workdir: str, seed: int = 1) -> Dict:
+    """
+    Vienas duomenų dydis: užpildo DB, išmatuoja metodus ir surenka užklausų planus
+    """
+    rss_scope = reset_peak_rss()
+    db_path = os.path.join(workdir, f"warzone_{rows}.db")
+    db = TracedDatabase(db_path)
+    populated = populate(db, player_count, rows, days, seed)
+    players = populated['players']
+
+    rng = random.Random(seed + 1)
+    names = [rng.choice(players)['player_id'] for _ in range(samples)]
+    teams = [[player['player_id'] for player in rng.sample(players, min(5, len(players)))]
+             for _ in range(max(1, samples // 5))]
+
+    # save_game_stats rašo į raw_games (naujas žaidimas esamam žaidėjui)
+    new_games = []
+    for i in range(samples):
+        player = rng.choice(players)
+        game_id = f"bench-{i}"
+        game = generate_game(player['uno_id'], synthetic_stats(player['activision_tag']), game_id,
+                             datetime.now(), rng)
+        new_games.append((game_id, player['uno_id'], game))
+
+    operations = {
+        'save_game_stats': (db.save_game_stats, new_games),
+        'get_player_recent_stats': (db.get_player_recent_stats, [(name, 7) for name in names]),
+        'get_player_summary_stats': (db.get_player_summary_stats, [(name, 30) for name in names]),
+        'get_team_stats': (db.get_team_stats, [(team, 7) for team in teams])
+    }
+
+    results = {}
+    for name, (method, calls) in operations.items():
+        # Planą renkame iš pirmo iškvietimo sakinių (pasikartojantys sakiniai - vienas planas)
+        plans = {}
+        for sql in db.capture(method, *calls[0]):
+            shape = sql.split(' WHERE ')[0]
+            if shape not in plans:
+                plans[shape] = {'sql': " ".join(sql.split())[:500], 'plan': db.explain(sql)}
+        with Timer() as timer:
+            timings = _time_calls(method, calls)
+        results[name] = {
+            'calls': len(calls),
+            'total_ms': round(timer.seconds * 1000, 1),
+            **latency_summary(timings),
+            'query_plans': list(plans.values())
+        }
+
+    return {
+        'rows': rows,
+        'players': player_count,
+        'days': days,
+        'populate_seconds': populated['seconds'],
+        'db_mb': round(os.path.getsize(db_path) / 1024 / 1024, 1),
+        'operations': results,
+        'peak_rss_mb': peak_rss_mb(),
+        'peak_rss_scope': rss_scope
+    }
+
+
+def format_run(run: Dict) -> str:
+    """Dydžio rezultatai su planais (SCAN be indekso - įspėjimas)"""
+    lines = [f"📦 {run['rows']:,} eilučių, {run['players']} žaidėjų, {run['db_mb']} MB "
+             f"(užpildyta per {run['populate_seconds']} s)"]
+    lines.append(f"   {'Metodas':<26}{'kart.':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, result in run['operations'].items():
+        lines.append(f"   {name:<26}{result['calls']:>6}{result['p50_ms']:>9.2f}"
+                     f"{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}")
+        for query in result['query_plans']:
+            for detail in query['plan']:
+                marker = "⚠️ " if detail.startswith('SCAN') else "   "
+                lines.append(f"      {marker}{detail}")
+    return "\n".join(lines)
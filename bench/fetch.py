@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+StatsFetcher.get_all_players_stats benchmark'as prieš vietinį API imitatorių (mock_upstream.py):
+žaidėjų skaičiaus, klaidų mišinio ir vėlinimo profilio matrica
+"""
+
+import itertools
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+from backoff import shared_scheduler
+from bench.common import Timer, latency_summary, peak_rss_mb, quiet, reset_peak_rss, working_directory
+from http_cache import HTTPCache
+from http_client import shared_client
+from mock_upstream import MockUpstream
+from stats_fetcher import StatsFetcher
+
+# Vėlinimo profiliai (žr. mock_upstream.sample_latency)
+LATENCY_PROFILES = {
+    'instant': ('fixed', 0.0),
+    'lan': ('lognormal', 0.005, 0.3),
+    'internet': ('lognormal', 0.08, 0.5),
+    'slow': ('lognormal', 0.4, 0.8)
+}
+
+# Klaidų mišiniai - visiems host'ams
+FAILURE_MIXES = {
+    'none': {'errors': {}},
+    'flaky': {'errors': {503: 0.05, 429: 0.02}, 'retry_after': 5},
+    'degraded': {'errors': {429: 0.2, 503: 0.1, 403: 0.05}, 'retry_after': 30},
+    'hangs': {'errors': {}, 'timeout_rate': 0.01, 'timeout_seconds': 60}
+}
+
+
+def _lift_limits(fetcher):
+    """Išjungia minutės limitus, kad būtų matuojamas pats gavimo kelias, o ne RequestLimiter"""
+    for provider in fetcher.providers.values():
+        for limited in [provider] + getattr(provider, 'members', []):
+            limited.limiter.per_minute = 10 ** 9
+
+
+async def run_once(roster: int, failure: str, latency: str, workdir: str,
+                   keep_limits: bool = False, seed: int = 1, verbose: bool = False) -> Dict:
+    """
+    Vienas paleidimas: paleidžia imitatorių, sukuria tikrą StatsFetcher ir gauna viso sąrašo statistiką
+    """
+    mix = FAILURE_MIXES[failure]
+    rss_scope = reset_peak_rss()
+    upstream = MockUpstream(seed=seed, latency=LATENCY_PROFILES[latency], **mix)
+    await upstream.start()
+
+    os.environ['PROVIDER_BASE_URLS'] = upstream.env()
+    os.environ['PLAYER_FETCH_DELAY'] = '0'
+    shared_scheduler.hosts.clear()
+    shared_client.usage = {}
+    shared_client.cache = HTTPCache(os.path.join(workdir, 'http_cache.db'))
+
+    timings: List[float] = []
+    try:
+        with working_directory(workdir), quiet(not verbose):
+            # Tiekėjai kuriami su imitatoriaus URL (PROVIDER_BASE_URLS)
+            fetcher = StatsFetcher()
+            if not keep_limits:
+                _lift_limits(fetcher)
+            fetcher.players = [
+                {'username': f"bench{i}#{1000 + i}", 'platform': 'battlenet', 'is_active': True}
+                for i in range(roster)
+            ]
+
+            fetch_one = fetcher.get_player_stats
+
+            async def timed(username, platform="battlenet", deadline=None):
+                start = time.perf_counter()
+                try:
+                    return await fetch_one(username, platform, deadline)
+                finally:
+                    timings.append((time.perf_counter() - start) * 1000)
+
+            fetcher.get_player_stats = timed
+
+            with Timer() as timer:
+                all_stats = await fetcher.get_all_players_stats()
+            # Rašymo gijos baigia įrašymus, kol darbinis katalogas dar yra
+            fetcher.roster.wait()
+            fetcher.stats_history.flush()
+    finally:
+        await upstream.stop()
+        shared_client.cache.close()
+        for name in ('PROVIDER_BASE_URLS', 'PLAYER_FETCH_DELAY'):
+            os.environ.pop(name, None)
+
+    calls = upstream.calls()
+    statuses: Dict[str, int] = {}
+    for hits in upstream.hits.values():
+        for status, count in hits.items():
+            statuses[str(status)] = statuses.get(str(status), 0) + count
+
+    return {
+        'roster': roster,
+        'failure': failure,
+        'latency': latency,
+        'limits': keep_limits,
+        'seconds': round(timer.seconds, 3),
+        'players_per_second': round(roster / timer.seconds, 2) if timer.seconds else 0.0,
+        'fetched': sum(1 for stats in all_stats if not stats.is_fallback),
+        'stale': sum(1 for stats in all_stats if stats.is_fallback),
+        'missing': roster - len(all_stats),
+        **latency_summary(timings),
+        'upstream_calls': calls,
+        'calls_per_player': round(calls / roster, 2) if roster else 0.0,
+        'statuses': statuses,
+        'peak_rss_mb': peak_rss_mb(),
+        'peak_rss_scope': rss_scope
+    }
+
+
+async def sweep(rosters: List[int], failures: List[str], latencies: List[str],
+                keep_limits: bool = False, seed: int = 1, verbose: bool = False) -> List[Dict]:
+    """
+    Paleidžia visas kombinacijas (kiekviena - atskirame laikiname kataloge)
+    """
+    runs = []
+    cache = shared_client.cache
+    try:
+        for roster, failure, latency in itertools.product(rosters, failures, latencies):
+            with tempfile.TemporaryDirectory() as workdir:
+                result = await run_once(roster, failure, latency, workdir, keep_limits, seed, verbose)
+            runs.append(result)
+            print(format_run(result))
+    finally:
+        shared_client.cache = cache
+        await shared_client.close()
+    return runs
+
+
+def format_header() -> str:
+    return (f"{'Žaid.':>6} {'Klaidos':<9}{'Vėlinimas':<10}{'s':>8}{'žaid./s':>9}"
+            f"{'p50':>8}{'p95':>8}{'p99':>8}{'užkl./ž':>8}{'seni':>6}{'nėra':>6}{'RSS MB':>8}")
+
+
+def format_run(run: Dict) -> str:
+    return (f"{run['roster']:>6} {run['failure']:<9}{run['latency']:<10}{run['seconds']:>8.2f}"
+            f"{run['players_per_second']:>9.1f}{run['p50_ms']:>8.1f}{run['p95_ms']:>8.1f}{run['p99_ms']:>8.1f}"
+            f"{run['calls_per_player']:>8.2f}{run['stale']:>6}{run['missing']:>6}{run['peak_rss_mb']:>8.1f}")
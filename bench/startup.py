@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Šalto paleidimo benchmark'as - kiek laiko užtrunka `import bot` (konfigūracija, tiekėjų
+registras, StatsFetcher, discord.py) naujame procese iki bot.run(). Atskirai paleidžiamas
+tuščias interpretatorius (bazė) ir vienas `-X importtime` paleidimas modulių išskaidymui.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from bench.common import latency_summary
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _environment() -> Dict[str, str]:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = REPO_ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    # Importuojant bot.run() nekviečiamas - tokenas tik tam, kad nereikėtų .env
+    env['DISCORD_TOKEN'] = 'bench'
+    env.pop('PYTHONPROFILEIMPORTTIME', None)
+    return env
+
+
+def _run(code: str, workdir: str, env: Dict[str, str], options: Tuple[str, ...] = ()) -> Tuple[float, str]:
+    """Vienas naujas procesas: (trukmė sekundėmis, stderr)"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, *options, '-c', code], cwd=workdir, env=env,
+                            capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Paleidimas nepavyko ({code}):\n{result.stderr[-2000:]}")
+    return seconds, result.stderr
+
+
+def parse_importtime(output: str) -> List[Dict]:
+    """
+    `-X importtime` išvestis -> [{'module', 'self_ms', 'cumulative_ms'}]
+    Eilutės formatas: 'import time:       123 |        456 |   module'
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        modules.append({'module': name.strip(), 'self_ms': int(self_us) / 1000,
+                        'cumulative_ms': int(cumulative_us) / 1000})
+    return modules
+
+
+def project_modules() -> set:
+    """Projekto moduliai (viršutinio lygio .py failai)"""
+    return {name[:-3] for name in os.listdir(REPO_ROOT) if name.endswith('.py')}
+
+
+def run(samples: int = 5, module: str = 'bot', top: int = 10) -> Dict:
+    """
+    Matuoja šaltą paleidimą
+    :param samples: kiek kartų paleisti (kiekvienas - naujas procesas)
+    :param module: importuojamas modulis
+    :param top: kiek daugiausiai laiko užimančių importų rodyti
+    """
+    env = _environment()
+    with tempfile.TemporaryDirectory() as workdir:
+        # Pirmas paleidimas sušildo .pyc ir failų sistemos talpyklą - neskaičiuojamas
+        _run(f"import {module}", workdir, env)
+        baseline = [_run('pass', workdir, env)[0] * 1000 for _ in range(samples)]
+        startup = [_run(f"import {module}", workdir, env)[0] * 1000 for _ in range(samples)]
+        _, importtime = _run(f"import {module}", workdir, env, ('-X', 'importtime'))
+
+    modules = parse_importtime(importtime)
+    ours = project_modules()
+    return {
+        'module': module,
+        'samples': samples,
+        'interpreter': latency_summary(baseline),
+        'startup': latency_summary(startup),
+        'imports_ms': round(sum(entry['self_ms'] for entry in modules), 1),
+        'top_self': sorted(modules, key=lambda entry: entry['self_ms'], reverse=True)[:top],
+        'project': sorted((entry for entry in modules if entry['module'] in ours),
+                          key=lambda entry: entry['cumulative_ms'], reverse=True)[:top]
+    }
+
+
+def format_run(result: Dict) -> str:
+    lines = [
+        f"🚀 import {result['module']} ({result['samples']} k.): "
+        f"p50 {result['startup']['p50_ms']:.0f} ms, max {result['startup']['max_ms']:.0f} ms",
+        f"   tuščias interpretatorius: p50 {result['interpreter']['p50_ms']:.0f} ms, "
+        f"importai (importtime): {result['imports_ms']:.0f} ms",
+        "   daugiausiai savo laiko:"
+    ]
+    for entry in result['top_self']:
+        lines.append(f"     {entry['self_ms']:7.1f} ms  {entry['module']}")
+    lines.append("   projekto moduliai (su priklausomybėmis):")
+    for entry in result['project']:
+        lines.append(f"     {entry['cumulative_ms']:7.1f} ms  {entry['module']}")
+    return "\n".join(lines)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Sintetinių žaidimų generatorius WarzoneDatabase benchmark'ams - tikroviškos
+players/wz_valid_games/raw_games eilutės per šimtus žaidėjų ir kelis mėnesius.
+Žaidėjo lygis imamas iš mock_upstream.synthetic_stats (buvusių fallback duomenų ribos).
+"""
+
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from database import WarzoneDatabase
+from mock_upstream import MATCH_MODES, synthetic_stats
+
+WZ_VALID_COLUMNS = (
+    'date_key', 'game_mode', 'game_mode_sub', 'game_id', 'player_uno_id', 'numberOfPlayers', 'numberOfTeams',
+    'score', 'scorePerMinute', 'kills', 'deaths', 'damageDone', 'damageTaken', 'gulagKills', 'gulagDeaths',
+    'teamPlacement', 'kdRatio', 'distanceTraveled', 'headshots', 'objectiveBrCacheOpen', 'objectiveReviver',
+    'objectiveBrDownAll', 'objectiveDestroyedVehicleAll', 'stats'
+)
+
+INSERT_WZ_VALID = (
+    f"INSERT OR REPLACE INTO wz_valid_games({', '.join(WZ_VALID_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in WZ_VALID_COLUMNS)})"
+)
+INSERT_RAW = "INSERT OR REPLACE INTO raw_games(game_id, player_uno_id, stats) VALUES (?, ?, ?)"
+INSERT_PLAYER = "INSERT OR REPLACE INTO players(player_uno_id, player_id, activision_tag, is_core) VALUES (?, ?, ?, ?)"
+
+
+def generate_players(count: int, rng: random.Random) -> List[Dict]:
+    """Sugeneruoja žaidėjus (pirmi 10 - komandos branduolys)"""
+    return [{
+        'player_id': f"zaidejas{i}",
+        'uno_id': str(rng.getrandbits(62)),
+        'activision_tag': f"Zaidejas{i}#{rng.randint(1000, 9999999)}",
+        'is_core': i < 10
+    } for i in range(count)]
+
+
+def generate_game(player_uno_id: str, profile: Dict, game_id: str, played_at: datetime,
+                  rng: random.Random) -> Dict:
+    """
+    Vieno žaidimo statistika pagal žaidėjo profilį (vidutiniai žudymai, K/D, taškai/min, perėmimų dalis)
+    """
+    kills_per_game = profile['kills'] / max(1, profile['games_played'])
+    win_rate = profile['wins'] / max(1, profile['games_played'])
+
+    kills = min(30, int(rng.expovariate(1 / kills_per_game)))
+    deaths = rng.randint(0, 3)
+    players = rng.choice((150, 152, 120, 100))
+    teams = players // rng.choice((4, 3, 2))
+    placement = 1 if rng.random() < win_rate / 4 else rng.randint(2, teams)
+    minutes = rng.randint(3, 30) if placement > 10 else rng.randint(15, 30)
+    score_per_minute = round(profile['score_per_minute'] * rng.uniform(0.5, 1.5), 2)
+
+    return {
+        'date_key': played_at.strftime('%Y-%m-%d %H:%M:%S'),
+        'game_mode': 'wz',
+        'game_mode_sub': rng.choice(MATCH_MODES),
+        'game_id': game_id,
+        'player_uno_id': player_uno_id,
+        'numberOfPlayers': players,
+        'numberOfTeams': teams,
+        'score': int(score_per_minute * minutes),
+        'scorePerMinute': score_per_minute,
+        'kills': kills,
+        'deaths': deaths,
+        'damageDone': kills * rng.randint(800, 1200) // 4 + rng.randint(0, 400),
+        'damageTaken': max(1, deaths) * rng.randint(600, 1000) // 4,
+        'gulagKills': rng.randint(0, 1),
+        'gulagDeaths': rng.randint(0, 1),
+        'teamPlacement': placement,
+        'kdRatio': round(kills / deaths, 2) if deaths else float(kills),
+        'distanceTraveled': round(rng.uniform(50000, 400000), 1),
+        'headshots': int(kills * rng.uniform(0.1, 0.3)),
+        'objectiveBrCacheOpen': rng.randint(0, 20),
+        'objectiveReviver': rng.randint(0, 3),
+        'objectiveBrDownAll': kills + rng.randint(0, 3),
+        'objectiveDestroyedVehicleAll': rng.randint(0, 2)
+    }
+
+
+def generate_rows(players: List[Dict], total_rows: int, days: int, rng: random.Random,
+                  now: Optional[datetime] = None) -> Iterator[Tuple[Tuple, Tuple]]:
+    """
+    Generuoja (wz_valid_games eilutė, raw_games eilutė) poras - tolygiai per žaidėjus ir dienas
+    """
+    now = now or datetime.now()
+    per_player, extra = divmod(total_rows, len(players))
+    for index, player in enumerate(players):
+        profile = synthetic_stats(player['activision_tag'])
+        for _ in range(per_player + (1 if index < extra else 0)):
+            played_at = now - timedelta(seconds=rng.uniform(0, days * 86400))
+            game_id = str(rng.getrandbits(63))
+            game = generate_game(player['uno_id'], profile, game_id, played_at, rng)
+            stats = json.dumps(game, separators=(',', ':'))
+            raw = json.dumps({
+                'matchID': game_id,
+                'utcStartSeconds': int(played_at.timestamp()),
+                'mode': game['game_mode_sub'],
+                'playerStats': game
+            }, separators=(',', ':'))
+            yield (tuple(game[column] for column in WZ_VALID_COLUMNS[:-1]) + (stats,),
+                   (game_id, player['uno_id'], raw))
+
+
+def populate(db: WarzoneDatabase, player_count: int, total_rows: int, days: int = 180,
+             seed: int = 1, batch_size: int = 10000) -> Dict:
+    """
+    Užpildo duomenų bazę sintetiniais žaidėjais ir žaidimais (įrašoma paketais)
+    :return: žaidėjai ir generavimo trukmė
+    """
+    rng = random.Random(seed)
+    players = generate_players(player_count, rng)
+    start = time.perf_counter()
+
+    with db._connect() as conn:
+        conn.executemany(INSERT_PLAYER, [
+            (player['uno_id'], player['player_id'], player['activision_tag'], player['is_core'])
+            for player in players
+        ])
+        valid_batch, raw_batch = [], []
+        for valid_row, raw_row in generate_rows(players, total_rows, days, rng):
+            valid_batch.append(valid_row)
+            raw_batch.append(raw_row)
+            if len(valid_batch) >= batch_size:
+                conn.executemany(INSERT_WZ_VALID, valid_batch)
+                conn.executemany(INSERT_RAW, raw_batch)
+                valid_batch, raw_batch = [], []
+        if valid_batch:
+            conn.executemany(INSERT_WZ_VALID, valid_batch)
+            conn.executemany(INSERT_RAW, raw_batch)
+        conn.commit()
+
+    return {'players': players, 'seconds': round(time.perf_counter() - start, 2)}
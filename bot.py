@@ -1,35 +1,55 @@
+from time import perf_counter
+
+# Paleidimo laiko atskaitos taškas (warzone_startup_seconds)
+BOOT = perf_counter()
+
 import os
 import discord
 from discord.ext import commands, tasks
 from dotenv import load_dotenv
+
+# Įkeliame aplinkos kintamuosius vieną kartą, prieš projekto modulius - jie nustatymus
+# (COMMAND_DEADLINE, HTTP_CASSETTE, TRACE_*) skaito importo metu
+load_dotenv()
+
+import io
 import json
 import asyncio
-from tracker_api import TrackerGGAPI
 from stats_fetcher import StatsFetcher
+from diagnostics import ProviderDiagnostics
+from backoff import shared_scheduler
+from deadline import COMMAND_DEADLINE, Deadline
+from change_detector import ChangeDetector
+from leaderboard import LiveLeaderboard
+from message_queue import OutboundQueue
+from metrics import MONITOR_RUN_SECONDS, STARTUP_SECONDS, start_metrics_server
+from stall_watchdog import StallWatchdog
+from tracing import tracer
+from profiler import LoopProfiler
+from logs import configure_logging, get_logger
 from datetime import datetime, time
 import pytz
 
-print("BOT STARTED")
-# Įkeliame aplinkos kintamuosius
-load_dotenv()
-print("CHANNEL_ID:", os.getenv('CHANNEL_ID'))
+configure_logging()
+log = get_logger('bot')
+log.info("Botas paleidžiamas", channel_id=os.getenv('CHANNEL_ID'))
 TOKEN = os.getenv('DISCORD_TOKEN')
 CHANNEL_ID = os.getenv('CHANNEL_ID')
 TIMEZONE = os.getenv('TIMEZONE', 'Europe/Vilnius')  # Nustatome Vilniaus laiko juostą
 
 # Patikriname ar yra būtini kintamieji
 if not TOKEN:
-    print("ERROR: DISCORD_TOKEN nerastas aplinkos kintamuosiuose!")
+    log.error("DISCORD_TOKEN nerastas aplinkos kintamuosiuose!")
     exit(1)
 
 if not CHANNEL_ID:
-    print("WARNING: CHANNEL_ID nerastas. Kai kurios funkcijos gali neveikti.")
+    log.warning("CHANNEL_ID nerastas. Kai kurios funkcijos gali neveikti.")
     CHANNEL_ID = None
 else:
     try:
         CHANNEL_ID = int(CHANNEL_ID)
     except ValueError:
-        print("ERROR: CHANNEL_ID turi būti skaičius!")
+        log.error("CHANNEL_ID turi būti skaičius!")
         CHANNEL_ID = None
 
 # Bot'o konfigūracija
@@ -37,14 +57,24 @@ intents = discord.Intents.default()
 intents.message_content = True
 bot = commands.Bot(command_prefix='!', intents=intents)
 
-# Inicializuojame Tracker.gg API ir statistikos gavimo klasę
-tracker_api = TrackerGGAPI()
+# Inicializuojame statistikos gavimo klasę ir API diagnostiką
 stats_fetcher = StatsFetcher()
+diagnostics = ProviderDiagnostics(stats_fetcher)
+change_detector = ChangeDetector(quiet_after=int(os.getenv('SESSION_QUIET_MINUTES', '30')) * 60)
+outbound = OutboundQueue()
+stall_watchdog = StallWatchdog.from_env()
+loop_profiler = LoopProfiler.from_env()
+live_leaderboard = LiveLeaderboard(min_edit_interval=int(os.getenv('LEADERBOARD_EDIT_INTERVAL', '30')))
 
 # Žaidėjų statistikos stebėjimo būsena
 monitoring = False
 check_interval = 300  # 5 minutės pagal nutylėjimą
 
+# Prometheus /metrics endpoint'as (įjungiamas nurodžius METRICS_PORT)
+METRICS_HOST = os.getenv('METRICS_HOST', '0.0.0.0')
+METRICS_PORT = os.getenv('METRICS_PORT')
+metrics_runner = None
+
 # Sleep režimo nustatymai
 SLEEP_START = time(23, 0)  # 23:00
 SLEEP_END = time(8, 0)     # 08:00
@@ -52,14 +82,40 @@ SLEEP_END = time(8, 0)     # 08:00
 @bot.event
 async def on_ready():
     """Bot'o paleidimo įvykis"""
-    print(f"{bot.user} prisijungė prie Discord!")
+    log.info("Prisijungta prie Discord", user=bot.user)
+    if not STARTUP_SECONDS.default.value:
+        STARTUP_SECONDS.set(perf_counter() - BOOT)
+        log.info("Paleidimas baigtas", startup_s=round(STARTUP_SECONDS.default.value, 2))
+    
+    # on_ready kviečiamas ir po persijungimo - stebėjimą ir metrikų serverį paleidžiame vieną kartą
+    stall_watchdog.start()
+    global metrics_runner
+    if METRICS_PORT and metrics_runner is None:
+        try:
+            metrics_runner = await start_metrics_server(METRICS_HOST, int(METRICS_PORT))
+        except Exception as e:
+            log.exception("Klaida paleidžiant metrikų serverį", port=METRICS_PORT)
     
     # Pradedame periodinį statistikos tikrinimą tik jei yra CHANNEL_ID
     if CHANNEL_ID:
         monitor_stats.start()
-        print(f"Stebėjimas pradėtas kanale {CHANNEL_ID}")
+        log.info("Stebėjimas pradėtas", channel_id=CHANNEL_ID)
     else:
-        print("Stebėjimas nepradėtas - nėra CHANNEL_ID")
+        log.warning("Stebėjimas nepradėtas - nėra CHANNEL_ID")
+
+@bot.before_invoke
+async def start_command_trace(ctx):
+    """Kiekviena komanda - atskira seka (span'ai perduodami per contextvars)"""
+    log.debug("Komanda gauta", command=ctx.command.name, author=ctx.author)
+    ctx.trace = tracer.start(f"!{ctx.command.name}", args=" ".join(str(arg) for arg in ctx.args[1:]))
+
+@bot.after_invoke
+async def finish_command_trace(ctx):
+    root = getattr(ctx, 'trace', None)
+    if root is not None:
+        if ctx.command_failed:
+            root.error = "CommandError"
+        tracer.finish(root)
 
 @bot.command(name='add')
 async def add_player(ctx, username: str, platform: str = "battlenet"):
@@ -85,157 +141,106 @@ async def list_players(ctx):
 
 @bot.command(name='prisijungiu')
 async def auto_add_player(ctx, username: str, platform: str = "battlenet"):
-    """Žaidėjas pats save prideda į stebėjimo sąrašą"""
-    if stats_fetcher.add_player(username, platform):
+    """Žaidėjas pats save prideda į stebėjimo sąrašą (ir susieja su savo Discord paskyra)"""
+    if stats_fetcher.add_player(username, platform, discord_id=ctx.author.id):
         await ctx.send(f"✅ Sėkmingai prisijungėte! **{username}** pridėtas į stebėjimo sąrašą! ({platform})")
-    else:
+        return
+
+    result = stats_fetcher.link_discord(username, platform, ctx.author.id)
+    if result == 'linked':
+        await ctx.send(f"🔗 **{username}** jau buvo sąraše - dabar susietas su jūsų Discord paskyra, "
+                       f"`!statistika` rodys jo statistiką.")
+    elif result == 'already_linked':
         await ctx.send(f"❌ Jūs jau esate sąraše! Naudokite `!remove {username} {platform}` jei norite pašalinti save.")
+    elif result == 'taken':
+        await ctx.send(f"❌ **{username}** jau susietas su kitu Discord vartotoju. "
+                       f"Jei tai jūsų paskyra, kreipkitės į administratorių.")
+    else:
+        await ctx.send(f"❌ Nepavyko prisijungti su **{username}** ({platform}).")
 
 @bot.command(name='statistika')
 async def show_player_stats(ctx, username: str = None, platform: str = "battlenet"):
     """Rodo žaidėjo statistiką"""
-    print("STATISTIKA KOMANDA GAUTA")
-    
     if username is None:
-        # Jei nenurodytas vardas, naudojame komandos autoriaus vardą
-        username = str(ctx.author)
-        # Bandome rasti žaidėją sąraše
-        found = False
-        for player in stats_fetcher.players:
-            if player['username'] == username:
-                platform = player['platform']
-                found = True
-                break
-        
-        if not found:
-            await ctx.send(f"❌ Jūsų vardas **{username}** nerastas sąraše. Naudokite `!prisijungiu username platform` arba nurodykite kitą žaidėjo vardą.")
+        # Jei nenurodytas vardas, ieškome žaidėjo, susieto su komandos autoriumi (!prisijungiu)
+        player = stats_fetcher.find_player_by_discord(ctx.author.id)
+        if player is None:
+            await ctx.send(f"❌ Jūsų Discord paskyra nesusieta su žaidėju. Naudokite `!prisijungiu username platform` arba nurodykite kitą žaidėjo vardą.")
             return
+        username, platform = player['username'], player['platform']
     
-    # Gauname statistiką iš Tracker.gg
-    await ctx.send(f"🔄 Gauname **{username}** statistiką...")
-    stats = await stats_fetcher.get_player_stats(username, platform)
-    
-    if stats:
-        message = stats_fetcher.format_stats_message(stats)
-        await ctx.send(message)
-    else:
-        await ctx.send(f"❌ Nepavyko gauti **{username}** statistikos. Patikrinkite vardą ir platformą.")
+    async with outbound.command(ctx) as out:
+        await out.status(f"🔄 Gauname **{username}** statistiką...")
+        stats = await stats_fetcher.get_player_stats(username, platform, Deadline(COMMAND_DEADLINE))
+        
+        if stats:
+            await out.status(f"✅ **{username}** statistika gauta")
+            out.send(stats_fetcher.format_stats_message(stats))
+        else:
+            await out.status(f"❌ Nepavyko gauti **{username}** statistikos. Patikrinkite vardą ir platformą.")
+
+@bot.command(name='istorija')
+async def show_player_history(ctx, username: str, platform: str = "battlenet", days: int = 30):
+    """Rodo žaidėjo K/D tendenciją iš statistikos istorijos"""
+    if platform == "battle":
+        platform = "battlenet"
+    await ctx.send(stats_fetcher.format_trend_message(username, platform, days))
 
 @bot.command(name='komanda')
 async def show_team_stats(ctx):
     """Rodo komandos statistiką"""
-    await ctx.send("🔄 Gauname komandos statistiką...")
-    
-    all_stats = await stats_fetcher.get_all_players_stats()
-    if all_stats:
-        message = stats_fetcher.format_summary_message(all_stats)
-        await ctx.send(message)
-    else:
-        await ctx.send("❌ Nepavyko gauti komandos statistikos.")
+    async with outbound.command(ctx) as out:
+        await out.status("🔄 Gauname komandos statistiką...")
+        
+        all_stats = await stats_fetcher.get_all_players_stats(Deadline(COMMAND_DEADLINE))
+        if all_stats:
+            await out.status("✅ Komandos statistika gauta")
+            out.send(stats_fetcher.format_summary_message(all_stats))
+        else:
+            await out.status("❌ Nepavyko gauti komandos statistikos.")
 
 @bot.command(name='test')
 async def test_api(ctx, username: str = None, platform: str = "battlenet"):
-    """Testuoja visus tris API su konkrečiu žaidėju (praleidžia Activision API dėl Node.js problemų)"""
+    """Lygiagrečiai testuoja visus API su konkrečiu žaidėju ir rodo rezultatų lentelę"""
     if not username:
         await ctx.send("❌ Nurodykite žaidėjo vardą: `!test username platform`")
         return
-        
-    await ctx.send(f"🧪 Testuojame visus tris API su **{username}** ({platform})...")
     
-    try:
-        # Testuojame Tracker.gg API
-        await ctx.send("🔄 Bandome Tracker.gg API...")
-        tracker_stats = await tracker_api.get_player_stats(username, platform)
-        
-        if tracker_stats:
-            await ctx.send("✅ Tracker.gg API veikia!")
-        else:
-            await ctx.send("❌ Tracker.gg API nepavyko")
-        
-        # Palaukiame tarp testų
-        await asyncio.sleep(2)
-        
-        # Testuojame alternatyvų API
-        await ctx.send("🔄 Bandome alternatyvų API...")
-        from alternative_api import AlternativeAPI
-        alt_api = AlternativeAPI()
-        alt_stats = await alt_api.get_player_stats(username, platform)
-        
-        if alt_stats:
-            await ctx.send("✅ Alternatyvus API veikia!")
-        else:
-            await ctx.send("❌ Alternatyvus API nepavyko")
-        
-        # Palaukiame tarp testų
-        await asyncio.sleep(2)
-        
-        # Testuojame trečią API
-        await ctx.send("🔄 Bandome trečią API...")
-        from third_api import ThirdAPI
-        third_api = ThirdAPI()
-        third_stats = await third_api.get_player_stats(username, platform)
-        
-        if third_stats:
-            await ctx.send("✅ Trečias API veikia!")
-        else:
-            await ctx.send("❌ Trečias API nepavyko")
+    async with outbound.command(ctx) as out:
+        await out.status(f"🧪 Testuojame visus API su **{username}** ({platform})...")
         
-        # Rodyti rezultatus
-        working_apis = []
-        if tracker_stats:
-            working_apis.append("🔗 Tracker.gg API")
-        if alt_stats:
-            working_apis.append("🔄 Alternatyvus API")
-        if third_stats:
-            working_apis.append("⚡ Trečias API")
-        
-        if working_apis:
-            await ctx.send("📊 **Testavimo rezultatai:**")
-            for api in working_apis:
-                await ctx.send(f"{api}: ✅ Veikia")
-            
-            if not tracker_stats:
-                await ctx.send("🔗 Tracker.gg API: ❌ Nepavyksta")
-            if not alt_stats:
-                await ctx.send("🔄 Alternatyvus API: ❌ Nepavyksta")
-            if not third_stats:
-                await ctx.send("⚡ Trečias API: ❌ Nepavyksta")
-        else:
-            await ctx.send("❌ Visi trys API nepavyko. Patikrinkite vardą ir platformą.")
-            
-    except Exception as e:
-        await ctx.send(f"❌ Testavimo klaida: {str(e)}")
+        try:
+            results = await diagnostics.run(username, platform)
+            await out.status(f"🧪 **{username}** ({platform}) testavimas baigtas")
+            out.send(diagnostics.format_table(username, platform, results))
+            out.send(diagnostics.client.format_usage())
+            out.send(shared_scheduler.format_status())
+        except Exception as e:
+            out.send(f"❌ Testavimo klaida: {str(e)}")
 
 @bot.command(name='testall')
 async def test_all_apis(ctx, username: str = None, platform: str = "battlenet"):
-    """Testuoja visus tris API ir rodo statistiką (praleidžia Activision API dėl Node.js problemų)"""
+    """Gauna statistiką per visą tiekėjų eilę (FETCH_ORDER) ir rodo šaltinį (be Activision API)"""
     if not username:
         await ctx.send("❌ Nurodykite žaidėjo vardą: `!testall username platform`")
         return
-        
-    await ctx.send(f"🧪 Testuojame visus tris API su **{username}** ({platform})...")
     
-    try:
-        # Testuojame su StatsFetcher (kuris naudoja visus tris API)
-        stats = await stats_fetcher.get_player_stats(username, platform)
+    async with outbound.command(ctx) as out:
+        await out.status(f"🧪 Testuojame tiekėjų eilę su **{username}** ({platform})...")
         
-        if stats:
-            source = stats.get('source', 'unknown')
-            source_texts = {
-                'tracker_gg': "Tracker.gg",
-                'alternative_api': "Alternatyvus API",
-                'third_api': "Trečias API"
-            }
-            source_text = source_texts.get(source, "Nežinomas šaltinis")
-            await ctx.send(f"✅ Statistikos gavimas sėkmingas! Šaltinis: {source_text}")
-            
-            message = stats_fetcher.format_stats_message(stats)
-            await ctx.send(message)
-        else:
-            await ctx.send("❌ Nepavyko gauti statistikos iš visų trijų API. Patikrinkite vardą ir platformą.")
+        try:
+            # Testuojame su StatsFetcher (tiekėjai bandomi FETCH_ORDER tvarka)
+            stats = await stats_fetcher.get_player_stats(username, platform, Deadline(COMMAND_DEADLINE))
             
-    except Exception as e:
-        await ctx.send(f"❌ Testavimo klaida: {str(e)}")
+            if stats:
+                source_text = stats_fetcher.source_text(stats.source)
+                await out.status(f"✅ Statistikos gavimas sėkmingas! Šaltinis: {source_text}")
+                out.send(stats_fetcher.format_stats_message(stats))
+            else:
+                await out.status("❌ Nepavyko gauti statistikos iš nė vieno API. Patikrinkite vardą ir platformą.")
+                
+        except Exception as e:
+            out.send(f"❌ Testavimo klaida: {str(e)}")
 
 @bot.command(name='testrapid')
 async def test_rapidapi(ctx, username: str = None, platform: str = "battlenet"):
@@ -243,49 +248,51 @@ async def test_rapidapi(ctx, username: str = None, platform: str = "battlenet"):
     if not username:
         await ctx.send("❌ Nurodykite žaidėjo vardą: `!testrapid username platform`")
         return
-        
-    await ctx.send(f"🚀 Testuojame RapidAPI COD API su **{username}** ({platform})...")
     
-    try:
-        from rapidapi_cod import RapidAPICOD
-        api = RapidAPICOD()
+    async with outbound.command(ctx) as out:
+        await out.status(f"🚀 Testuojame RapidAPI COD API su **{username}** ({platform})...")
         
-        # Testuojame statistiką
-        await ctx.send("🔄 Gauname statistiką...")
-        stats = await api.get_player_stats(username, platform)
-        
-        if stats:
-            await ctx.send("✅ RapidAPI COD API veikia!")
+        try:
+            api = stats_fetcher.providers['rapidapi_cod']
             
-            # Rodyti statistikos santrauką
-            message = f"📊 **{username}** statistikos santrauka:\n"
-            message += f"🎯 Žudymai: {stats.get('kills', 0):,}\n"
-            message += f"💀 Mirtys: {stats.get('deaths', 0):,}\n"
-            message += f"⚖️ K/D: {stats.get('kd_ratio', 0):.2f}\n"
-            message += f"🏆 Perėmimai: {stats.get('wins', 0):,}\n"
-            message += f"🎮 Žaidimai: {stats.get('games_played', 0):,}\n"
-            message += f"📈 SPM: {stats.get('score_per_minute', 0):.0f}"
+            # Testuojame statistiką
+            await out.status("🔄 Gauname statistiką...")
+            stats = await api.get_player_stats(username, platform, Deadline(COMMAND_DEADLINE))
             
-            await ctx.send(message)
-        else:
-            await ctx.send("❌ RapidAPI COD API nepavyko gauti statistikos")
-        
-        # Testuojame žaidėjo informaciją
-        await ctx.send("🔄 Gauname žaidėjo informaciją...")
-        info = await api.get_player_info(username, platform)
-        
-        if info:
-            info_message = f"👤 **{username}** informacija:\n"
-            info_message += f"🌟 Lygis: {info.get('level', 'N/A')}\n"
-            info_message += f"⭐ Rangas: {info.get('rank', 'N/A')}\n"
-            info_message += f"🏅 Prestižas: {info.get('prestige', 'N/A')}"
+            if stats:
+                out.send("✅ RapidAPI COD API veikia!")
+                
+                # Rodyti statistikos santrauką
+                message = f"📊 **{username}** statistikos santrauka:\n"
+                message += f"🎯 Žudymai: {stats.kills:,}\n"
+                message += f"💀 Mirtys: {stats.deaths:,}\n"
+                message += f"⚖️ K/D: {stats.kd_ratio:.2f}\n"
+                message += f"🏆 Perėmimai: {stats.wins:,}\n"
+                message += f"🎮 Žaidimai: {stats.games_played:,}\n"
+                message += f"📈 SPM: {stats.score_per_minute:.0f}"
+                
+                out.send(message)
+            else:
+                out.send("❌ RapidAPI COD API nepavyko gauti statistikos")
             
-            await ctx.send(info_message)
-        else:
-            await ctx.send("❌ Nepavyko gauti žaidėjo informacijos")
+            # Testuojame žaidėjo informaciją
+            await out.status("🔄 Gauname žaidėjo informaciją...")
+            info = await api.get_player_info(username, platform)
             
-    except Exception as e:
-        await ctx.send(f"❌ Klaida testuojant RapidAPI: {str(e)}")
+            if info:
+                info_message = f"👤 **{username}** informacija:\n"
+                info_message += f"🌟 Lygis: {info.get('level', 'N/A')}\n"
+                info_message += f"⭐ Rangas: {info.get('rank', 'N/A')}\n"
+                info_message += f"🏅 Prestižas: {info.get('prestige', 'N/A')}"
+                
+                out.send(info_message)
+            else:
+                out.send("❌ Nepavyko gauti žaidėjo informacijos")
+            
+            await out.status(f"🚀 RapidAPI COD API testavimas su **{username}** baigtas")
+                
+        except Exception as e:
+            out.send(f"❌ Klaida testuojant RapidAPI: {str(e)}")
 
 def is_sleep_time():
     """Patikrina ar dabar yra miego režimo laikas"""
@@ -294,7 +301,7 @@ def is_sleep_time():
         current_time = datetime.now(tz).time()
         return SLEEP_START <= current_time or current_time <= SLEEP_END
     except Exception as e:
-        print(f"Klaida tikrinant laiką: {e}")
+        log.exception("Klaida tikrinant laiką", timezone=TIMEZONE)
         return False
 
 @tasks.loop(seconds=300)
@@ -306,26 +313,44 @@ async def monitor_stats():
         return
     
     if is_sleep_time():
-        print("Miego režimas - praleidžiame statistikos tikrinimą")
+        log.debug("Miego režimas - praleidžiame statistikos tikrinimą")
         return
     
+    started = asyncio.get_running_loop().time()
     try:
         channel = bot.get_channel(CHANNEL_ID)
         if not channel:
-            print(f"Kanalas {CHANNEL_ID} nerastas")
+            log.warning("Kanalas nerastas", channel_id=CHANNEL_ID)
             return
         
-        print("Tikriname žaidėjų statistiką...")
-        all_stats = await stats_fetcher.get_all_players_stats()
+        log.info("Tikriname žaidėjų statistiką", players=len(stats_fetcher.players))
+        # Stebėjimo ciklas turi baigtis iki kito tikrinimo
+        with tracer.trace("monitor", players=len(stats_fetcher.players)):
+            all_stats = await stats_fetcher.get_all_players_stats(Deadline(check_interval * 0.8))
         
-        if all_stats:
-            message = stats_fetcher.format_summary_message(all_stats)
-            await channel.send(message)
-        else:
-            await channel.send("❌ Nepavyko gauti komandos statistikos.")
+        if not all_stats:
+            log.warning("Nepavyko gauti komandos statistikos")
+            return
+        
+        # Gyva lentelė redaguojama tik pasikeitus turiniui
+        if live_leaderboard.enabled:
+            result = await live_leaderboard.update(channel, stats_fetcher.format_summary_message(all_stats))
+            log.debug("Lyderių lentelė atnaujinta", result=result)
+        
+        # Siunčiame tik realius pokyčius ir baigtų sesijų suvestines
+        updates, recaps = change_detector.process(all_stats)
+        if updates:
+            for message in change_detector.format_updates_message(updates):
+                outbound.send(channel, message)
+        for recap in recaps:
+            outbound.send(channel, change_detector.format_recap_message(recap))
+        if not updates and not recaps:
+            log.debug("Pokyčių nėra - pranešimo nesiunčiame")
             
     except Exception as e:
-        print(f"Klaida tikrinant statistiką: {e}")
+        log.exception("Klaida tikrinant statistiką")
+    finally:
+        MONITOR_RUN_SECONDS.observe(asyncio.get_running_loop().time() - started)
 
 @bot.command(name='start')
 async def start_monitoring(ctx):
@@ -341,6 +366,61 @@ async def stop_monitoring(ctx):
     monitoring = False
     await ctx.send("⏹️ Statistikos stebėjimas sustabdytas!")
 
+LEADERBOARD_MODES = {
+    'on': True, 'ijungti': True, '1': True,
+    'off': False, 'isjungti': False, '0': False
+}
+
+@bot.command(name='lenta')
+@commands.has_permissions(administrator=True)
+async def toggle_leaderboard(ctx, mode: str = "on"):
+    """Įjungia arba išjungia gyvą lyderių lentelę (viena redaguojama žinutė, tik administratoriams)"""
+    enabled = LEADERBOARD_MODES.get(mode.lower())
+    if enabled is None:
+        await ctx.send("❌ Naudojimas: `!lenta on|off` (arba `ijungti`/`isjungti`)")
+        return
+    live_leaderboard.set_enabled(enabled)
+    if enabled:
+        await ctx.send("📌 Gyva lyderių lentelė įjungta! Ji bus atnaujinama stebėjimo metu.")
+    else:
+        await ctx.send("📌 Gyva lyderių lentelė išjungta.")
+
+@toggle_leaderboard.error
+async def toggle_leaderboard_error(ctx, error):
+    if isinstance(error, commands.MissingPermissions):
+        await ctx.send("❌ Lyderių lentelę įjungti ar išjungti gali tik serverio administratoriai")
+    else:
+        log.error("Klaida keičiant lyderių lentelę", error=error)
+
+@bot.command(name='stalls')
+async def show_stalls(ctx):
+    """Rodo kodo vietas, labiausiai blokavusias event loop"""
+    await ctx.send(stall_watchdog.format_report())
+
+@bot.command(name='trace')
+async def show_trace(ctx, index: int = 1):
+    """Rodo paskutinės (arba n-tos nuo galo) komandos seką"""
+    await ctx.send(tracer.format_trace(index))
+
+@bot.command(name='profile')
+@commands.has_permissions(administrator=True)
+async def profile_bot(ctx, seconds: int = 30, mode: str = "sampling"):
+    """Profiliuoja veikiantį botą nurodytą laiką ir įkelia rezultatą (tik administratoriams)"""
+    try:
+        await ctx.send(f"🔬 Profiliuojame {seconds} s ({mode})...")
+        result = await loop_profiler.run(seconds, mode)
+    except ValueError as e:
+        await ctx.send(f"❌ {e}")
+        return
+    await ctx.send(result.summary, file=discord.File(io.BytesIO(result.data), filename=result.filename))
+
+@profile_bot.error
+async def profile_bot_error(ctx, error):
+    if isinstance(error, commands.MissingPermissions):
+        await ctx.send("❌ Profiliuoti gali tik serverio administratoriai")
+    else:
+        log.error("Klaida profiliuojant", error=error)
+
 @bot.command(name='interval')
 async def set_interval(ctx, seconds: int):
     """Nustato tikrinimo intervalą sekundėmis"""
@@ -353,5 +433,6 @@ async def set_interval(ctx, seconds: int):
     monitor_stats.change_interval(seconds=seconds)
     await ctx.send(f"⏱️ Tikrinimo intervalas nustatytas į {seconds} sekundžių!")
 
-# Paleidžiame botą
-bot.run(TOKEN) 
\ No newline at end of file
+# Paleidžiame botą (importuojant - pvz. python -m bench startup - nepaleidžiamas)
+if __name__ == "__main__":
+    bot.run(TOKEN)
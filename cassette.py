@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Užklausų įrašymas ir atkūrimas (record/replay) - HTTP klientas įrašo tiekėjų atsakymus
+į suspaustą kasetę (gzip JSON Lines), o atkūrimo režimu grąžina juos be tinklo
+"""
+
+import base64
+import gzip
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+from multidict import CIMultiDict
+
+from logs import get_logger
+
+log = get_logger('cassette')
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+
+class CassetteMiss(Exception):
+    """Atkuriamoje kasetėje nėra šio URL"""
+
+
+class Cassette:
+    def __init__(self, path: str, mode: str = REPLAY, timing_scale: float = 0.0):
+        """
+        Inicializuoja kasetę
+        :param path: kasetės failas (.jsonl.gz)
+        :param mode: 'record' - įrašyti realius atsakymus, 'replay' - grąžinti įrašytus
+        :param timing_scale: atkuriant - kiek kartų įrašyto vėlinimo palaukti (0 - nelaukti, 1 - kaip įrašyta)
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Nežinomas kasetės režimas: {mode}")
+        self.path = path
+        self.mode = mode
+        self.timing_scale = timing_scale
+        # URL -> įrašyti atsakymai tokia tvarka, kokia buvo gauti
+        self.interactions: Dict[str, List[Dict]] = {}
+        self.positions: Dict[str, int] = {}
+        if mode == REPLAY:
+            self.load()
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        """
+        Kasetė pagal HTTP_CASSETTE, HTTP_CASSETTE_MODE ir HTTP_CASSETTE_TIMING (None - kasetė nenaudojama)
+        """
+        path = os.getenv('HTTP_CASSETTE')
+        if not path:
+            return None
+        return cls(path, os.getenv('HTTP_CASSETTE_MODE', REPLAY), float(os.getenv('HTTP_CASSETTE_TIMING', '0')))
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    def load(self):
+        """Užkrauna kasetę (trūkstamas failas - tuščia kasetė)"""
+        self.interactions = {}
+        self.positions = {}
+        if not os.path.exists(self.path):
+            log.warning("Kasetė nerasta", path=self.path)
+            return
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    interaction = json.loads(line)
+                    self.interactions.setdefault(interaction['url'], []).append(interaction)
+
+    @staticmethod
+    def _encode_body(body: bytes) -> Dict:
+        """Tekstinius atsakymus saugome kaip tekstą, kitus - base64 (atkuriama baitas į baitą)"""
+        try:
+            return {'body': body.decode('utf-8')}
+        except UnicodeDecodeError:
+            return {'body': base64.b64encode(body).decode('ascii'), 'encoding': 'base64'}
+
+    def record(self, url: str, status: int, headers, body: bytes, latency: float):
+        """
+        Prideda atsakymą į kasetę (kiekvienas įrašas - atskiras gzip narys, todėl failas
+        lieka skaitomas ir nutraukus įrašymą)
+        """
+        interaction = {
+            'url': url,
+            'status': status,
+            'headers': [[name, value] for name, value in headers.items()],
+            'latency': round(latency, 2),
+            'recorded_at': time.time(),
+            **self._encode_body(body)
+        }
+        self.interactions.setdefault(url, []).append(interaction)
+        try:
+            with gzip.open(self.path, 'at', encoding='utf-8') as f:
+                f.write(json.dumps(interaction, separators=(',', ':'), ensure_ascii=False) + "\n")
+        except Exception as e:
+            log.exception("Klaida rašant kasetę", path=self.path)
+
+    def play(self, url: str) -> Dict:
+        """
+        Grąžina kitą to URL atsakymą: status, headers, body, latency.
+        Kai įrašai baigiasi, kartojamas paskutinis.
+        :raises CassetteMiss: jei URL kasetėje nėra
+        """
+        interactions = self.interactions.get(url)
+        if not interactions:
+            raise CassetteMiss(url)
+        position = self.positions.get(url, 0)
+        self.positions[url] = position + 1
+        interaction = interactions[min(position, len(interactions) - 1)]
+
+        body = interaction['body']
+        body = base64.b64decode(body) if interaction.get('encoding') == 'base64' else body.encode('utf-8')
+        return {
+            'status': interaction['status'],
+            'headers': CIMultiDict(interaction['headers']),
+            'body': body,
+            'latency': interaction['latency']
+        }
+
+    def rewind(self):
+        """Atkūrimą pradeda iš pradžių"""
+        self.positions = {}
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Statistikos pokyčių aptikimas - lygina nuoseklius žaidėjų statistikos
+gavimus ir praneša tik apie realius pokyčius
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from logs import get_logger
+from player_stats import PlayerStats
+
+log = get_logger('change_detector')
+
+# Laukai, kurių pokyčius sekame
+TRACKED_FIELDS = ('kills', 'deaths', 'wins', 'top_10', 'games_played')
+
+# Numatytosios ribos: pranešame, kai bent vienas pokytis pasiekia ribą (0 - ignoruojame lauką)
+DEFAULT_THRESHOLDS = {
+    'kills': 5,
+    'deaths': 0,
+    'wins': 1,
+    'top_10': 0,
+    'games_played': 1
+}
+
+DISCORD_MESSAGE_LIMIT = 2000
+
+
+def parse_thresholds(value: Optional[str]) -> Dict[str, int]:
+    """
+    Nuskaito ribas iš teksto, pvz. "kills=5,wins=1,games_played=1"
+    """
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    if not value:
+        return thresholds
+
+    for part in value.split(','):
+        if '=' not in part:
+            continue
+        key, raw = part.split('=', 1)
+        key = key.strip()
+        if key not in TRACKED_FIELDS:
+            log.warning("Nežinomas pokyčio laukas", field=key)
+            continue
+        try:
+            thresholds[key] = max(0, int(raw.strip()))
+        except ValueError:
+            log.warning("Neteisinga ribos reikšmė", value=part)
+
+    return thresholds
+
+
+class ChangeDetector:
+    def __init__(self, state_file: str = "change_state.json",
+                 thresholds: Optional[Dict[str, int]] = None,
+                 quiet_after: int = 1800):
+        """
+        Inicializuoja pokyčių aptikimą
+        :param state_file: failas, kuriame saugoma būsena tarp paleidimų
+        :param thresholds: minimalūs pokyčiai, nuo kurių siunčiamas pranešimas
+        :param quiet_after: po kiek sekundžių be pokyčių sesija laikoma baigta
+        """
+        self.state_file = state_file
+        self.thresholds = thresholds if thresholds is not None else parse_thresholds(os.getenv('DELTA_THRESHOLDS'))
+        self.quiet_after = quiet_after
+        self.load_state()
+
+    def load_state(self):
+        """
+        Užkrauna pokyčių būseną iš failo
+        """
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    self.state = json.load(f)
+            else:
+                self.state = {}
+        except Exception as e:
+            log.exception("Klaida užkraunant pokyčių būseną", file=self.state_file)
+            self.state = {}
+
+    def save_state(self):
+        """
+        Išsaugo pokyčių būseną (per laikiną failą, kad nesugadintume būsenos)
+        """
+        try:
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, ensure_ascii=False)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            log.exception("Klaida išsaugant pokyčių būseną", file=self.state_file)
+
+    @staticmethod
+    def _player_key(stats: PlayerStats) -> str:
+        return f"{stats.username}|{stats.platform}"
+
+    @staticmethod
+    def _snapshot(stats: PlayerStats) -> Dict[str, float]:
+        return {field: getattr(stats, field) for field in TRACKED_FIELDS}
+
+    @staticmethod
+    def _diff(current: Dict[str, float], previous: Dict[str, float]) -> Dict[str, float]:
+        return {field: current.get(field, 0) - previous.get(field, 0) for field in TRACKED_FIELDS}
+
+    def _crosses_threshold(self, deltas: Dict[str, float]) -> bool:
+        for field, threshold in self.thresholds.items():
+            if threshold > 0 and deltas.get(field, 0) >= threshold:
+                return True
+        return False
+
+    def process(self, all_stats: List[PlayerStats], now: Optional[datetime] = None) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Palygina naujus duomenis su ankstesniais
+        :return: (pokyčiai, kuriuos verta paskelbti; baigtų sesijų suvestinės)
+        """
+        now = now or datetime.now()
+        updates = []
+        recaps = []
+        seen = set()
+
+        for stats in all_stats:
+            # Paskutiniai žinomi (seni) duomenys nėra naujas matavimas - jų nelyginame
+            if stats.is_fallback or not stats.username:
+                continue
+
+            key = self._player_key(stats)
+            seen.add(key)
+            current = self._snapshot(stats)
+            entry = self.state.get(key)
+
+            if entry is None:
+                # Pirmas matymas - tik įsimename bazę
+                self.state[key] = {
+                    'username': stats.username,
+                    'platform': stats.platform,
+                    'posted': current,
+                    'last': current,
+                    'session': None,
+                    'checked_at': now.isoformat()
+                }
+                continue
+
+            step = self._diff(current, entry['last'])
+            if any(value < 0 for value in step.values()):
+                # Statistika sumažėjo (kitas šaltinis ar atstatymas) - perrašome bazę
+                log.info("Statistika sumažėjo, atnaujiname bazę", player=entry['username'])
+                entry['posted'] = current
+                entry['last'] = current
+                entry['session'] = None
+                continue
+
+            if any(value > 0 for value in step.values()):
+                if entry['session'] is None:
+                    # Sesija prasidėjo po ankstesnio patikrinimo
+                    entry['session'] = {
+                        'start': entry.get('checked_at', now.isoformat()),
+                        'start_stats': entry['last']
+                    }
+                entry['session']['last_activity'] = now.isoformat()
+
+            entry['last'] = current
+            entry['checked_at'] = now.isoformat()
+
+            # Pokyčiai kaupiami nuo paskutinio paskelbto taško
+            deltas = self._diff(current, entry['posted'])
+            if self._crosses_threshold(deltas):
+                updates.append({
+                    'username': entry['username'],
+                    'platform': entry['platform'],
+                    'deltas': deltas,
+                    'kd_ratio': stats.kd_ratio
+                })
+                entry['posted'] = current
+
+        # Tikriname, ar kas nors nutilo
+        for key, entry in self.state.items():
+            session = entry.get('session')
+            if not session or key not in seen:
+                continue
+            last_activity = datetime.fromisoformat(session.get('last_activity', session['start']))
+            if (now - last_activity).total_seconds() >= self.quiet_after:
+                totals = self._diff(entry['last'], session['start_stats'])
+                if any(value > 0 for value in totals.values()):
+                    recaps.append({
+                        'username': entry['username'],
+                        'platform': entry['platform'],
+                        'start': session['start'],
+                        'end': session.get('last_activity', session['start']),
+                        'totals': totals
+                    })
+                entry['session'] = None
+                entry['posted'] = entry['last']
+
+        self.save_state()
+        return updates, recaps
+
+    def format_updates_message(self, updates: List[Dict]) -> List[str]:
+        """
+        Formatuoja pokyčių pranešimus Discord (grąžina dalis iki 2000 simbolių)
+        """
+        lines = []
+        for update in updates:
+            deltas = update['deltas']
+            parts = []
+            if deltas['games_played'] > 0:
+                parts.append(f"🎮 +{deltas['games_played']:,.0f}")
+            if deltas['kills'] > 0:
+                parts.append(f"🎯 +{deltas['kills']:,.0f}")
+            if deltas['deaths'] > 0:
+                parts.append(f"💀 +{deltas['deaths']:,.0f}")
+            if deltas['wins'] > 0:
+                parts.append(f"🏆 +{deltas['wins']:,.0f}")
+            if deltas['top_10'] > 0:
+                parts.append(f"🥇 +{deltas['top_10']:,.0f}")
+            parts.append(f"⚖️ {update.get('kd_ratio', 0):.2f}")
+            lines.append(f"📈 **{update['username']}** - " + " | ".join(parts))
+
+        return self._chunk("🔔 **Nauji pokyčiai:**", lines)
+
+    def format_recap_message(self, recap: Dict) -> str:
+        """
+        Formatuoja sesijos suvestinę, kai žaidėjas nustoja žaisti
+        """
+        totals = recap['totals']
+        kills = totals['kills']
+        deaths = totals['deaths']
+        session_kd = kills / deaths if deaths > 0 else kills
+
+        start = datetime.fromisoformat(recap['start'])
+        end = datetime.fromisoformat(recap['end'])
+        minutes = int((end - start).total_seconds() // 60)
+
+        message = f"""
+🏁 **{recap['username']}** sesijos suvestinė ({minutes} min.)
+• 🎮 Žaidimai: **{totals['games_played']:,.0f}**
+• 🎯 Žudymai: **{kills:,.0f}**
+• 💀 Mirtys: **{deaths:,.0f}**
+• ⚖️ Sesijos K/D: **{session_kd:.2f}**
+• 🏆 Perėmimai: **{totals['wins']:,.0f}**
+• 🥇 Top 10: **{totals['top_10']:,.0f}**
+"""
+        return message.strip()
+
+    @staticmethod
+    def _chunk(header: str, lines: List[str]) -> List[str]:
+        messages = []
+        current = header
+        for line in lines:
+            if len(current) + len(line) + 1 > DISCORD_MESSAGE_LIMIT:
+                messages.append(current)
+                current = line
+            else:
+                current += "\n" + line
+        if lines:
+            messages.append(current)
+        return messages
@@ -9,9 +9,13 @@ class WarzoneDatabase:
         self.db_path = db_path
         self.init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Atidaro ryšį su duomenų baze (visi metodai jungiasi per čia)"""
+        return sqlite3.connect(self.db_path)
+
     def init_database(self):
         """Inicializuoja duomenų bazę su visomis reikalingomis lentelėmis"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS players(
                     player_uno_id TEXT PRIMARY KEY UNIQUE,
@@ -79,7 +83,7 @@ class WarzoneDatabase:
     
     def seed_players(self, players_data: List[Dict]):
         """Prideda žaidėjus iš JSON duomenų"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             for player in players_data:
                 player_id = player['name'].lower()
                 is_core = player.get('isCore', False)
@@ -97,7 +101,7 @@ class WarzoneDatabase:
     
     def add_player(self, player_id: str, uno_id: str, activision_tag: str, is_core: bool = False):
         """Prideda naują žaidėją"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 INSERT OR REPLACE INTO players(player_uno_id, player_id, activision_tag, is_core)
                 VALUES (?, ?, ?, ?)
@@ -106,7 +110,7 @@ class WarzoneDatabase:
     
     def get_player_by_name(self, player_name: str) -> Optional[Dict]:
         """Gauna žaidėją pagal vardą"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("""
                 SELECT player_uno_id, player_id, activision_tag, is_core
                 FROM players
@@ -125,7 +129,7 @@ class WarzoneDatabase:
     
     def get_all_players(self) -> List[Dict]:
         """Gauna visus žaidėjus"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("""
                 SELECT player_uno_id, player_id, activision_tag, is_core
                 FROM players
@@ -144,7 +148,7 @@ class WarzoneDatabase:
     
     def save_game_stats(self, game_id: str, player_uno_id: str, stats: Dict):
         """Išsaugo žaidimo statistiką"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             stats_json = json.dumps(stats)
             conn.execute("""
                 INSERT OR REPLACE INTO raw_games(game_id, player_uno_id, stats)
@@ -154,7 +158,7 @@ class WarzoneDatabase:
     
     def get_player_recent_stats(self, player_name: str, days: int = 7) -> List[Dict]:
         """Gauna žaidėjo statistiką per paskutines dienas"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("""
                 SELECT 
                     date_key,
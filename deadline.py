@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Laiko biudžetas (deadline) komandai ar stebėjimo ciklui - perduodamas per
+StatsFetcher į kiekvieną tiekėją ir HTTP užklausą
+"""
+
+import os
+import time
+from typing import Optional
+
+# Mažiau nei tiek sekundžių likus - naujų užklausų nebepradedame
+MIN_REQUEST_TIME = 0.5
+
+# Numatytasis vienos komandos biudžetas sekundėmis
+COMMAND_DEADLINE = float(os.getenv('COMMAND_DEADLINE_SECONDS', '25'))
+
+
+class Deadline:
+    def __init__(self, seconds: float):
+        """
+        Inicializuoja laiko biudžetą
+        :param seconds: kiek sekundžių nuo dabar skirta visam darbui
+        """
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Kiek sekundžių dar liko (ne mažiau 0)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Ar nebeliko laiko naujai užklausai"""
+        return self.remaining() < MIN_REQUEST_TIME
+
+    def clip(self, timeout: float) -> float:
+        """Apriboja žingsnio laiko limitą likusiu biudžetu"""
+        return min(timeout, self.remaining())
+
+    def elapsed(self) -> float:
+        return self.budget - (self.expires_at - time.monotonic())
+
+    def __repr__(self) -> str:
+        return f"Deadline({self.remaining():.1f}/{self.budget:.0f} s)"
+
+
+def clip_timeout(deadline: Optional[Deadline], timeout: float) -> float:
+    """Laiko limitas su biudžetu arba be jo"""
+    return deadline.clip(timeout) if deadline is not None else timeout
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+API diagnostika - lygiagrečiai patikrina visus statistikos tiekėjus
+ir pateikia kompaktišką rezultatų lentelę
+"""
+
+import asyncio
+import time
+from typing import Dict, List
+
+from http_client import shared_client
+from providers import PROVIDER_SPECS, ProviderRegistry
+
+
+class ProviderDiagnostics:
+    def __init__(self, stats_fetcher, timeout: float = 20):
+        """
+        Inicializuoja diagnostiką
+        :param stats_fetcher: StatsFetcher, kurio tiekėjus tikriname
+        :param timeout: bendras visos diagnostikos laiko limitas sekundėmis
+        """
+        self.stats_fetcher = stats_fetcher
+        # Kiekvienas registro tiekėjas tikrinamas atskirai (ir sudėtinių tiekėjų nariai);
+        # sukuriami tik paleidus pirmą diagnostiką
+        self.providers = ProviderRegistry(list(PROVIDER_SPECS))
+        self._activision_api = None
+        self.client = shared_client
+        self.timeout = timeout
+
+    @property
+    def activision_api(self):
+        """Oficialus Activision API - kuriamas tik paleidus pirmą diagnostiką (ne importuojant bot.py)"""
+        if self._activision_api is None:
+            from activision_api import ActivisionAPI
+            self._activision_api = ActivisionAPI()
+        return self._activision_api
+
+    def _http_probes(self, username: str, platform: str) -> List[Dict]:
+        """
+        Surenka visų registruotų HTTP tiekėjų užklausas: pavadinimas, URL, headers, parseris
+        """
+        probes = []
+        for provider in self.providers.values():
+            url = provider.stats_url(username, platform)
+            if not url:
+                continue
+            probes.append({
+                'key': provider.key,
+                'name': provider.name,
+                'url': url,
+                'headers': provider.headers,
+                'parse': lambda data, provider=provider: provider.parse_stats(data, username, platform)
+            })
+        return probes
+
+    async def _probe_http(self, probe: Dict, requests: Dict) -> Dict:
+        """Patikrina vieną HTTP tiekėją (tas pats URL užklausiamas tik kartą)"""
+        result = {'name': probe['name'], 'status': None, 'latency': None, 'size': None, 'parsed': False, 'error': None}
+        try:
+            key = (probe['url'], tuple(sorted(probe['headers'].items())))
+            if key not in requests:
+                requests[key] = asyncio.ensure_future(
+                    self.client.get(probe['url'], probe['headers'], self.timeout, False, probe['key'], use_cache=False)
+                )
+            response = await asyncio.shield(requests[key])
+
+            result['status'] = response.status
+            result['latency'] = response.latency
+            result['size'] = len(response.body)
+
+            if response.status == 200:
+                data = await self.client.decode(response.body, probe['key'])
+                result['parsed'] = probe['parse'](data) is not None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            result['error'] = type(e).__name__
+        return result
+
+    async def _probe_activision(self, username: str, platform: str) -> Dict:
+        """Patikrina oficialų Activision API (Node.js)"""
+        result = {'name': 'Activision', 'status': None, 'latency': None, 'size': None, 'parsed': False, 'error': None}
+        if not self.activision_api.sso_token:
+            result['error'] = 'nėra SSO'
+            return result
+
+        start = time.perf_counter()
+        stats = await self.activision_api.get_player_stats(username, platform)
+        result['latency'] = (time.perf_counter() - start) * 1000
+        result['status'] = self.activision_api.last_returncode
+        result['size'] = self.activision_api.last_output_size
+        result['parsed'] = stats is not None
+        return result
+
+    async def run(self, username: str, platform: str = "battlenet") -> List[Dict]:
+        """
+        Lygiagrečiai patikrina visus tiekėjus per bendrą laiko limitą
+        """
+        if platform == "battle":
+            platform = "battlenet"
+
+        probes = self._http_probes(username, platform)
+        requests: Dict = {}
+
+        tasks = [asyncio.ensure_future(self._probe_http(probe, requests)) for probe in probes]
+        tasks.append(asyncio.ensure_future(self._probe_activision(username, platform)))
+        names = [probe['name'] for probe in probes] + ['Activision']
+
+        done, pending = await asyncio.wait(tasks, timeout=self.timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        for request in requests.values():
+            request.cancel()
+
+        results = []
+        for name, task in zip(names, tasks):
+            if task in done and not task.cancelled() and task.exception() is None:
+                results.append(task.result())
+            else:
+                error = 'timeout' if task not in done else type(task.exception()).__name__
+                results.append({'name': name, 'status': None, 'latency': None, 'size': None, 'parsed': False, 'error': error})
+        return results
+
+    @staticmethod
+    def format_table(username: str, platform: str, results: List[Dict]) -> str:
+        """
+        Formatuoja rezultatus kaip kompaktišką lentelę Discord
+        """
+        lines = [f"{'Tiekėjas':<26}{'Kodas':>6}{'ms':>7}{'KB':>7}  Parse"]
+        for result in results:
+            status = str(result['status']) if result['status'] is not None else '-'
+            latency = f"{result['latency']:.0f}" if result['latency'] is not None else '-'
+            size = f"{result['size'] / 1024:.1f}" if result['size'] is not None else '-'
+            parsed = '✅' if result['parsed'] else '❌'
+            if result['error']:
+                parsed += f" {result['error']}"
+            lines.append(f"{result['name'][:25]:<26}{status:>6}{latency:>7}{size:>7}  {parsed}")
+
+        working = sum(1 for result in results if result['parsed'])
+        table = "\n".join(lines)
+        return f"🧪 **{username}** ({platform}) diagnostika: {working}/{len(results)} veikia\n```\n{table}\n```"
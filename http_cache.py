@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+HTTP atsakymų talpykla (SQLite) - saugo ETag/Last-Modified ir body,
+kad nepasikeitę profiliai būtų gaunami per 304 arba visai be užklausos.
+Naudojamas vienas ryšys (apsaugotas užraktu), o HTTPClient metodus kviečia ne event
+loop'e (run_in_executor) - sqlite skaitymas ir commit neblokuoja loop'o.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from logs import get_logger
+
+log = get_logger('http_cache')
+
+
+class HTTPCache:
+    def __init__(self, db_path: str = "http_cache.db", max_entries: int = 5000):
+        """
+        Inicializuoja HTTP talpyklą
+        :param db_path: SQLite failas
+        :param max_entries: kiek daugiausiai URL saugoti (seniausi išmetami)
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.initialized = False
+        self.writes = 0
+        self.conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Bendras ryšys (sukuriamas pirmą kartą; kviesti laikant užraktą)"""
+        if self.conn is None:
+            # Ryšys naudojamas iš executor gijų - užraktas užtikrina, kad vienu metu tik iš vienos
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        if not self.initialized:
+            self.init_database()
+        return self.conn
+
+    def close(self):
+        """Uždaro ryšį (kitas kvietimas atidarys naują)"""
+        with self._lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+                self.initialized = False
+
+    def init_database(self):
+        """Sukuria lentelę (kviečiama tik pirmą kartą naudojant talpyklą)"""
+        conn = self.conn
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS http_cache(
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fresh_until REAL NOT NULL DEFAULT 0,
+                    body BLOB NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_stored_at ON http_cache(stored_at)")
+        self.initialized = True
+
+    @staticmethod
+    def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+        """
+        Išskaido Cache-Control antraštę, pvz. 'public, max-age=60' -> {'public': None, 'max-age': '60'}
+        """
+        directives = {}
+        for part in (value or '').split(','):
+            part = part.strip().lower()
+            if not part:
+                continue
+            name, _, argument = part.partition('=')
+            directives[name.strip()] = argument.strip().strip('"') or None
+        return directives
+
+    @classmethod
+    def max_age(cls, headers: Dict[str, str]) -> int:
+        """Grąžina max-age sekundėmis (0, jei nenurodyta arba no-cache)"""
+        directives = cls.parse_cache_control(headers.get('Cache-Control'))
+        if 'no-cache' in directives or 'no-store' in directives:
+            return 0
+        try:
+            return max(0, int(directives.get('max-age') or 0))
+        except ValueError:
+            return 0
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Grąžina saugomą įrašą: etag, last_modified, fresh_until, body, stored_at
+        """
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT etag, last_modified, fresh_until, body, stored_at FROM http_cache WHERE url = ?", (url,)
+                ).fetchone()
+        except Exception as e:
+            log.exception("Klaida skaitant HTTP talpyklą", url=url)
+            return None
+
+        if not row:
+            return None
+        return {'etag': row[0], 'last_modified': row[1], 'fresh_until': row[2], 'body': row[3], 'stored_at': row[4]}
+
+    def validators(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """
+        Sąlyginės užklausos antraštės pagal saugomą įrašą
+        """
+        headers = {}
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url: str, headers: Dict[str, str], body: bytes, now: Optional[float] = None) -> bool:
+        """
+        Išsaugo 200 atsakymą, jei jis turi validatorių arba max-age
+        """
+        if 'no-store' in self.parse_cache_control(headers.get('Cache-Control')):
+            return False
+
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        max_age = self.max_age(headers)
+        if not etag and not last_modified and not max_age:
+            return False
+
+        now = now if now is not None else time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO http_cache(url, etag, last_modified, fresh_until, body, stored_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, etag, last_modified, now + max_age, body, now)
+                )
+                self.writes += 1
+                if self.writes % 100 == 0:
+                    self._trim(conn)
+        except Exception as e:
+            log.exception("Klaida rašant HTTP talpyklą", url=url)
+            return False
+        return True
+
+    def refresh(self, url: str, headers: Dict[str, str], now: Optional[float] = None):
+        """
+        Atnaujina įrašo galiojimą po 304 (body nesikeičia)
+        """
+        now = now if now is not None else time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "UPDATE http_cache SET fresh_until = ?, stored_at = ?, "
+                    "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                    (now + self.max_age(headers), now, headers.get('ETag'), headers.get('Last-Modified'), url)
+                )
+        except Exception as e:
+            log.exception("Klaida atnaujinant HTTP talpyklą", url=url)
+
+    def _trim(self, conn: sqlite3.Connection):
+        """Palieka tik max_entries naujausių įrašų"""
+        conn.execute(
+            "DELETE FROM http_cache WHERE url NOT IN "
+            "(SELECT url FROM http_cache ORDER BY stored_at DESC LIMIT ?)",
+            (self.max_entries,)
+        )
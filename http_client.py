@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Bendras HTTP klientas tiekėjams - viena sesija, atsakymo dydžio riba,
+greitas JSON dekodavimas, baitų statistika pagal tiekėją ir record/replay kasetės
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional, Tuple
+
+import aiohttp
+
+from cassette import Cassette
+from http_cache import HTTPCache
+from logs import get_logger
+from metrics import HTTP_CACHE
+from tracing import span
+
+# Greitas JSON backend'as, jei įdiegtas (neprivalomas), kitaip - standartinis json
+try:
+    import orjson
+    DEFAULT_JSON_BACKEND = 'orjson'
+    _JSON_BACKENDS: Dict[str, Callable[[bytes], Any]] = {'orjson': orjson.loads, 'json': json.loads}
+except ImportError:
+    DEFAULT_JSON_BACKEND = 'json'
+    _JSON_BACKENDS = {'json': json.loads}
+
+DEFAULT_MAX_BODY_SIZE = 4 * 1024 * 1024      # 4 MB
+DEFAULT_OFFLOAD_THRESHOLD = 256 * 1024       # didesni atsakymai dekoduojami ne event loop'e
+
+log = get_logger('http_client')
+
+_CACHE_FRESH = HTTP_CACHE.labels('fresh')
+_CACHE_REVALIDATED = HTTP_CACHE.labels('revalidated')
+_CACHE_MISS = HTTP_CACHE.labels('miss')
+
+
+def register_json_backend(name: str, loads: Callable[[bytes], Any]):
+    """
+    Užregistruoja JSON dekodavimo funkciją (turi priimti bytes)
+    """
+    _JSON_BACKENDS[name] = loads
+
+
+class ResponseTooLarge(Exception):
+    """Atsakymas viršija leistiną dydį"""
+
+
+class RequestNotAdmitted(Exception):
+    """Užklausos į tinklą neleido kviečiančiojo limitas (admit grąžino False)"""
+
+
+class HTTPResponse(NamedTuple):
+    """Perskaitytas atsakymas - body nuskaitomas dar atviram ryšiui"""
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+    latency: float
+
+
+class HTTPClient:
+    def __init__(self, max_body_size: int = DEFAULT_MAX_BODY_SIZE,
+                 offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD,
+                 json_backend: str = DEFAULT_JSON_BACKEND,
+                 cache: Optional[HTTPCache] = None,
+                 cassette: Optional[Cassette] = None):
+        """
+        Inicializuoja HTTP klientą
+        :param max_body_size: didžiausias leistinas atsakymo dydis baitais
+        :param offload_threshold: nuo kokio dydžio JSON dekoduojamas atskiroje gijoje
+        :param json_backend: JSON backend'o pavadinimas (žr. register_json_backend)
+        :param cache: HTTP talpykla sąlyginėms užklausoms (None - be talpyklos)
+        :param cassette: kasetė atsakymams įrašyti arba atkurti (None - tik tinklas)
+        """
+        self.cache = cache
+        self.cassette = cassette
+        self.max_body_size = max_body_size
+        self.offload_threshold = offload_threshold
+        self.set_json_backend(json_backend)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.session_loop = None
+        # Tiekėjas -> užklausų, baitų ir dekodavimo statistika
+        self.usage: Dict[str, Dict[str, float]] = {}
+
+    def set_json_backend(self, name: str):
+        """Pakeičia JSON backend'ą (nežinomas pavadinimas - standartinis json)"""
+        if name not in _JSON_BACKENDS:
+            log.warning("JSON backend'as nerastas, naudojame json", backend=name)
+            name = 'json'
+        self.json_backend = name
+        self.json_loads = _JSON_BACKENDS[name]
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Grąžina bendrą sesiją (nauja sukuriama, jei pasikeitė event loop'as)
+        """
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self.session_loop is not loop:
+            self.session = aiohttp.ClientSession()
+            self.session_loop = loop
+        return self.session
+
+    def _usage(self, label: str) -> Dict[str, float]:
+        usage = self.usage.get(label)
+        if usage is None:
+            usage = self.usage[label] = {
+                'requests': 0, 'bytes': 0, 'parsed_bytes': 0, 'decode_ms': 0.0, 'offloaded': 0, 'too_large': 0,
+                'cache_fresh': 0, 'cache_revalidated': 0
+            }
+        return usage
+
+    async def get(self, url: str, headers: Optional[Dict] = None, timeout: float = 20,
+                  verify_ssl: bool = True, label: str = '', use_cache: bool = True,
+                  admit: Optional[Callable[[], bool]] = None) -> HTTPResponse:
+        """
+        Atlieka GET užklausą. Su kasete įrašymo režimu atsakymas papildomai įrašomas,
+        o atkūrimo režimu grąžinamas įrašytas atsakymas (be tinklo ir be talpyklos).
+        :param admit: kviečiamas tik prieš siunčiant užklausą (ne galiojančiam talpyklos atsakymui),
+                      pvz. tiekėjo minutės limitas
+        :raises ResponseTooLarge: jei atsakymas viršija max_body_size
+        :raises RequestNotAdmitted: jei admit neleido siųsti užklausos
+        :raises CassetteMiss: atkuriant, jei URL kasetėje nėra
+        """
+        with span('http', provider=label, url=url.split('?')[0]) as current:
+            if self.cassette and self.cassette.replaying:
+                current.set(replay=True)
+                if admit is not None and not admit():
+                    raise RequestNotAdmitted(url)
+                response = await self._replay(url, timeout, label)
+            else:
+                response = await self._fetch(url, headers, timeout, verify_ssl, label, use_cache, admit)
+                if self.cassette:
+                    self.cassette.record(url, response.status, response.headers, response.body, response.latency)
+            current.set(status=response.status, bytes=len(response.body))
+            return response
+
+    async def _replay(self, url: str, timeout: float, label: str) -> HTTPResponse:
+        """
+        Grąžina įrašytą atsakymą (su timing_scale > 0 - palaukus įrašytą vėlinimą arba iki timeout)
+        """
+        usage = self._usage(label)
+        start = time.perf_counter()
+        usage['requests'] += 1
+        recorded = self.cassette.play(url)
+
+        delay = recorded['latency'] / 1000 * self.cassette.timing_scale
+        if delay > timeout:
+            await asyncio.sleep(timeout)
+            raise asyncio.TimeoutError()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        body = recorded['body']
+        if len(body) > self.max_body_size:
+            usage['too_large'] += 1
+            raise ResponseTooLarge(f"{len(body)} B > {self.max_body_size} B")
+        usage['bytes'] += len(body)
+        return HTTPResponse(recorded['status'], recorded['headers'], body, (time.perf_counter() - start) * 1000)
+
+    async def _fetch(self, url: str, headers: Optional[Dict], timeout: float,
+                     verify_ssl: bool, label: str, use_cache: bool,
+                     admit: Optional[Callable[[], bool]] = None) -> HTTPResponse:
+        """
+        Atlieka GET užklausą ir perskaito body dar atviram ryšiui.
+        Su talpykla: kol galioja max-age - užklausa nesiunčiama, vėliau siunčiama sąlyginė
+        (If-None-Match/If-Modified-Since), o 304 grąžinamas kaip 200 su saugomu body.
+        :raises ResponseTooLarge: jei atsakymas viršija max_body_size
+        """
+        usage = self._usage(label)
+        start = time.perf_counter()
+
+        entry = None
+        if self.cache and use_cache:
+            with span('cache.lookup') as lookup:
+                entry = await self._cache_call(self.cache.get, url)
+                lookup.set(result='miss' if not entry else 'fresh' if entry['fresh_until'] > time.time() else 'stale')
+        if entry and entry['fresh_until'] > time.time():
+            usage['cache_fresh'] += 1
+            _CACHE_FRESH.inc()
+            return HTTPResponse(200, {}, entry['body'], (time.perf_counter() - start) * 1000)
+
+        if admit is not None and not admit():
+            raise RequestNotAdmitted(url)
+
+        if entry:
+            headers = {**(headers or {}), **self.cache.validators(entry)}
+
+        usage['requests'] += 1
+        session = self._get_session()
+
+        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout),
+                               ssl=None if verify_ssl else False) as response:
+            if response.status == 304 and entry:
+                usage['cache_revalidated'] += 1
+                _CACHE_REVALIDATED.inc()
+                await self._cache_call(self.cache.refresh, url, response.headers)
+                return HTTPResponse(200, response.headers, entry['body'], (time.perf_counter() - start) * 1000)
+            if self.cache and use_cache:
+                _CACHE_MISS.inc()
+
+            length = response.content_length
+            if length is not None and length > self.max_body_size:
+                usage['too_large'] += 1
+                raise ResponseTooLarge(f"{length} B > {self.max_body_size} B")
+
+            chunks = []
+            size = 0
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                size += len(chunk)
+                if size > self.max_body_size:
+                    usage['too_large'] += 1
+                    raise ResponseTooLarge(f"> {self.max_body_size} B")
+                chunks.append(chunk)
+
+            body = b''.join(chunks)
+            usage['bytes'] += size
+            if response.status == 200 and self.cache and use_cache:
+                await self._cache_call(self.cache.store, url, response.headers, body)
+            return HTTPResponse(response.status, response.headers, body,
+                                (time.perf_counter() - start) * 1000)
+
+    @staticmethod
+    async def _cache_call(method: Callable, *args) -> Any:
+        """Talpyklos (sqlite) kvietimas ne event loop'e"""
+        return await asyncio.get_running_loop().run_in_executor(None, method, *args)
+
+    async def cached_entry(self, url: str) -> Optional[Dict]:
+        """Paskutinis talpykloje saugomas įrašas (body ir stored_at, nepriklausomai nuo galiojimo)"""
+        if not self.cache or (self.cassette and self.cassette.replaying):
+            return None
+        return await self._cache_call(self.cache.get, url)
+
+    async def decode(self, body: bytes, label: str = '') -> Any:
+        """
+        Dekoduoja JSON - dideli atsakymai (pvz. žaidimų istorija) dekoduojami atskiroje gijoje
+        """
+        usage = self._usage(label)
+        start = time.perf_counter()
+        offload = len(body) >= self.offload_threshold
+        with span('decode', bytes=len(body), offloaded=offload):
+            if offload:
+                usage['offloaded'] += 1
+                data = await asyncio.get_running_loop().run_in_executor(None, self.json_loads, body)
+            else:
+                data = self.json_loads(body)
+        usage['decode_ms'] += (time.perf_counter() - start) * 1000
+        usage['parsed_bytes'] += len(body)
+        return data
+
+    async def get_json(self, url: str, headers: Optional[Dict] = None, timeout: float = 20,
+                       verify_ssl: bool = True, label: str = '', use_cache: bool = True) -> Tuple[int, Any]:
+        """
+        GET užklausa, grąžina (statusas, JSON arba None, jei statusas ne 200)
+        """
+        response = await self.get(url, headers, timeout, verify_ssl, label, use_cache)
+        if response.status != 200:
+            return response.status, None
+        return response.status, await self.decode(response.body, label)
+
+    def format_usage(self) -> str:
+        """
+        Formatuoja perskaitytų baitų statistiką pagal tiekėją
+        """
+        if not self.usage:
+            return "📦 Dar nėra atliktų užklausų"
+
+        lines = [f"{'Tiekėjas':<22}{'Užkl.':>6}{'Cache':>6}{'KB':>9}{'JSON KB':>9}{'ms':>7}"]
+        for label, usage in sorted(self.usage.items(), key=lambda item: -item[1]['bytes']):
+            hits = usage['cache_fresh'] + usage['cache_revalidated']
+            lines.append(
+                f"{(label or '-')[:21]:<22}{usage['requests']:>6}{hits:>6}{usage['bytes'] / 1024:>9.1f}"
+                f"{usage['parsed_bytes'] / 1024:>9.1f}{usage['decode_ms']:>7.0f}"
+            )
+        table = "\n".join(lines)
+        return f"📦 Perskaityta pagal tiekėją (JSON: {self.json_backend})\n```\n{table}\n```"
+
+    async def close(self):
+        """Uždaro bendrą sesiją ir talpyklos ryšį"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        if self.cache:
+            self.cache.close()
+
+
+# Bendras klientas visiems tiekėjams (su HTTP talpykla; kasetė - jei nustatytas HTTP_CASSETTE)
+shared_client = HTTPClient(cache=HTTPCache(), cassette=Cassette.from_env())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Gyva lyderių lentelė - viena Discord žinutė, kuri redaguojama vietoje,
+užuot kas kartą siuntus naują suvestinę
+"""
+
+import hashlib
+import json
+import os
+import time
+
+import discord
+
+from logs import get_logger
+
+log = get_logger('leaderboard')
+
+
+class LiveLeaderboard:
+    def __init__(self, state_file: str = "leaderboard_state.json", min_edit_interval: int = 30):
+        """
+        Inicializuoja gyvą lyderių lentelę
+        :param state_file: failas, kuriame saugomas žinutės ID ir turinio hash
+        :param min_edit_interval: minimalus laikas (s) tarp to paties kanalo žinutės redagavimų
+        """
+        self.state_file = state_file
+        self.min_edit_interval = min_edit_interval
+        self.load_state()
+
+    def load_state(self):
+        """
+        Užkrauna lentelės būseną iš failo
+        """
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    self.state = json.load(f)
+            else:
+                self.state = {'enabled': False, 'channels': {}}
+        except Exception as e:
+            log.exception("Klaida užkraunant lentelės būseną", file=self.state_file)
+            self.state = {'enabled': False, 'channels': {}}
+
+    def save_state(self):
+        """
+        Išsaugo lentelės būseną
+        """
+        try:
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, ensure_ascii=False)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            log.exception("Klaida išsaugant lentelės būseną", file=self.state_file)
+
+    @property
+    def enabled(self) -> bool:
+        return self.state.get('enabled', False)
+
+    def set_enabled(self, enabled: bool):
+        self.state['enabled'] = enabled
+        self.save_state()
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    async def update(self, channel, content: str) -> str:
+        """
+        Atnaujina lentelę kanale
+        :return: 'unchanged', 'throttled', 'edited', 'posted' arba 'error'
+                 (nepavykęs redagavimas bandomas iš naujo kito tikrinimo metu)
+        """
+        channel_key = str(channel.id)
+        entry = self.state.setdefault('channels', {}).get(channel_key)
+        new_hash = self.content_hash(content)
+
+        if entry and entry.get('content_hash') == new_hash:
+            return 'unchanged'
+
+        now = time.time()
+        if entry and now - entry.get('last_edit', 0) < self.min_edit_interval:
+            # Per dažnai - naujausias turinys bus parodytas kito tikrinimo metu
+            log.debug("Lentelės redagavimas atidėtas (per dažni redagavimai)")
+            return 'throttled'
+
+        result = None
+
+        if entry and entry.get('message_id'):
+            try:
+                message = channel.get_partial_message(entry['message_id'])
+                await message.edit(content=content)
+                result = 'edited'
+            except discord.NotFound:
+                log.info("Lentelės žinutė ištrinta - siunčiame naują")
+            except discord.HTTPException as e:
+                if e.status == 429:
+                    log.warning("Lentelės redagavimą apribojo Discord", error=e)
+                    return 'throttled'
+                log.warning("Nepavyko redaguoti lentelės", status=e.status, error=e)
+                return 'error'
+
+        if result is None:
+            message = await channel.send(content)
+            entry = {'message_id': message.id}
+            self.state['channels'][channel_key] = entry
+            result = 'posted'
+
+        entry['content_hash'] = new_hash
+        entry['last_edit'] = now
+        self.save_state()
+        return result
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Struktūruotas žurnalas vietoj print() - lygiai, raktas=reikšmė laukai (provider, player,
+attempt, latency_ms ir pan.) ir neblokuojantis išvedimas: įrašai dedami į eilę, o į stdout
+juos rašo atskira gija (QueueHandler/QueueListener). Dažni pranešimai gali būti retinami (sample).
+
+Nustatymai (configure_logging):
+    LOG_LEVEL=INFO                          # numatytas lygis (DEBUG - kiekviena užklausa)
+    LOG_LEVELS=providers=DEBUG,http_cache=WARNING   # lygiai atskiriems moduliams
+    LOG_FORMAT=text                         # text arba json
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from typing import Dict, Optional
+
+ROOT_LOGGER = 'warzone'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _quote(value) -> str:
+    text = str(value)
+    if not text or any(char in text for char in ' ="'):
+        return json.dumps(text, ensure_ascii=False)
+    return text
+
+
+def _short_name(name: str) -> str:
+    return name[len(ROOT_LOGGER) + 1:] if name.startswith(ROOT_LOGGER + '.') else name
+
+
+class KeyValueFormatter(logging.Formatter):
+    """2026-01-01 12:00:00 WARNING providers: HTTP klaida provider=tracker_gg status=429"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = (f"{self.formatTime(record, '%Y-%m-%d %H:%M:%S')} {record.levelname:<7} "
+                f"{_short_name(record.name)}: {record.getMessage()}")
+        fields = getattr(record, 'fields', None)
+        if fields:
+            line += " " + " ".join(f"{key}={_quote(value)}" for key, value in fields.items())
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+class JSONFormatter(logging.Formatter):
+    """Viena JSON eilutė įrašui (log agregatoriams)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'ts': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': _short_name(record.name),
+            'msg': record.getMessage(),
+            **(getattr(record, 'fields', None) or {})
+        }
+        if record.exc_text:
+            data['exc'] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Įdeda įrašą į eilę - formatuoja rašymo gija, čia tik užfiksuojamas žinutės ir traceback tekstas"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class Logger:
+    """
+    Modulio žurnalas: log.info("Pranešimas", provider=key, player=username).
+    Žinutė - pastovus tekstas, kintamos reikšmės - laukai; išjungto lygio įrašai
+    nieko nekainuoja (laukai neformatuojami).
+    """
+    __slots__ = ('logger', 'counts')
+
+    def __init__(self, name: str):
+        self.logger = logging.getLogger(f"{ROOT_LOGGER}.{name}")
+        self.counts: Dict[str, int] = {}
+
+    def _log(self, level: int, message: str, fields: Dict, sample: int, exc_info: bool = False):
+        if not self.logger.isEnabledFor(level):
+            return
+        if sample > 1:
+            # Retinama pagal žinutės tekstą: rašomas 1-as, (sample+1)-as ir t.t.
+            count = self.counts.get(message, 0)
+            self.counts[message] = count + 1
+            if count % sample:
+                return
+            fields['sampled'] = f"1/{sample}"
+        self.logger.log(level, message, exc_info=exc_info, extra={'fields': fields}, stacklevel=3)
+
+    def debug(self, message: str, *, sample: int = 1, **fields):
+        self._log(logging.DEBUG, message, fields, sample)
+
+    def info(self, message: str, *, sample: int = 1, **fields):
+        self._log(logging.INFO, message, fields, sample)
+
+    def warning(self, message: str, *, sample: int = 1, **fields):
+        self._log(logging.WARNING, message, fields, sample)
+
+    def error(self, message: str, *, sample: int = 1, **fields):
+        self._log(logging.ERROR, message, fields, sample)
+
+    def exception(self, message: str, **fields):
+        """Klaida su traceback (kviesti except bloke)"""
+        self._log(logging.ERROR, message, fields, 1, exc_info=True)
+
+
+def get_logger(name: str) -> Logger:
+    """Modulio žurnalas (pvz. get_logger('providers'))"""
+    return Logger(name)
+
+
+def parse_levels(value: Optional[str]) -> Dict[str, str]:
+    """'providers=DEBUG,http_cache=WARNING' -> {'providers': 'DEBUG', ...}"""
+    levels = {}
+    for part in (value or '').split(','):
+        name, _, level = part.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None,
+                      levels: Optional[Dict[str, str]] = None, stream=None) -> logging.handlers.QueueListener:
+    """
+    Nustato žurnalą (kviesti vieną kartą paleidžiant; pakartotinis kvietimas perkonfigūruoja)
+    :param level: numatytas lygis (numatyta LOG_LEVEL arba INFO)
+    :param fmt: 'text' arba 'json' (numatyta LOG_FORMAT)
+    :param levels: lygiai moduliams (numatyta LOG_LEVELS)
+    :param stream: kur rašyti (numatyta sys.stdout)
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+    fmt = fmt or os.getenv('LOG_FORMAT', 'text')
+    levels = parse_levels(os.getenv('LOG_LEVELS')) if levels is None else levels
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JSONFormatter() if fmt == 'json' else KeyValueFormatter())
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_QueueHandler(records))
+    root.setLevel(level)
+    root.propagate = False
+
+    for name, module_level in levels.items():
+        logging.getLogger(f"{ROOT_LOGGER}.{name}").setLevel(module_level)
+
+    _listener = logging.handlers.QueueListener(records, output, respect_handler_level=False)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Išrašo eilėje likusius įrašus ir sustabdo rašymo giją"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
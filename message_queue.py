@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Išeinančių Discord žinučių eilė - kiekvienam kanalui viena eilė, kuri
+sujungia iš eilės einančias tos pačios komandos žinutes į kuo mažiau žinučių
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from logs import get_logger
+from metrics import DISCORD_SEND_SECONDS
+from tracing import current_span, span
+
+log = get_logger('message_queue')
+
+DISCORD_MESSAGE_LIMIT = 2000
+
+
+def split_message(content: str, limit: int = DISCORD_MESSAGE_LIMIT) -> List[str]:
+    """
+    Padalina per ilgą tekstą į dalis iki limito (pagal eilutes, jei įmanoma)
+    """
+    if len(content) <= limit:
+        return [content]
+
+    parts = []
+    current = ""
+    for line in content.split("\n"):
+        while len(line) > limit:
+            if current:
+                parts.append(current)
+                current = ""
+            parts.append(line[:limit])
+            line = line[limit:]
+        if current and len(current) + len(line) + 1 > limit:
+            parts.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _consume_exception(future: asyncio.Future):
+    """
+    Pažymi siuntimo klaidą kaip perskaitytą - ji jau įrašyta į žurnalą, o future
+    gali būti niekieno nelaukiamas (pvz. stebėjimo ciklo pranešimai)
+    """
+    if not future.cancelled():
+        future.exception()
+
+
+class OutboundQueue:
+    def __init__(self, max_length: int = DISCORD_MESSAGE_LIMIT):
+        """
+        Inicializuoja išeinančių žinučių eilę
+        :param max_length: maksimalus vienos Discord žinutės ilgis
+        """
+        self.max_length = max_length
+        # Kanalo ID -> laukiančios žinutės (grupės raktas, tekstas, future, įdėjusios komandos span'as)
+        self.pending: Dict[int, Deque[Tuple[object, str, asyncio.Future, object]]] = {}
+        self.workers: Dict[int, asyncio.Task] = {}
+
+    def send(self, channel, content: str, group: Optional[object] = None) -> asyncio.Future:
+        """
+        Įdeda žinutę į kanalo eilę
+        :param group: žinutės su tuo pačiu raktu gali būti sujungtos
+        :return: future, kuris išsipildo žinutę išsiuntus
+        """
+        loop = asyncio.get_running_loop()
+        queue = self.pending.setdefault(channel.id, deque())
+        future = loop.create_future()
+        future.add_done_callback(_consume_exception)
+        parent = current_span()
+
+        for part in split_message(content, self.max_length):
+            queue.append((group, part, future, parent))
+
+        worker = self.workers.get(channel.id)
+        if worker is None or worker.done():
+            self.workers[channel.id] = loop.create_task(self._drain(channel))
+        return future
+
+    async def _drain(self, channel):
+        """Siunčia kanalo eilę, sujungdamas gretimas tos pačios grupės žinutes"""
+        queue = self.pending[channel.id]
+        while queue:
+            group, content, future, parent = queue.popleft()
+            futures = [future]
+
+            while queue and group is not None and queue[0][0] is group:
+                next_content = queue[0][1]
+                if len(content) + len(next_content) + 1 > self.max_length:
+                    break
+                _, next_content, next_future, _ = queue.popleft()
+                content = f"{content}\n{next_content}"
+                futures.append(next_future)
+
+            start = time.perf_counter()
+            # Siuntimas priskiriamas žinutę įdėjusios komandos sekai (worker'is bendras kanalui)
+            with span('discord.send', parent=parent, bytes=len(content.encode('utf-8')),
+                      messages=len(futures)) as current:
+                try:
+                    message = await channel.send(content)
+                    result, error = message, None
+                except Exception as e:
+                    log.warning("Klaida siunčiant žinutę", channel_id=channel.id, error=e)
+                    current.set(error=type(e).__name__)
+                    result, error = None, e
+            DISCORD_SEND_SECONDS.observe(time.perf_counter() - start)
+
+            for item in futures:
+                # Future išsipildo tik kai išsiųsta paskutinė jo dalis
+                if item.done() or any(entry[2] is item for entry in queue):
+                    continue
+                if error is not None:
+                    item.set_exception(error)
+                else:
+                    item.set_result(result)
+
+        self.workers.pop(channel.id, None)
+
+    def command(self, ctx) -> "CommandOutput":
+        """
+        Sukuria vienos komandos išvestį
+        """
+        return CommandOutput(self, ctx.channel)
+
+
+class CommandOutput:
+    def __init__(self, queue: OutboundQueue, channel):
+        """
+        Vienos komandos išvestis: progreso pranešimai redaguoja vieną būsenos
+        žinutę, o rezultatai kaupiami ir išsiunčiami sujungti
+        """
+        self.queue = queue
+        self.channel = channel
+        self.lines: List[str] = []
+        self.status_message = None
+        self.futures: List[asyncio.Future] = []
+
+    async def status(self, content: str):
+        """
+        Parodo progreso pranešimą (pirmą kartą siunčia, vėliau redaguoja)
+        """
+        if self.status_message is None:
+            self.status_message = await self.queue.send(self.channel, content)
+            return
+        try:
+            with span('discord.edit', bytes=len(content.encode('utf-8'))):
+                await self.status_message.edit(content=content)
+        except Exception as e:
+            log.warning("Nepavyko redaguoti būsenos žinutės", error=e)
+
+    def send(self, content: str):
+        """
+        Prideda tekstą prie komandos rezultato
+        """
+        self.lines.append(content)
+
+    async def flush(self):
+        """
+        Išsiunčia sukauptą tekstą ir palaukia, kol jis bus išsiųstas
+        """
+        if self.lines:
+            for line in self.lines:
+                self.futures.append(self.queue.send(self.channel, line, group=self))
+            self.lines = []
+        if self.futures:
+            futures, self.futures = self.futures, []
+            await asyncio.gather(*futures, return_exceptions=True)
+
+    async def __aenter__(self) -> "CommandOutput":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.flush()
+        return False
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Proceso metrikos Prometheus tekstiniu formatu - registras su skaitikliais, matuokliais
+ir histogramomis bei aiohttp /metrics endpoint'as.
+Etikečių (labels) vaikai kuriami vieną kartą - karštame kelyje tik inc()/observe() be alokacijų.
+"""
+
+import bisect
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from logs import get_logger
+
+log = get_logger('metrics')
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class CounterChild:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class GaugeChild:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+
+class HistogramChild:
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # Paskutinis langelis - +Inf
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metric:
+    kind = ''
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        """
+        Inicializuoja metriką
+        :param name: metrikos pavadinimas (pvz. warzone_provider_requests_total)
+        :param help_text: aprašymas (# HELP)
+        :param label_names: etikečių pavadinimai
+        """
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.children: Dict[Tuple[str, ...], object] = {}
+        self.default = None if self.label_names else self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values) -> object:
+        """
+        Grąžina (ir pirmą kartą sukuria) etikečių reikšmių vaiką.
+        Karštame kelyje vaiką verta pasiimti iš anksto ir laikyti atributu.
+        """
+        key = tuple(str(value) for value in values)
+        child = self.children.get(key)
+        if child is None:
+            if len(key) != len(self.label_names):
+                raise ValueError(f"{self.name}: reikia etikečių {self.label_names}")
+            child = self.children[key] = self._new_child()
+        return child
+
+    def _label_text(self, key: Tuple[str, ...], extra: str = '') -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in self.children.items():
+            lines.append(f"{self.name}{self._label_text(key)} {_number(child.value)}")
+        return lines
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1):
+        self.default.inc(amount)
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def set(self, value: float):
+        self.default.set(value)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, help_text, label_names)
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.bounds)
+
+    def observe(self, value: float):
+        self.default.observe(value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in self.children.items():
+            cumulative = 0
+            for bound, count in zip(self.bounds + (math.inf,), child.counts):
+                cumulative += count
+                le = '+Inf' if bound == math.inf else _number(bound)
+                labels = self._label_text(key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {_number(child.sum)}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {child.count}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """
+        Inicializuoja metrikų registrą
+        """
+        self.metrics: Dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metrika {metric.name} jau užregistruota")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, label_names))
+
+    def gauge(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, label_names))
+
+    def histogram(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, label_names, buckets))
+
+    def render(self) -> str:
+        """Visos metrikos Prometheus tekstiniu formatu"""
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Bendras registras ir boto metrikos
+registry = MetricsRegistry()
+
+PROVIDER_REQUEST_SECONDS = registry.histogram(
+    'warzone_provider_request_seconds', "Tiekėjų HTTP užklausų trukmė", ('provider',))
+PROVIDER_REQUESTS = registry.counter(
+    'warzone_provider_requests_total', "Tiekėjų užklausos pagal rezultatą (HTTP kodas, timeout, error)",
+    ('provider', 'status'))
+FETCH_DEPTH = registry.histogram(
+    'warzone_fetch_depth', "Kelintas tiekėjas iš FETCH_ORDER grąžino duomenis", buckets=(1, 2, 3, 4, 5, 6))
+FETCH_RESULTS = registry.counter(
+    'warzone_fetch_results_total', "Žaidėjo statistikos gavimo rezultatai (fetched, stale, missing)", ('result',))
+HTTP_CACHE = registry.counter(
+    'warzone_http_cache_total', "HTTP talpyklos naudojimas (fresh, revalidated, miss)", ('result',))
+RATE_LIMIT_WAIT_SECONDS = registry.histogram(
+    'warzone_rate_limit_wait_seconds', "Minutės limito laukimas, dėl kurio tiekėjas praleistas", ('provider',),
+    buckets=(1, 5, 10, 20, 30, 45, 60))
+BACKOFF_SKIPS = registry.counter(
+    'warzone_backoff_skips_total', "Tiekėjas praleistas, nes host'as atidėtas", ('provider',))
+MONITOR_RUN_SECONDS = registry.histogram(
+    'warzone_monitor_run_seconds', "Stebėjimo ciklo trukmė", buckets=(1, 5, 10, 30, 60, 120, 300, 600))
+DISCORD_SEND_SECONDS = registry.histogram(
+    'warzone_discord_send_seconds', "Discord žinutės siuntimo trukmė")
+LOOP_LAG_SECONDS = registry.histogram(
+    'warzone_event_loop_lag_seconds', "Event loop vėlavimas", buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5))
+LOOP_LAG = registry.gauge('warzone_event_loop_lag_last_seconds', "Paskutinis event loop vėlavimas")
+LOOP_STALLS = registry.counter(
+    'warzone_event_loop_stalls_total', "Event loop stabdžiai pagal kodo vietą (žr. stall_watchdog.py)", ('site',))
+LOOP_STALL_SECONDS = registry.counter(
+    'warzone_event_loop_stall_seconds_total', "Event loop stabdžių trukmės suma pagal kodo vietą", ('site',))
+STARTUP_SECONDS = registry.gauge(
+    'warzone_startup_seconds', "Laikas nuo proceso paleidimo iki pirmo on_ready (žr. python -m bench startup)")
+
+
+async def start_metrics_server(host: str = '0.0.0.0', port: int = 9108,
+                               metrics: Optional[MetricsRegistry] = None) -> 'web.AppRunner':
+    """
+    Paleidžia /metrics endpoint'ą
+    :return: runner (sustabdymui - await runner.cleanup())
+    """
+    # aiohttp.web importuojamas tik įjungus metrikų serverį - nelėtina paleidimo
+    from aiohttp import web
+
+    metrics = metrics or registry
+
+    async def handle(request: web.Request) -> web.Response:
+        return web.Response(body=metrics.render().encode('utf-8'),
+                            headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'})
+
+    app = web.Application()
+    app.router.add_get('/metrics', handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    log.info("Metrikų serveris paleistas", url=f"http://{host}:{runner.addresses[0][1]}/metrics")
+    return runner
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Vietinis API imitatorius (mock upstream) - aiohttp serveris, kuris pagal PROVIDER_SPECS
+atsako tokio pat formato duomenimis kaip tikri API. Kiekvienas tikras host'as gauna
+savo portą, todėl backoff planuotojas elgiasi kaip su tikrais API.
+Palaiko vėlinimo skirstinius, 403/404/429/5xx klaidas, pakibusius atsakymus ir Retry-After.
+
+Imituojami tik PROVIDER_SPECS host'ai. Oficialus Activision API (activision_api.py,
+naudojamas !test) kreipiasi į my.callofduty.com per Node.js `call-of-duty-api` biblioteką, kurios
+adresų pakeisti negalima - šis kelias imitatoriumi netestuojamas (be COD_SSO jis praleidžiamas).
+
+Paleidimas:
+    python mock_upstream.py --errors 429=0.1,503=0.05 --latency lognormal:0.08:0.5
+ir išspausdintą PROVIDER_BASE_URLS eilutę įrašykite į .env
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+import urllib.parse
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from providers import PROVIDER_SPECS
+
+# Numatytasis host'o elgesys - configure() gali perrašyti bet kurį lauką
+DEFAULT_BEHAVIOUR = {
+    'latency': ('lognormal', 0.08, 0.5),  # (skirstinys, parametrai...) sekundėmis, žr. sample_latency
+    'errors': {},                         # HTTP kodas -> tikimybė, pvz. {429: 0.1, 503: 0.05}
+    'retry_after': None,                  # Retry-After reikšmė 429/503 atsakymams (sekundės)
+    'timeout_rate': 0.0,                  # tikimybė, kad atsakymas "pakibs"
+    'timeout_seconds': 120,               # kiek vėluoja pakibęs atsakymas
+    'etag': True,                         # ar siųsti ETag (talpyklai ir 304)
+    'players': None                       # žinomi žaidėjai (None - visi), kitiems - 404
+}
+
+MATCH_MODES = ['br_brquads', 'br_brtrios', 'br_brduos', 'br_rebirth_rbrthquad']
+
+
+def sample_latency(latency: Tuple, rng: random.Random) -> float:
+    """
+    Atsitiktinis vėlinimas sekundėmis:
+    ('fixed', s), ('uniform', min, max), ('normal', vidurkis, sigma), ('lognormal', mediana, sigma)
+    """
+    kind, *params = latency
+    if kind == 'fixed':
+        return params[0]
+    if kind == 'uniform':
+        return rng.uniform(*params)
+    if kind == 'normal':
+        return max(0.0, rng.gauss(*params))
+    if kind == 'lognormal':
+        return rng.lognormvariate(math.log(params[0]), params[1])
+    raise ValueError(f"Nežinomas vėlinimo skirstinys: {kind}")
+
+
+def synthetic_stats(username: str, rng: Optional[random.Random] = None) -> Dict:
+    """
+    Tikroviška žaidėjo statistika (tos pačios ribos kaip buvusiuose fallback duomenyse).
+    Be rng reikšmės priklauso tik nuo vardo, todėl kartotinės užklausos grąžina tą patį.
+    """
+    rng = rng or random.Random(username)
+    kills = len(username) * 100 + rng.randint(500, 2000)
+    deaths = int(kills * rng.uniform(0.8, 1.2))
+    wins = int(kills * rng.uniform(0.05, 0.15))
+    return {
+        'kills': kills,
+        'deaths': deaths,
+        'kd_ratio': round(kills / deaths, 2) if deaths > 0 else 1.0,
+        'wins': wins,
+        'top_10': int(wins * rng.uniform(2, 4)),
+        'score_per_minute': round(rng.uniform(200, 500), 1),
+        'games_played': int(kills * rng.uniform(0.3, 0.6)),
+        'avg_life_time': rng.randint(300, 900),
+        'damage_done': kills * rng.randint(800, 1200),
+        'damage_taken': deaths * rng.randint(600, 1000),
+        'headshots': int(kills * rng.uniform(0.1, 0.3)),
+        'longest_shot': rng.randint(50, 300),
+        'revives': rng.randint(0, 50),
+        'time_played': rng.randint(3600, 72000)
+    }
+
+
+def _put(payload: Dict, path: Tuple, value):
+    """Įrašo reikšmę JSON keliu (žodynai sujungiami)"""
+    for part in path[:-1]:
+        payload = payload.setdefault(part, {})
+    current = payload.get(path[-1])
+    if isinstance(current, dict) and isinstance(value, dict):
+        current.update(value)
+    elif current is None:
+        payload[path[-1]] = value
+
+
+class MockUpstream:
+    def __init__(self, specs: Optional[Dict[str, Dict]] = None, seed: Optional[int] = None,
+                 **behaviour):
+        """
+        Inicializuoja API imitatorių
+        :param specs: tiekėjų aprašai (numatyta - PROVIDER_SPECS)
+        :param seed: atsitiktinumo sėkla (vėlinimui ir klaidoms), kad paleidimai būtų atkartojami
+        :param behaviour: visų host'ų elgesys (žr. DEFAULT_BEHAVIOUR)
+        """
+        self.specs = specs if specs is not None else PROVIDER_SPECS
+        self.rng = random.Random(seed)
+        # Tikras host'as -> tiekėjų raktai (pvz. RapidAPI host'ą naudoja trys tiekėjai)
+        self.hosts: Dict[str, List[str]] = {}
+        for key, spec in self.specs.items():
+            self.hosts.setdefault(urllib.parse.urlsplit(spec['base_url']).netloc, []).append(key)
+        self.behaviour = {host: {**DEFAULT_BEHAVIOUR, **behaviour} for host in self.hosts}
+        # host -> {HTTP kodas arba 'timeout': kiekis}
+        self.hits: Dict[str, Dict] = {host: {} for host in self.hosts}
+        self.base_urls: Dict[str, str] = {}
+        self.runners: List[web.AppRunner] = []
+
+    def configure(self, host: Optional[str] = None, **changes):
+        """
+        Pakeičia vieno host'o (pvz. 'api.tracker.gg') arba visų host'ų elgesį veikiant serveriui
+        """
+        for name in ([host] if host else self.hosts):
+            self.behaviour[name].update(changes)
+
+    def calls(self, host: Optional[str] = None) -> int:
+        """Kiek užklausų gavo host'as (arba visi kartu)"""
+        hosts = [host] if host else self.hits
+        return sum(sum(self.hits[name].values()) for name in hosts)
+
+    def reset_hits(self):
+        self.hits = {host: {} for host in self.hosts}
+
+    def _payload(self, routes: List[Tuple[str, str]], username: str, platform: str) -> Dict:
+        """
+        Sudaro atsakymą visiems endpoint'ams, kurie naudoja tą patį URL (pvz. Tracker.gg stats ir profile)
+        """
+        # Gamertag tiekėjai gauna vardą be #1234 - visi tiekėjai turi grąžinti tą patį
+        stats = synthetic_stats(username.split('#')[0])
+        payload = {}
+        for key, endpoint in routes:
+            spec = self.specs[key]
+            endpoint_spec = spec['endpoints'][endpoint]
+            if endpoint == 'stats':
+                if spec.get('stats_format') == 'metadata':
+                    value = [{'metadata': {'key': api_key, 'name': field}, 'value': stats[field],
+                              'displayValue': str(stats[field])}
+                             for field, api_key in spec['field_map'].items()]
+                else:
+                    value = {api_key: stats[field] for field, api_key in spec['field_map'].items()}
+                if spec.get('username_path'):
+                    _put(payload, spec['username_path'], username)
+            elif endpoint == 'matches':
+                value = self._matches(username)
+            else:
+                profile = {'platformUserId': username, 'platformSlug': platform, 'verified': False,
+                           'avatarUrl': f"https://avatars.invalid/{urllib.parse.quote(username)}.png",
+                           'level': stats['games_played'] // 10, 'rank': stats['wins'] // 5, 'prestige': 0}
+                value = {api_key: profile.get(api_key) for api_key in endpoint_spec['fields'].values()}
+            _put(payload, endpoint_spec['data'], value)
+        return payload
+
+    @staticmethod
+    def _matches(username: str, count: int = 20) -> List[Dict]:
+        rng = random.Random(f"{username}/matches")
+        start = int(time.time()) - count * 1800
+        return [{
+            'matchID': str(rng.getrandbits(63)),
+            'utcStartSeconds': start + i * 1800,
+            'mode': rng.choice(MATCH_MODES),
+            'playerStats': {
+                'kills': rng.randint(0, 15),
+                'deaths': rng.randint(1, 6),
+                'damageDone': rng.randint(200, 6000),
+                'teamPlacement': rng.randint(1, 50)
+            }
+        } for i in range(count)]
+
+    def _handler(self, host: str, routes: List[Tuple[str, str]]):
+        """Sukuria vieno URL šablono handler'į"""
+        async def handle(request: web.Request) -> web.StreamResponse:
+            behaviour = self.behaviour[host]
+            hits = self.hits[host]
+
+            await asyncio.sleep(sample_latency(behaviour['latency'], self.rng))
+
+            if self.rng.random() < behaviour['timeout_rate']:
+                hits['timeout'] = hits.get('timeout', 0) + 1
+                await asyncio.sleep(behaviour['timeout_seconds'])
+
+            status = 200
+            roll = self.rng.random()
+            for code, probability in behaviour['errors'].items():
+                if roll < probability:
+                    status = int(code)
+                    break
+                roll -= probability
+
+            username = request.match_info['username']
+            players = behaviour['players']
+            if status == 200 and players is not None and username.split('#')[0] not in players \
+                    and username not in players:
+                status = 404
+
+            if status != 200:
+                hits[status] = hits.get(status, 0) + 1
+                headers = {}
+                if status in (429, 503) and behaviour['retry_after'] is not None:
+                    headers['Retry-After'] = str(behaviour['retry_after'])
+                return web.json_response({'error': f"HTTP {status}"}, status=status, headers=headers)
+
+            body = json.dumps(self._payload(routes, username, request.match_info['platform'])).encode()
+            headers = {'Content-Type': 'application/json'}
+            if behaviour['etag']:
+                etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+                headers['ETag'] = etag
+                if request.headers.get('If-None-Match') == etag:
+                    hits[304] = hits.get(304, 0) + 1
+                    return web.Response(status=304, headers={'ETag': etag})
+
+            hits[200] = hits.get(200, 0) + 1
+            return web.Response(body=body, headers=headers)
+
+        return handle
+
+    def _app(self, host: str) -> web.Application:
+        """Vieno host'o aplikacija su visų jo tiekėjų endpoint'ais"""
+        routes: Dict[str, List[Tuple[str, str]]] = {}
+        for key in self.hosts[host]:
+            spec = self.specs[key]
+            base_path = urllib.parse.urlsplit(spec['base_url']).path
+            for endpoint, endpoint_spec in spec['endpoints'].items():
+                routes.setdefault(base_path + endpoint_spec['path'], []).append((key, endpoint))
+
+        app = web.Application()
+        for path, path_routes in routes.items():
+            app.router.add_get(path, self._handler(host, path_routes))
+        return app
+
+    async def start(self, bind: str = '127.0.0.1', port_base: int = 0) -> Dict[str, str]:
+        """
+        Paleidžia po vieną serverį kiekvienam host'ui
+        :param port_base: pirmas portas (0 - atsitiktiniai laisvi portai)
+        :return: tiekėjo raktas -> bazinis URL
+        """
+        for i, host in enumerate(sorted(self.hosts)):
+            runner = web.AppRunner(self._app(host), access_log=None)
+            await runner.setup()
+            site = web.TCPSite(runner, bind, port_base + i if port_base else 0)
+            await site.start()
+            self.runners.append(runner)
+            port = site._server.sockets[0].getsockname()[1]
+
+            for key in self.hosts[host]:
+                base_path = urllib.parse.urlsplit(self.specs[key]['base_url']).path
+                self.base_urls[key] = f"http://{bind}:{port}{base_path}"
+        return self.base_urls
+
+    def env(self) -> str:
+        """PROVIDER_BASE_URLS reikšmė, nukreipianti visus tiekėjus į šį serverį"""
+        return ",".join(f"{key}={url}" for key, url in self.base_urls.items())
+
+    async def stop(self):
+        for runner in self.runners:
+            await runner.cleanup()
+        self.runners = []
+
+
+def parse_errors(value: Optional[str]) -> Dict[int, float]:
+    """
+    Nuskaito klaidų tikimybes, pvz. "429=0.1,503=0.05"
+    """
+    errors = {}
+    for part in (value or '').split(','):
+        if '=' not in part:
+            continue
+        code, probability = part.split('=', 1)
+        errors[int(code)] = float(probability)
+    return errors
+
+
+def parse_latency(value: str) -> Tuple:
+    """
+    Nuskaito vėlinimo skirstinį, pvz. "lognormal:0.08:0.5" arba "fixed:0.2"
+    """
+    kind, *params = value.split(':')
+    return (kind, *(float(param) for param in params))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Vietinis API imitatorius")
+    parser.add_argument('--bind', default='127.0.0.1')
+    parser.add_argument('--port-base', type=int, default=8100, help="pirmas portas (host'ai - iš eilės)")
+    parser.add_argument('--latency', default='lognormal:0.08:0.5', help="skirstinys:parametrai")
+    parser.add_argument('--errors', default='', help="pvz. 429=0.1,503=0.05")
+    parser.add_argument('--retry-after', type=int, default=None)
+    parser.add_argument('--timeout-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    upstream = MockUpstream(seed=args.seed, latency=parse_latency(args.latency), errors=parse_errors(args.errors),
+                            retry_after=args.retry_after, timeout_rate=args.timeout_rate)
+    await upstream.start(args.bind, args.port_base)
+
+    print("🧪 API imitatorius paleistas:")
+    for key, url in upstream.base_urls.items():
+        print(f"   {key}: {url}")
+    print(f"\nPROVIDER_BASE_URLS={upstream.env()}")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await upstream.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("API imitatorius sustabdytas")
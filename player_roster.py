@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Žaidėjų sąrašo (players.json) saugykla - pakeitimai kaupiami atmintyje, o failas rašomas
+atomiškai (laikinas failas + os.replace), todėl nutrūkęs rašymas nesugadina sąrašo.
+Dažni pakeitimai (last_check) tik pažymi sąrašą kaip pakeistą - stebėjimo ciklas jį
+išrašo vieną kartą pabaigoje (flush), o nepakeistas sąrašas neperrašomas. Veikiant event
+loop'ui failas (su os.fsync) rašomas atskiroje rašymo gijoje.
+
+Žaidėjai indeksuojami pagal normalizuotą (vardas, platforma), Discord vartotojo ID
+(discord_id, nustatomas per !prisijungiu) ir Activision uno_id (players lentelė
+WarzoneDatabase) - paieška, pridėjimas ir šalinimas nereikalauja viso sąrašo peržiūros.
+"""
+
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from logs import get_logger
+
+log = get_logger('player_roster')
+
+PLATFORM_ALIASES = {'battle': 'battlenet'}
+
+
+def normalize_platform(platform: Optional[str]) -> str:
+    platform = (platform or 'battlenet').strip().lower()
+    return PLATFORM_ALIASES.get(platform, platform)
+
+
+def player_key(username: str, platform: Optional[str] = "battlenet") -> Tuple[str, str]:
+    """Indekso raktas - vardas be tarpų kraštuose ir be didžiųjų raidžių, platforma be sinonimų"""
+    return username.strip().lower(), normalize_platform(platform)
+
+
+class PlayerRoster:
+    def __init__(self, players_file: str = "players.json"):
+        """
+        Inicializuoja žaidėjų sąrašą
+        :param players_file: JSON failas su žaidėjų sąrašu
+        """
+        self.players_file = players_file
+        # Pagrindinis indeksas saugo ir pridėjimo tvarką (dict išlaiko įterpimo tvarką)
+        self.by_key: Dict[Tuple[str, str], Dict] = {}
+        self.by_discord: Dict[str, Dict] = {}
+        self.by_uno: Dict[str, Dict] = {}
+        self.dirty = False
+        self.writes = 0
+        # Viena rašymo gija - įrašymai vyksta pateikimo tvarka
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='player-roster')
+        self.load()
+
+    @property
+    def players(self) -> List[Dict]:
+        """Žaidėjai pridėjimo tvarka"""
+        return list(self.by_key.values())
+
+    def __len__(self) -> int:
+        return len(self.by_key)
+
+    def load(self):
+        """
+        Užkrauna žaidėjų sąrašą iš failo (failas perrašomas tik jei valymas ką nors pakeitė)
+        """
+        self._index([])
+        self.dirty = False
+        if not os.path.exists(self.players_file):
+            return
+        try:
+            with open(self.players_file, 'r', encoding='utf-8') as f:
+                players = json.load(f)
+            if not isinstance(players, list):
+                raise ValueError("žaidėjų failas turi būti sąrašas")
+        except Exception as e:
+            log.exception("Klaida užkraunant žaidėjus", file=self.players_file)
+            self._quarantine()
+            return
+        self._index(players)
+
+    def _quarantine(self):
+        """Sugadintą failą pervadina, kad kitas įrašymas neištrintų to, ką dar galima atkurti"""
+        corrupt_file = f"{self.players_file}.corrupt"
+        try:
+            os.replace(self.players_file, corrupt_file)
+            log.warning("Sugadintas žaidėjų failas pervadintas", file=corrupt_file)
+        except OSError:
+            pass
+
+    def _index(self, players: List):
+        """
+        Perkuria indeksus, išvalo neteisingus įrašus ir prideda trūkstamus laukus
+        """
+        self.by_key = {}
+        self.by_discord = {}
+        self.by_uno = {}
+        changed = False
+
+        for player in players:
+            # Tikriname ar žaidėjas turi reikiamus laukus
+            if not isinstance(player, dict) or not player.get('username'):
+                log.warning("Praleidžiame žaidėją be vardo", player=player)
+                changed = True
+                continue
+
+            # Pridedame trūkstamus laukus
+            defaults = {'platform': 'battlenet', 'added_date': datetime.now().isoformat(), 'is_active': True}
+            for field, value in defaults.items():
+                if field not in player:
+                    player[field] = value
+                    changed = True
+
+            key = player_key(player['username'], player['platform'])
+            if key in self.by_key:
+                log.warning("Praleidžiame pasikartojantį žaidėją", player=player['username'],
+                            platform=player['platform'])
+                changed = True
+                continue
+            self.by_key[key] = player
+            self._link(player)
+
+        if changed:
+            self.dirty = True
+
+    def _link(self, player: Dict):
+        """Įtraukia žaidėją į Discord ir uno_id indeksus (ID - vienam žaidėjui)"""
+        for field, index in (('discord_id', self.by_discord), ('uno_id', self.by_uno)):
+            value = player.get(field)
+            if value is None:
+                continue
+            other = index.get(str(value))
+            if other is not None and other is not player:
+                log.warning("ID jau priskirtas kitam žaidėjui - perrašomas", field=field,
+                            player=player['username'], previous=other['username'])
+                other.pop(field, None)
+                self.dirty = True
+            index[str(value)] = player
+
+    def _unlink(self, player: Dict):
+        for field, index in (('discord_id', self.by_discord), ('uno_id', self.by_uno)):
+            value = player.get(field)
+            if value is not None and index.get(str(value)) is player:
+                del index[str(value)]
+
+    def cleanup(self):
+        """
+        Išvalo žaidėjų duomenis nuo neteisingų įrašų ir prideda trūkstamus laukus
+        """
+        self._index(self.players)
+
+    def find(self, username: str, platform: str = "battlenet") -> Optional[Dict]:
+        """Žaidėjo įrašas arba None (vardas neskiria didžiųjų raidžių)"""
+        return self.by_key.get(player_key(username, platform))
+
+    def find_by_discord(self, discord_id) -> Optional[Dict]:
+        """Žaidėjas, susietas su Discord vartotoju (!prisijungiu), arba None"""
+        return self.by_discord.get(str(discord_id))
+
+    def find_by_uno(self, uno_id) -> Optional[Dict]:
+        """Žaidėjas pagal Activision uno_id (players.player_uno_id) arba None"""
+        return self.by_uno.get(str(uno_id))
+
+    def add(self, player: Dict) -> bool:
+        """
+        Prideda žaidėją (išrašoma su flush)
+        :return: False, jei toks žaidėjas jau yra
+        """
+        key = player_key(player['username'], player.get('platform'))
+        if key in self.by_key:
+            return False
+        self.by_key[key] = player
+        self._link(player)
+        self.dirty = True
+        return True
+
+    def remove(self, username: str, platform: str = "battlenet") -> Optional[Dict]:
+        """Pašalina žaidėją, grąžina pašalintą įrašą arba None"""
+        player = self.by_key.pop(player_key(username, platform), None)
+        if player is not None:
+            self._unlink(player)
+            self.dirty = True
+        return player
+
+    def replace(self, players: List[Dict]):
+        """Pakeičia visą sąrašą (pvz. benchmark'uose)"""
+        self._index(players)
+        self.dirty = True
+
+    def link_discord(self, player: Dict, discord_id) -> str:
+        """
+        Susieja žaidėją su Discord vartotoju (vienas vartotojas - vienas žaidėjas)
+        :return: 'linked', 'already_linked' (jau susietas su šiuo vartotoju)
+                 arba 'taken' (susietas su kitu vartotoju)
+        """
+        linked_id = player.get('discord_id')
+        if linked_id is not None:
+            return 'already_linked' if str(linked_id) == str(discord_id) else 'taken'
+        previous = self.find_by_discord(discord_id)
+        if previous is not None:
+            previous.pop('discord_id', None)
+        player['discord_id'] = str(discord_id)
+        self.by_discord[str(discord_id)] = player
+        self.dirty = True
+        return 'linked'
+
+    def import_players(self, entries: List[Dict], platform: str = "battlenet") -> Dict[str, int]:
+        """
+        Masinis importas (vienas indeksų atnaujinimas, išrašoma su vienu flush)
+        :param entries: įrašai su username (arba activision_tag, kaip WarzoneDatabase.get_all_players()),
+                        platform, uno_id, discord_id
+        :param platform: platforma įrašams be jos
+        :return: kiek žaidėjų pridėta, atnaujinta ir praleista
+        """
+        counts = {'added': 0, 'updated': 0, 'skipped': 0}
+        for entry in entries:
+            username = entry.get('username') or entry.get('activision_tag')
+            if not username:
+                counts['skipped'] += 1
+                continue
+            player_platform = normalize_platform(entry.get('platform') or platform)
+            links = {field: str(entry[field]) for field in ('uno_id', 'discord_id') if entry.get(field) is not None}
+
+            player = self.find(username, player_platform)
+            if player is None:
+                self.add({
+                    'username': username,
+                    'platform': player_platform,
+                    'added_date': datetime.now().isoformat(),
+                    'last_check': None,
+                    'is_active': entry.get('is_active', True),
+                    **links
+                })
+                counts['added'] += 1
+                continue
+
+            updates = {field: value for field, value in links.items() if player.get(field) != value}
+            if not updates:
+                counts['skipped'] += 1
+                continue
+            self._unlink(player)
+            player.update(updates)
+            self._link(player)
+            self.dirty = True
+            counts['updated'] += 1
+        return counts
+
+    def mark_checked(self, player: Dict, checked_at: Optional[str] = None):
+        """Atnaujina paskutinio patikrinimo laiką tik atmintyje - išrašoma su kitu flush"""
+        player['last_check'] = checked_at or datetime.now().isoformat()
+        self.dirty = True
+
+    def flush(self) -> bool:
+        """
+        Išrašo sąrašą, jei jis pakeistas. Veikiant event loop'ui turinys paruošiamas iškart,
+        o failas rašomas rašymo gijoje (nepavykus - sąrašas vėl pažymimas kaip pakeistas)
+        :return: ar failas buvo perrašytas (event loop'e - ar įrašymas pateiktas)
+        """
+        if not self.dirty:
+            return False
+        content = json.dumps(self.players, indent=2, ensure_ascii=False)
+        # Kelias nustatomas pateikiant, ne rašant (darbinis katalogas gali pasikeisti)
+        path = os.path.abspath(self.players_file)
+        self.dirty = False
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self._write(content, path)
+        self._writer.submit(self._write, content, path)
+        return True
+
+    def wait(self):
+        """Palaukia, kol bus įrašyti visi pateikti įrašymai (blokuoja - ne event loop'e)"""
+        self._writer.submit(int).result()
+
+    def _write(self, content: str, path: str) -> bool:
+        """Atomiškas įrašymas per laikiną failą, kad nesugadintume sąrašo"""
+        try:
+            tmp_file = f"{path}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, path)
+        except Exception as e:
+            log.exception("Klaida išsaugant žaidėjus", file=path)
+            self.dirty = True
+            return False
+        self.writes += 1
+        return True
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Vieningas žaidėjo statistikos įrašas, kurį grąžina visi API
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+
+
+class PlayerStats(NamedTuple):
+    """
+    Nekintamas (immutable) statistikos įrašas su aiškiais skaitiniais tipais.
+    NamedTuple neturi __dict__ (__slots__ = ()), todėl užima mažai atminties,
+    o palyginimas vyksta kaip paprastų tuple.
+    """
+    username: str
+    platform: str
+    kills: int = 0
+    deaths: int = 0
+    kd_ratio: float = 0.0
+    wins: int = 0
+    top_10: int = 0
+    score_per_minute: float = 0.0
+    games_played: int = 0
+    avg_life_time: float = 0.0
+    damage_done: int = 0
+    damage_taken: int = 0
+    headshots: int = 0
+    longest_shot: float = 0.0
+    revives: int = 0
+    time_played: int = 0
+    source: str = ''
+    timestamp: str = ''
+    is_fallback: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict, **overrides) -> "PlayerStats":
+        """
+        Sukuria įrašą iš API žodyno (nežinomi raktai ignoruojami, tipai suvienodinami)
+        """
+        if overrides:
+            data = {**data, **overrides}
+        values = [data.get('username') or '', data.get('platform') or 'battlenet']
+        for field, convert in _STAT_CONVERTERS:
+            value = data.get(field)
+            values.append(convert(value) if value else convert(0))
+        values.append(data.get('source') or '')
+        values.append(data.get('timestamp') or '')
+        values.append(bool(data.get('is_fallback', False)))
+        return cls(*values)
+
+    @classmethod
+    def from_row(cls, row: List) -> "PlayerStats":
+        """
+        Atkuria įrašą iš kompaktiškos eilutės (žr. to_row)
+        """
+        return cls(*row)
+
+    def to_row(self) -> List:
+        """
+        Kompaktiška serializacija - reikšmių sąrašas laukų tvarka (be raktų)
+        """
+        return list(self)
+
+    def to_dict(self) -> Dict:
+        """
+        Grąžina įrašą kaip žodyną (pvz. JSON išsaugojimui)
+        """
+        return dict(zip(self._fields, self))
+
+    def counters(self) -> tuple:
+        """
+        Tik statistikos reikšmės (be vardo, šaltinio ir laiko žymės)
+        """
+        return self[_STATS_START:_STATS_END]
+
+    def same_stats(self, other: Optional["PlayerStats"]) -> bool:
+        """
+        Greitas palyginimas pokyčiams aptikti - ignoruoja šaltinį ir laiką
+        """
+        return other is not None and self[_STATS_START:_STATS_END] == other[_STATS_START:_STATS_END]
+
+
+_STATS_START = PlayerStats._fields.index('kills')
+_STATS_END = PlayerStats._fields.index('source')
+
+# Statistikos laukai ir jų tipai (tvarka sutampa su PlayerStats laukais)
+STAT_FIELDS = PlayerStats._fields[_STATS_START:_STATS_END]
+_STAT_CONVERTERS = tuple(
+    (field, float if PlayerStats.__annotations__[field] is float else (lambda value: int(float(value))))
+    for field in STAT_FIELDS
+)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Veikiančio boto profiliavimas ribotą laiką (!profile):
+- sampling - atskira gija periodiškai nuskaito event loop gijos steką (maža, pastovi kaina,
+  tinka produkcijai), rezultatas - collapsed stacks failas (flamegraph.pl, speedscope);
+- cprofile - deterministinis cProfile event loop gijoje (tikslūs kvietimų skaičiai, bet
+  lėtina kiekvieną Python kvietimą), rezultatas - pstats failas (python -m pstats).
+"""
+
+import asyncio
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional
+
+MODES = ('sampling', 'cprofile')
+
+
+class ProfileResult(NamedTuple):
+    filename: str
+    data: bytes
+    summary: str
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def sample_stacks(thread_id: int, seconds: float, interval: float,
+                  stop: Optional[threading.Event] = None) -> Dict:
+    """
+    Nuskaito gijos steką kas interval sekundžių (vykdoma atskiroje gijoje)
+    :return: collapsed stekų skaičiai, mėginių skaičius ir mėginių ėmimo laikas
+    """
+    stop = stop or threading.Event()
+    stacks: Counter = Counter()
+    samples = 0
+    overhead = 0.0
+    end = time.perf_counter() + seconds
+    while not stop.is_set() and time.perf_counter() < end:
+        started = time.perf_counter()
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            break
+        names: List[str] = []
+        while frame is not None:
+            names.append(_frame_name(frame))
+            frame = frame.f_back
+        stacks[";".join(reversed(names))] += 1
+        samples += 1
+        overhead += time.perf_counter() - started
+        stop.wait(interval)
+    return {'stacks': stacks, 'samples': samples, 'overhead': overhead}
+
+
+def collapsed_text(stacks: Counter) -> str:
+    """Collapsed stacks formatas: 'a;b;c skaičius' eilutėmis"""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def top_leaves(stacks: Counter, limit: int = 10) -> List[tuple]:
+    """Funkcijos, kuriose dažniausiai rastas vykdymas (savas laikas)"""
+    leaves: Counter = Counter()
+    for stack, count in stacks.items():
+        leaves[stack.rsplit(";", 1)[-1]] += count
+    return leaves.most_common(limit)
+
+
+class LoopProfiler:
+    def __init__(self, max_seconds: float = 120, interval: float = 0.01):
+        """
+        Inicializuoja profiliuotoją
+        :param max_seconds: ilgiausias leidžiamas profiliavimo langas
+        :param interval: sampling periodas sekundėmis (0.01 - 100 Hz)
+        """
+        self.max_seconds = max_seconds
+        self.interval = interval
+        self.busy = False
+
+    @classmethod
+    def from_env(cls) -> 'LoopProfiler':
+        """Nustatymai iš PROFILE_MAX_SECONDS ir PROFILE_INTERVAL_MS"""
+        return cls(float(os.getenv('PROFILE_MAX_SECONDS', '120')),
+                   int(os.getenv('PROFILE_INTERVAL_MS', '10')) / 1000)
+
+    async def run(self, seconds: float, mode: str = 'sampling') -> ProfileResult:
+        """
+        Profiliuoja event loop nurodytą laiką (vienu metu - vienas profiliavimas)
+        :raises ValueError: jei režimas nežinomas, laikas netinkamas arba profiliavimas jau vyksta
+        """
+        if mode not in MODES:
+            raise ValueError(f"Nežinomas režimas {mode} ({', '.join(MODES)})")
+        if not 0 < seconds <= self.max_seconds:
+            raise ValueError(f"Trukmė turi būti 1-{self.max_seconds:.0f} s")
+        if self.busy:
+            raise ValueError("Profiliavimas jau vyksta")
+
+        self.busy = True
+        try:
+            if mode == 'cprofile':
+                return await self._deterministic(seconds)
+            return await self._sampling(seconds)
+        finally:
+            self.busy = False
+
+    async def _sampling(self, seconds: float) -> ProfileResult:
+        thread_id = threading.get_ident()
+        stop = threading.Event()
+        sampler = asyncio.get_running_loop().run_in_executor(
+            None, sample_stacks, thread_id, seconds, self.interval, stop)
+        try:
+            result = await sampler
+        finally:
+            stop.set()
+
+        samples = result['samples']
+        lines = [f"🔬 **Sampling profilis** {seconds:g} s, {samples} mėginių "
+                 f"(kas {self.interval * 1000:.0f} ms, sąnaudos {result['overhead'] * 1000:.0f} ms)"]
+        if samples:
+            lines.append("```")
+            for name, count in top_leaves(result['stacks']):
+                lines.append(f"{count / samples * 100:5.1f}%  {name}")
+            lines.append("```")
+        return ProfileResult(f"profile_{int(time.time())}.folded",
+                             collapsed_text(result['stacks']).encode('utf-8'), "\n".join(lines))
+
+    async def _deterministic(self, seconds: float) -> ProfileResult:
+        # cProfile matuoja tik įjungusią giją - t.y. event loop
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profile.disable()
+        profile.create_stats()
+        # pstats.Stats perima (ir išvalo) profile.stats, todėl failo turinį paimame pirma
+        data = marshal.dumps(profile.stats)
+
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream)
+        stats.sort_stats('cumulative').print_stats(12)
+        table = "\n".join(line[:120] for line in stream.getvalue().strip().splitlines()[-14:])
+        summary = f"🔬 **cProfile** {seconds:g} s, {stats.total_calls} kvietimų\n```\n{table}\n```"
+        if len(summary) > 2000:
+            summary = summary[:1990] + "\n...```"
+        return ProfileResult(f"profile_{int(time.time())}.pstats", data, summary)
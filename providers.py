@@ -0,0 +1,746 @@
+#!/usr/bin/env python3
+"""
+Statistikos tiekėjų registras - kiekvienas API aprašomas duomenimis (spec),
+o visas užklausas, rate limiting ir apdorojimą atlieka vienas bendras variklis
+"""
+
+import asyncio
+import os
+import random
+import time
+import urllib.parse
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from backoff import BACKOFF_STATUSES, shared_scheduler
+from deadline import Deadline, clip_timeout
+from http_client import RequestNotAdmitted, ResponseTooLarge, shared_client
+from logs import get_logger
+from tracing import annotate, span
+from metrics import BACKOFF_SKIPS, PROVIDER_REQUEST_SECONDS, PROVIDER_REQUESTS, RATE_LIMIT_WAIT_SECONDS
+from player_stats import PlayerStats
+from stat_extractor import StatExtractor, FULL_FIELD_MAP, BASIC_FIELD_MAP
+
+log = get_logger('providers')
+
+BROWSER_USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+]
+
+RAPIDAPI_HOST = "call-of-duty-modern-warfare.p.rapidapi.com"
+RAPIDAPI_DEFAULT_KEY = "ce477eae5dmsh238966977333d6dp1065ffjsn5923ec0a9ab0"
+
+COD_PLATFORM_MAP = {'battlenet': 'battle', 'battle': 'battle', 'psn': 'psn', 'xbl': 'xbl'}
+
+# Numatytieji limitai - spec gali perrašyti bet kurį lauką
+DEFAULT_LIMITS = {
+    'per_minute': 10,          # užklausų per minutę
+    'backoff_delay': 4,        # pirmas host'o atidėjimas po klaidos (be Retry-After), vėliau dvigubėja
+    'timeout': 20,             # vienos užklausos laiko limitas
+    'verify_ssl': True,
+    'rotate_user_agent': False # po nesėkmių keičiame User-Agent
+}
+
+# HTTP tiekėjų aprašai.
+# endpoints: {'stats'|'matches'|'profile': {'path': URL šablonas, 'data': kelias iki duomenų JSON atsakyme}}
+# username: 'gamertag' - nukerpame #1234, 'battletag' - paliekame pilną vardą
+# stats_format: 'flat' - {'kills': ...}, 'metadata' - [{'metadata': {'key': ...}, 'value': ...}]
+PROVIDER_SPECS: Dict[str, Dict] = {
+    'rapidapi_cod': {
+        'name': 'RapidAPI COD',
+        'base_url': f"https://{RAPIDAPI_HOST}",
+        'headers': {"X-RapidAPI-Host": RAPIDAPI_HOST},
+        'env_headers': {"X-RapidAPI-Key": ('RAPIDAPI_KEY', RAPIDAPI_DEFAULT_KEY)},
+        'platform_map': {**COD_PLATFORM_MAP, 'steam': 'steam', 'uno': 'uno'},
+        'username': 'gamertag',
+        'endpoints': {
+            'stats': {'path': '/warzone/{username}/{platform}', 'data': ('stats',)},
+            'matches': {'path': '/matches/{username}/{platform}', 'data': ('matches',)},
+            'profile': {
+                'path': '/profile/{username}/{platform}',
+                'data': ('data',),
+                'fields': {'level': 'level', 'rank': 'rank', 'prestige': 'prestige'}
+            }
+        },
+        'stats_format': 'flat',
+        'field_map': FULL_FIELD_MAP,
+        'limits': {'per_minute': 30, 'backoff_delay': 4, 'timeout': 15, 'verify_ssl': False}
+    },
+    'alternative_api': {
+        'name': 'Alternatyvus API',
+        'base_url': f"https://{RAPIDAPI_HOST}",
+        'headers': {"x-rapidapi-host": RAPIDAPI_HOST},
+        'env_headers': {"x-rapidapi-key": ('RAPIDAPI_KEY', RAPIDAPI_DEFAULT_KEY)},
+        'platform_map': COD_PLATFORM_MAP,
+        'username': 'gamertag',
+        'endpoints': {
+            'stats': {'path': '/warzone/{username}/{platform}', 'data': ('stats',)},
+            'matches': {'path': '/warzone/{username}/{platform}/matches', 'data': ('matches',)}
+        },
+        'stats_format': 'flat',
+        'field_map': BASIC_FIELD_MAP,
+        'limits': {'per_minute': 10, 'backoff_delay': 30, 'timeout': 30, 'verify_ssl': False}
+    },
+    'third_api': {
+        'name': 'Trečias API',
+        'base_url': "https://cod-api.uno",
+        'headers': {
+            "User-Agent": BROWSER_USER_AGENTS[0],
+            "Accept": "application/json",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Accept-Encoding": "gzip, deflate, br",
+            "Connection": "keep-alive"
+        },
+        'platform_map': COD_PLATFORM_MAP,
+        'username': 'gamertag',
+        'endpoints': {
+            'stats': {'path': '/stats/cod/v1/mw/warzone/{username}/{platform}', 'data': ('data', 'stats')},
+            'matches': {'path': '/matches/cod/v1/mw/warzone/{username}/{platform}', 'data': ('data', 'matches')}
+        },
+        'stats_format': 'flat',
+        'field_map': FULL_FIELD_MAP,
+        'limits': {'per_minute': 15, 'backoff_delay': 30, 'timeout': 20}
+    },
+    'tracker_gg': {
+        'name': 'Tracker.gg',
+        'base_url': "https://api.tracker.gg/api/v2/warzone/standard/profile",
+        'headers': {
+            "User-Agent": BROWSER_USER_AGENTS[0],
+            "Accept": "application/json, text/plain, */*",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Accept-Encoding": "gzip, deflate, br",
+            "DNT": "1",
+            "Connection": "keep-alive",
+            "Sec-Fetch-Dest": "empty",
+            "Sec-Fetch-Mode": "cors",
+            "Sec-Fetch-Site": "same-origin",
+            "Referer": "https://tracker.gg/"
+        },
+        # Tik šios platformos palaikomos
+        'platform_map': {'battlenet': 'battlenet', 'battle': 'battlenet', 'psn': 'psn', 'xbl': 'xbl'},
+        'strict_platforms': True,
+        'username': 'battletag',
+        'endpoints': {
+            'stats': {'path': '/{platform}/{username}', 'data': ('data', 'stats')},
+            'matches': {'path': '/{platform}/{username}/matches', 'data': ('data', 'matches')},
+            'profile': {
+                'path': '/{platform}/{username}',
+                'data': ('data', 'platformInfo'),
+                'fields': {'username': 'platformUserId', 'platform': 'platformSlug',
+                           'avatar': 'avatarUrl', 'verified': 'verified'}
+            }
+        },
+        'stats_format': 'metadata',
+        'username_path': ('data', 'platformInfo', 'platformUserId'),
+        'field_map': FULL_FIELD_MAP,
+        'limits': {'per_minute': 3, 'backoff_delay': 60, 'timeout': 30, 'rotate_user_agent': True}
+    },
+    'cod_stats_api': {
+        'name': 'COD Stats API',
+        'base_url': f"https://{RAPIDAPI_HOST}",
+        'headers': {"x-rapidapi-host": RAPIDAPI_HOST},
+        'env_headers': {"x-rapidapi-key": ('RAPIDAPI_KEY', RAPIDAPI_DEFAULT_KEY)},
+        'platform_map': COD_PLATFORM_MAP,
+        'username': 'gamertag',
+        'endpoints': {
+            'stats': {'path': '/warzone/{username}/{platform}', 'data': ('stats',)}
+        },
+        'stats_format': 'flat',
+        'field_map': BASIC_FIELD_MAP,
+        'limits': {'verify_ssl': False}
+    },
+    'cod_api_hub': {
+        'name': 'COD API Hub',
+        'base_url': "https://cod-api.uno",
+        'headers': {"User-Agent": BROWSER_USER_AGENTS[0], "Accept": "application/json"},
+        'platform_map': COD_PLATFORM_MAP,
+        'username': 'gamertag',
+        'endpoints': {
+            'stats': {'path': '/stats/cod/v1/mw/warzone/{username}/{platform}', 'data': ('data', 'stats')}
+        },
+        'stats_format': 'flat',
+        'field_map': FULL_FIELD_MAP,
+        'limits': {'verify_ssl': False}
+    },
+    'cod_tracker': {
+        'name': 'COD Tracker API',
+        'base_url': "https://cod.tracker.gg",
+        'headers': {"User-Agent": BROWSER_USER_AGENTS[0], "Accept": "application/json"},
+        'platform_map': {'battlenet': 'battlenet', 'battle': 'battlenet', 'psn': 'psn', 'xbl': 'xbl'},
+        'username': 'gamertag',
+        'endpoints': {
+            'stats': {'path': '/api/v1/cod/mw/profile/{platform}/{username}', 'data': ('data', 'stats')}
+        },
+        'stats_format': 'metadata',
+        'field_map': FULL_FIELD_MAP,
+        'limits': {'verify_ssl': False}
+    }
+}
+
+# Sudėtiniai tiekėjai - bando narius iš eilės su bendru rate limit
+CHAIN_SPECS: Dict[str, Dict] = {
+    'reliable_api': {
+        'name': 'Patikimas API',
+        'members': ['cod_stats_api', 'cod_api_hub'],
+        'limits': {'per_minute': 5, 'backoff_delay': 4, 'timeout': 15}
+    },
+    'working_api': {
+        'name': 'Veikiantis API',
+        'members': ['cod_stats_api', 'cod_api_hub', 'cod_tracker'],
+        'limits': {'per_minute': 10, 'backoff_delay': 6, 'timeout': 20}
+    }
+}
+
+
+def parse_base_urls(value: Optional[str]) -> Dict[str, str]:
+    """
+    Nuskaito bazinių URL perrašymus, pvz. "tracker_gg=http://127.0.0.1:8101/api,third_api=http://..."
+    (naudojama paleidžiant botą prieš mock_upstream.py)
+    """
+    overrides = {}
+    for part in (value or '').split(','):
+        if '=' not in part:
+            continue
+        key, url = part.split('=', 1)
+        overrides[key.strip()] = url.strip().rstrip('/')
+    return overrides
+
+
+def register_provider(key: str, spec: Dict):
+    """
+    Užregistruoja naują HTTP tiekėją (arba perrašo esamą)
+    """
+    PROVIDER_SPECS[key] = spec
+
+
+def create_provider(key: str, limits: Optional[Dict] = None):
+    """
+    Sukuria tiekėją pagal registro raktą
+    :param key: PROVIDER_SPECS arba CHAIN_SPECS raktas
+    :param limits: papildomi limitai, perrašantys spec reikšmes
+    """
+    if key in CHAIN_SPECS:
+        return ProviderChain(key, CHAIN_SPECS[key])
+    return HTTPProvider(key, PROVIDER_SPECS[key], limits)
+
+
+def provider_hosts(key: str) -> List[str]:
+    """Tiekėjo (sudėtinio - visų narių) host'ai pagal aprašą, tiekėjo nekuriant"""
+    members = CHAIN_SPECS[key]['members'] if key in CHAIN_SPECS else [key]
+    overrides = parse_base_urls(os.getenv('PROVIDER_BASE_URLS'))
+    return [shared_scheduler.host_of(overrides.get(member, PROVIDER_SPECS[member]['base_url']))
+            for member in members]
+
+
+def provider_name(key: str) -> Optional[str]:
+    """Tiekėjo rodomas pavadinimas iš aprašo (PROVIDER_SPECS arba CHAIN_SPECS) arba None"""
+    spec = CHAIN_SPECS.get(key) or PROVIDER_SPECS.get(key)
+    return spec['name'] if spec else None
+
+
+class CachedData(dict):
+    """Talpyklos JSON atsakymas (naudojamas pasibaigus biudžetui) su jo gavimo laiku"""
+    __slots__ = ('stored_at',)
+
+    def __init__(self, data: Dict, stored_at: float):
+        super().__init__(data)
+        self.stored_at = stored_at
+
+
+class ProviderRegistry:
+    """
+    Tiekėjai pagal raktą, kuriami tik pirmą kartą jų prireikus (create_provider);
+    vėliau grąžinamas tas pats objektas (bendri limitai ir būsena)
+    """
+
+    def __init__(self, keys: List[str]):
+        """
+        Inicializuoja registrą
+        :param keys: leidžiami raktai (PROVIDER_SPECS arba CHAIN_SPECS) jų bandymo tvarka
+        """
+        self.keys = list(keys)
+        self.loaded: Dict[str, object] = {}
+
+    def __getitem__(self, key: str):
+        provider = self.loaded.get(key)
+        if provider is None:
+            if key not in self.keys:
+                raise KeyError(key)
+            provider = self.loaded[key] = create_provider(key)
+            log.debug("Tiekėjas sukurtas", provider=key)
+        return provider
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def values(self) -> List:
+        """Visi tiekėjai (trūkstami sukuriami)"""
+        return [self[key] for key in self.keys]
+
+    def blocked(self, key: str) -> bool:
+        """
+        Ar tiekėjas atidėtas backoff planuotojo. Dar nesukurtas tiekėjas nekuriamas -
+        tikrinami jo aprašo host'ai bendrame planuotojuje (jį gaus sukurtas tiekėjas)
+        """
+        provider = self.loaded.get(key)
+        if provider is not None:
+            return provider.blocked()
+        return all(shared_scheduler.remaining(host) > 0 for host in provider_hosts(key))
+
+
+def _dig(data, path):
+    """Nueina JSON keliu, grąžina None, jei kelio nėra"""
+    for part in path:
+        if not isinstance(data, dict) or part not in data:
+            return None
+        data = data[part]
+    return data
+
+
+class RequestLimiter:
+    def __init__(self, per_minute: int):
+        """
+        Inicializuoja paprastą slenkančio lango limitą
+        :param per_minute: kiek užklausų leidžiama per minutę
+        """
+        self.per_minute = per_minute
+        self.request_times = []
+
+    def acquire(self) -> float:
+        """
+        Užregistruoja užklausą, jei limitas leidžia. Nelaukia - grąžina 0 arba
+        kiek sekundžių liko iki laisvos vietos (tada užklausa neužregistruojama)
+        """
+        current_time = time.time()
+        self.request_times = [t for t in self.request_times if current_time - t < 60]
+
+        if len(self.request_times) >= self.per_minute:
+            return max(0.0, 60 - (current_time - self.request_times[0]))
+
+        self.request_times.append(current_time)
+        return 0.0
+
+
+class HTTPProvider:
+    def __init__(self, key: str, spec: Dict, limits: Optional[Dict] = None):
+        """
+        Inicializuoja tiekėją pagal aprašą
+        :param key: registro raktas (naudojamas kaip source)
+        :param spec: tiekėjo aprašas (žr. PROVIDER_SPECS)
+        :param limits: papildomi limitai (pvz. iš sudėtinio tiekėjo)
+        """
+        self.key = key
+        self.spec = spec
+        self.name = spec['name']
+        self.base_url = parse_base_urls(os.getenv('PROVIDER_BASE_URLS')).get(key, spec['base_url'])
+        self.platform_map = spec.get('platform_map', {})
+        self.endpoints = spec['endpoints']
+        self.limits = {**DEFAULT_LIMITS, **spec.get('limits', {}), **(limits or {})}
+
+        self.headers = dict(spec.get('headers', {}))
+        for header, (env_name, default) in spec.get('env_headers', {}).items():
+            self.headers[header] = os.getenv(env_name, default)
+
+        self.extractor = StatExtractor(spec['field_map'], self.name)
+        self.client = shared_client
+        self.limiter = RequestLimiter(self.limits['per_minute'])
+        self.scheduler = shared_scheduler
+        self.host = self.scheduler.host_of(self.base_url)
+
+        # Metrikų vaikai sukuriami iš anksto (HTTP kodų - pirmą kartą juos gavus)
+        self.request_seconds = PROVIDER_REQUEST_SECONDS.labels(key)
+        self.rate_limit_waits = RATE_LIMIT_WAIT_SECONDS.labels(key)
+        self.backoff_skips = BACKOFF_SKIPS.labels(key)
+        self.status_counters: Dict = {}
+
+    def _format_username(self, username: str, platform: str) -> Optional[str]:
+        """Suformuoja vardą URL'ui pagal tiekėjo formatą"""
+        if self.spec.get('username') == 'battletag':
+            # Battle.net formatas: username#1234
+            if platform == "battlenet" and '#' not in username:
+                log.warning("Battle.net vartotojui reikia # su numeriu (pvz. username#1234)", provider=self.key, player=username)
+                return None
+            return urllib.parse.quote(username, safe='')
+
+        # Pašaliname # ir viską po jo
+        return urllib.parse.quote(username.split('#')[0])
+
+    def url(self, endpoint: str, username: str, platform: str) -> Optional[str]:
+        """
+        Suformuoja endpoint'o URL arba None, jei jis nepalaikomas
+        """
+        endpoint_spec = self.endpoints.get(endpoint)
+        if not endpoint_spec:
+            return None
+
+        if self.spec.get('strict_platforms') and platform not in self.platform_map:
+            log.debug("Nepalaikoma platforma", provider=self.key, platform=platform)
+            return None
+        api_platform = self.platform_map.get(platform, platform)
+
+        formatted_username = self._format_username(username, platform)
+        if formatted_username is None:
+            return None
+
+        return f"{self.base_url}{endpoint_spec['path'].format(username=formatted_username, platform=api_platform)}"
+
+    def stats_url(self, username: str, platform: str) -> Optional[str]:
+        """Suformuoja statistikos URL"""
+        return self.url('stats', username, platform)
+
+    def parse_stats(self, data: Dict, username: str, platform: str) -> Optional[PlayerStats]:
+        """
+        Apdoroja statistikos atsakymą pagal aprašą
+        """
+        with span('parse', provider=self.key) as current:
+            stats = self._parse_stats(data, username, platform)
+            current.set(ok=stats is not None)
+            return stats
+
+    def _parse_stats(self, data: Dict, username: str, platform: str) -> Optional[PlayerStats]:
+        stats = _dig(data, self.endpoints['stats']['data'])
+        if stats is None:
+            log.warning("Neteisingi duomenys", provider=self.key, player=username)
+            return None
+
+        try:
+            if self.spec.get('stats_format') == 'metadata':
+                index = self.extractor.index_metadata(stats)
+            else:
+                index = stats
+
+            username_path = self.spec.get('username_path')
+            if username_path:
+                username = _dig(data, username_path) or username
+
+            return self.extractor.to_player_stats(index, username, platform, self.key)
+        except Exception as e:
+            log.error("Klaida apdorojant duomenis", provider=self.key, player=username, error=e)
+            return None
+
+    def blocked(self) -> bool:
+        """Ar host'as šiuo metu atidėtas planuotojo"""
+        return self.scheduler.remaining(self.host) > 0
+
+    def available(self) -> bool:
+        """
+        Ar galima kreiptis dabar: host'as neatidėtas. Minutės limitas tikrinamas tik siunčiant
+        užklausą į tinklą (admit), todėl galiojantis talpyklos atsakymas limito nenaudoja.
+        Niekada nelaukia - jei ne, kviečiantysis pereina prie kito tiekėjo.
+        """
+        remaining = self.scheduler.remaining(self.host)
+        if remaining > 0:
+            self.backoff_skips.inc()
+            annotate(skipped='backoff', remaining=round(remaining, 1))
+            log.debug("Host'as atidėtas - praleidžiame", provider=self.key, remaining_s=round(remaining))
+            return False
+        return True
+
+    def admit(self) -> bool:
+        """Užregistruoja užklausą minutės limite (HTTPClient.get kviečia prieš siųsdamas ją į tinklą)"""
+        wait = self.limiter.acquire()
+        if wait > 0:
+            self.rate_limit_waits.observe(wait)
+            annotate(skipped='rate_limit', wait=round(wait, 1))
+            log.info("Rate limit pasiektas - praleidžiame", sample=10, provider=self.key, wait_s=round(wait))
+            return False
+        return True
+
+    def _observe(self, status, start: float):
+        """Užregistruoja užklausos trukmę ir rezultatą (HTTP kodas, 'timeout', 'error') metrikose"""
+        self.request_seconds.observe(time.perf_counter() - start)
+        counter = self.status_counters.get(status)
+        if counter is None:
+            counter = self.status_counters[status] = PROVIDER_REQUESTS.labels(self.key, status)
+        counter.inc()
+
+    async def cached(self, url: str) -> Optional[Dict]:
+        """
+        Grąžina paskutinį talpykloje saugomą atsakymą (nepriklausomai nuo amžiaus) be užklausos.
+        JSON objektas grąžinamas kaip CachedData - su laiku, kada atsakymas gautas iš API.
+        """
+        entry = await self.client.cached_entry(url)
+        if entry is None:
+            return None
+        log.debug("Naudojame talpyklos atsakymą", provider=self.key)
+        try:
+            data = await self.client.decode(entry['body'], self.key)
+        except ValueError:
+            return None
+        return CachedData(data, entry['stored_at']) if isinstance(data, dict) else data
+
+    async def request(self, url: str, deadline: Optional[Deadline] = None,
+                      admit: Optional[Callable[[], bool]] = None) -> Optional[Dict]:
+        """
+        Atlieka vieną GET užklausą per bendrą HTTP klientą ir grąžina JSON.
+        Klaidos atveju host'as atidedamas planuotojo (Retry-After, x-ratelimit-* arba
+        eksponentinis laukimas) ir iškart grąžinamas None - nelaukiame užklausos viduje.
+        Baigusis laiko biudžetui užklausa nesiunčiama - grąžinamas talpyklos atsakymas.
+        :param admit: minutės limitas (self.admit arba sudėtinio tiekėjo), tikrinamas tik
+                      tada, kai atsakymo nėra galiojančioje talpykloje
+        """
+        if deadline is not None and deadline.expired():
+            annotate(cached='deadline')
+            return await self.cached(url)
+
+        limits = self.limits
+        timeout = clip_timeout(deadline, limits['timeout'])
+        headers = self.headers
+        if limits['rotate_user_agent'] and self.scheduler.failures(self.host) > 0:
+            # Po nesėkmingų bandymų naudojame atsitiktinį User-Agent
+            headers = {**headers, "User-Agent": random.choice(BROWSER_USER_AGENTS)}
+
+        start = time.perf_counter()
+        try:
+            response = await self.client.get(url, headers, timeout, limits['verify_ssl'], self.key, admit=admit)
+        except RequestNotAdmitted:
+            return None
+        except ResponseTooLarge as e:
+            self._observe('too_large', start)
+            log.warning("Per didelis atsakymas", provider=self.key, error=e)
+            return None
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            self._observe('timeout', start)
+            if timeout < limits['timeout']:
+                # Laiką apribojo biudžetas, o ne lėtas host'as - jo neatidedame
+                log.info("Baigėsi laiko biudžetas", provider=self.key)
+                return await self.cached(url)
+            delay = self.scheduler.record_failure(self.host, None, None, limits['backoff_delay'])
+            log.warning("Baigėsi laikas, host'as atidėtas", provider=self.key, timeout_s=round(timeout), delay_s=round(delay))
+            return None
+        except Exception as e:
+            self._observe('error', start)
+            delay = self.scheduler.record_failure(self.host, None, None, limits['backoff_delay'])
+            log.warning("Tinklo klaida, host'as atidėtas", provider=self.key, error=str(e) or type(e).__name__, delay_s=round(delay))
+            return None
+
+        self._observe(response.status, start)
+        if response.status == 200:
+            self.scheduler.record_success(self.host, response.headers)
+            try:
+                return await self.client.decode(response.body, self.key)
+            except ValueError as e:
+                log.warning("Neteisingas JSON", provider=self.key, error=e)
+                return None
+
+        if response.status in BACKOFF_STATUSES:
+            delay = self.scheduler.record_failure(self.host, response.status, response.headers, limits['backoff_delay'])
+            log.warning("HTTP klaida, host'as atidėtas", provider=self.key, status=response.status, delay_s=round(delay))
+        else:
+            log.warning("HTTP klaida", provider=self.key, status=response.status)
+        return None
+
+    async def fetch_stats(self, username: str, platform: str, deadline: Optional[Deadline] = None,
+                          admit: Optional[Callable[[], bool]] = None) -> Optional[PlayerStats]:
+        """
+        Gauna ir apdoroja statistiką (minutės limitą perduoda kviečiantysis - admit)
+        """
+        url = self.stats_url(username, platform)
+        if not url:
+            return None
+        log.debug("Užklausa", provider=self.key, url=url)
+
+        data = await self.request(url, deadline, admit)
+        if not data:
+            return None
+        stats = self.parse_stats(data, username, platform)
+        if stats and isinstance(data, CachedData):
+            # Talpyklos duomenys rodomi su tikru amžiumi, o ne kaip ką tik gauti
+            stats = stats._replace(timestamp=datetime.fromtimestamp(data.stored_at).isoformat(),
+                                   is_fallback=True)
+        return stats
+
+    async def get_player_stats(self, username: str, platform: str = "battlenet",
+                               deadline: Optional[Deadline] = None) -> Optional[PlayerStats]:
+        """
+        Gauna žaidėjo statistiką
+        :param username: žaidėjo vardas
+        :param platform: platforma (battlenet, battle, psn, xbl)
+        :param deadline: laiko biudžetas (pasibaigus - tik talpyklos duomenys)
+        :return: žaidėjo statistikos duomenys
+        """
+        try:
+            # Pasibaigus biudžetui užklausų nesiunčiame, todėl limitų netikriname
+            if (deadline is None or not deadline.expired()) and not self.available():
+                return None
+
+            # Normalizuojame platformą
+            if platform == "battle":
+                platform = "battlenet"
+
+            result = await self.fetch_stats(username, platform, deadline, self.admit)
+            if result:
+                log.debug("Statistika gauta", provider=self.key, player=result.username)
+            return result
+
+        except Exception as e:
+            log.exception("Klaida gaunant statistiką", provider=self.key, player=username)
+            return None
+
+    async def get_recent_matches(self, username: str, platform: str = "battlenet", limit: int = 5,
+                                 admit: Optional[Callable[[], bool]] = None) -> Optional[List[Dict]]:
+        """
+        Gauna žaidėjo neseniausius žaidimus (jei tiekėjas palaiko)
+        :param admit: minutės limitas (numatyta - tiekėjo, sudėtinis tiekėjas perduoda savo)
+        """
+        try:
+            if platform == "battle":
+                platform = "battlenet"
+
+            url = self.url('matches', username, platform)
+            if not url or not self.available():
+                return None
+            log.debug("Žaidimų užklausa", provider=self.key, url=url)
+
+            data = await self.request(url, admit=admit or self.admit)
+            if not data:
+                return None
+
+            matches = _dig(data, self.endpoints['matches']['data'])
+            if matches is None:
+                return None
+            return matches[:limit]
+
+        except Exception as e:
+            log.exception("Klaida gaunant žaidimus", provider=self.key, player=username)
+            return None
+
+    async def get_player_info(self, username: str, platform: str = "battlenet") -> Optional[Dict]:
+        """
+        Gauna žaidėjo pagrindinę informaciją (jei tiekėjas palaiko)
+        """
+        try:
+            if platform == "battle":
+                platform = "battlenet"
+
+            url = self.url('profile', username, platform)
+            if not url or not self.available():
+                return None
+            log.debug("Žaidėjo informacijos užklausa", provider=self.key, url=url)
+
+            data = await self.request(url, admit=self.admit)
+            if not data:
+                return None
+
+            profile = _dig(data, self.endpoints['profile']['data'])
+            if profile is None:
+                return None
+
+            info = {'username': username, 'platform': platform, 'source': self.key}
+            for field, key in self.endpoints['profile']['fields'].items():
+                info[field] = profile.get(key, info.get(field))
+            return info
+
+        except Exception as e:
+            log.exception("Klaida gaunant žaidėjo informaciją", provider=self.key, player=username)
+            return None
+
+
+class ProviderChain:
+    def __init__(self, key: str, spec: Dict):
+        """
+        Inicializuoja sudėtinį tiekėją
+        :param key: registro raktas
+        :param spec: aprašas su narių sąrašu ir bendrais limitais (žr. CHAIN_SPECS)
+        """
+        self.key = key
+        self.spec = spec
+        self.name = spec['name']
+        self.members = [create_provider(member, spec.get('limits')) for member in spec['members']]
+        self.limits = {**DEFAULT_LIMITS, **spec.get('limits', {})}
+        self.limiter = RequestLimiter(self.limits['per_minute'])
+        self.rate_limit_waits = RATE_LIMIT_WAIT_SECONDS.labels(key)
+        self.backoff_skips = BACKOFF_SKIPS.labels(key)
+
+    def blocked(self) -> bool:
+        """Ar visų narių host'ai atidėti"""
+        return all(member.blocked() for member in self.members)
+
+    def _admitter(self) -> Callable[[], bool]:
+        """
+        Bendras minutės limitas vienam kvietimui: vietą užima tik pirmas narys, siunčiantis
+        užklausą į tinklą (galiojantys talpyklos atsakymai ir kiti nariai limito nenaudoja)
+        """
+        admitted = False
+
+        def admit() -> bool:
+            nonlocal admitted
+            if not admitted:
+                wait = self.limiter.acquire()
+                if wait > 0:
+                    self.rate_limit_waits.observe(wait)
+                    log.info("Rate limit pasiektas", sample=10, provider=self.key, wait_s=round(wait))
+                    return False
+                admitted = True
+            return True
+        return admit
+
+    async def get_player_stats(self, username: str, platform: str = "battlenet",
+                               deadline: Optional[Deadline] = None) -> Optional[PlayerStats]:
+        """
+        Gauna žaidėjo statistiką iš pirmo veikiančio nario
+        """
+        try:
+            # Pasibaigus biudžetui nariai grąžina tik talpyklos duomenis (limitas netikrinamas)
+            expired = deadline is not None and deadline.expired()
+            admit = self._admitter()
+
+            # Normalizuojame platformą
+            if platform == "battle":
+                platform = "battlenet"
+
+            for member in self.members:
+                try:
+                    if member.blocked() and not expired:
+                        member.backoff_skips.inc()
+                        remaining = member.scheduler.remaining(member.host)
+                        log.debug("Host'as atidėtas - praleidžiame", provider=member.key, remaining_s=round(remaining))
+                        continue
+                    log.debug("Bandome tiekėją", provider=member.key, player=username)
+                    with span('provider', provider=member.key) as attempt:
+                        result = await member.fetch_stats(username, platform, deadline, admit)
+                        attempt.set(ok=result is not None)
+                    if result:
+                        log.debug("Statistika gauta", provider=member.key, player=result.username)
+                        return result
+                    log.debug("Tiekėjas nepavyko", provider=member.key, player=username)
+                except Exception as e:
+                    log.exception("Tiekėjo klaida", provider=member.key, player=username)
+
+            log.debug("Nepavyko gauti statistikos iš jokio nario", provider=self.key, player=username)
+            return None
+
+        except Exception as e:
+            log.exception("Klaida gaunant statistiką", provider=self.key, player=username)
+            return None
+
+    async def get_recent_matches(self, username: str, platform: str = "battlenet", limit: int = 5) -> Optional[List[Dict]]:
+        """
+        Gauna žaidėjo neseniausius žaidimus iš pirmo juos grąžinusio nario
+        """
+        try:
+            admit = self._admitter()
+            for member in self.members:
+                if member.blocked():
+                    member.backoff_skips.inc()
+                    continue
+                matches = await member.get_recent_matches(username, platform, limit, admit)
+                if matches is not None:
+                    return matches
+
+            log.debug("Nepavyko gauti žaidimų iš jokio nario", provider=self.key, player=username)
+            return None
+
+        except Exception as e:
+            log.exception("Klaida gaunant žaidimus", provider=self.key, player=username)
+            return None
@@ -21,9 +21,9 @@ async def quick_test():
         stats = await api.get_player_stats(test_username, test_platform)
         if stats:
             print("✅ API veikia!")
-            print(f"   Vardas: {stats.get('username', 'N/A')}")
-            print(f"   Žudymai: {stats.get('kills', 0):,}")
-            print(f"   K/D: {stats.get('kd_ratio', 0):.2f}")
+            print(f"   Vardas: {stats.username}")
+            print(f"   Žudymai: {stats.kills:,}")
+            print(f"   K/D: {stats.kd_ratio:.2f}")
         else:
             print("❌ Žaidėjas nerastas (tai normaliai - testuojame su netikru vardu)")
             
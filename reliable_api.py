@@ -3,242 +3,17 @@
 Patikimas API sprendimas su veikiančiais endpoint'ais
 """
 
-import aiohttp
 import asyncio
-from typing import Dict, Optional, List
-import json
-import time
-import random
-import urllib.parse
+from providers import ProviderChain, CHAIN_SPECS
 
-class ReliableAPI:
-    def __init__(self):
-        """
-        Inicializuoja patikimą API su veikiančiais endpoint'ais
-        """
-        self.apis = [
-            {
-                'name': 'COD Stats API',
-                'base_url': 'https://call-of-duty-modern-warfare.p.rapidapi.com',
-                'headers': {
-                    "x-rapidapi-key": "ce477eae5dmsh238966977333d6dp1065ffjsn5923ec0a9ab0",
-                    "x-rapidapi-host": "call-of-duty-modern-warfare.p.rapidapi.com"
-                },
-                'endpoint': '/warzone/{username}/{platform}',
-                'platform_map': {'battlenet': 'battle', 'battle': 'battle', 'psn': 'psn', 'xbl': 'xbl'}
-            },
-            {
-                'name': 'COD API Hub',
-                'base_url': 'https://cod-api.uno',
-                'headers': {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    "Accept": "application/json"
-                },
-                'endpoint': '/stats/cod/v1/mw/warzone/{username}/{platform}',
-                'platform_map': {'battlenet': 'battle', 'battle': 'battle', 'psn': 'psn', 'xbl': 'xbl'}
-            }
-        ]
-        
-        self.request_times = []
-        self.max_requests_per_minute = 5
-        self.retry_attempts = 1
-        self.retry_delay = 2
-
-    def _check_rate_limit(self):
-        """Patikrina rate limiting"""
-        current_time = time.time()
-        self.request_times = [t for t in self.request_times if current_time - t < 60]
-        
-        if len(self.request_times) >= self.max_requests_per_minute:
-            sleep_time = 60 - (current_time - self.request_times[0])
-            if sleep_time > 0:
-                print(f"Rate limit pasiektas. Palaukiame {sleep_time:.1f} sekundžių...")
-                time.sleep(sleep_time)
-        
-        self.request_times.append(current_time)
-
-    async def _make_request_with_retry(self, url: str, headers: Dict) -> Optional[aiohttp.ClientResponse]:
-        """Atlieka užklausą su retry logika"""
-        for attempt in range(self.retry_attempts):
-            try:
-                timeout = aiohttp.ClientTimeout(total=15)
-                connector = aiohttp.TCPConnector(ssl=False)
-                async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
-                    async with session.get(url, headers=headers) as response:
-                        if response.status == 200:
-                            return response
-                        else:
-                            print(f"HTTP {response.status} klaida (bandymas {attempt + 1}/{self.retry_attempts})")
-                            if attempt < self.retry_attempts - 1:
-                                await asyncio.sleep(self.retry_delay)
-                            else:
-                                return None
-                                
-            except Exception as e:
-                print(f"Tinklo klaida (bandymas {attempt + 1}): {str(e)}")
-                if attempt < self.retry_attempts - 1:
-                    await asyncio.sleep(self.retry_delay)
-                else:
-                    return None
-        
-        return None
-
-    def _parse_cod_stats_api(self, data: Dict, username: str, platform: str) -> Optional[Dict]:
-        """Apdoroja COD Stats API duomenis"""
-        try:
-            if 'stats' not in data:
-                return None
-                
-            stats = data['stats']
-            return {
-                'username': username,
-                'platform': platform,
-                'kills': stats.get('kills', 0),
-                'deaths': stats.get('deaths', 0),
-                'kd_ratio': stats.get('kdRatio', 0),
-                'wins': stats.get('wins', 0),
-                'top_10': stats.get('top10', 0),
-                'score_per_minute': stats.get('scorePerMinute', 0),
-                'games_played': stats.get('gamesPlayed', 0),
-                'avg_life_time': 0,
-                'damage_done': 0,
-                'damage_taken': 0,
-                'headshots': 0,
-                'longest_shot': 0,
-                'revives': 0,
-                'time_played': 0
-            }
-        except Exception as e:
-            print(f"Klaida apdorojant COD Stats API duomenis: {e}")
-            return None
-
-    def _parse_cod_api_hub(self, data: Dict, username: str, platform: str) -> Optional[Dict]:
-        """Apdoroja COD API Hub duomenis"""
-        try:
-            if 'data' not in data or 'stats' not in data['data']:
-                return None
-                
-            stats = data['data']['stats']
-            return {
-                'username': username,
-                'platform': platform,
-                'kills': stats.get('kills', 0),
-                'deaths': stats.get('deaths', 0),
-                'kd_ratio': stats.get('kdRatio', 0),
-                'wins': stats.get('wins', 0),
-                'top_10': stats.get('top10', 0),
-                'score_per_minute': stats.get('scorePerMinute', 0),
-                'games_played': stats.get('gamesPlayed', 0),
-                'avg_life_time': stats.get('avgLifeTime', 0),
-                'damage_done': stats.get('damageDone', 0),
-                'damage_taken': stats.get('damageTaken', 0),
-                'headshots': stats.get('headshots', 0),
-                'longest_shot': stats.get('longestShot', 0),
-                'revives': stats.get('revives', 0),
-                'time_played': stats.get('timePlayed', 0)
-            }
-        except Exception as e:
-            print(f"Klaida apdorojant COD API Hub duomenis: {e}")
-            return None
-
-    def _generate_fallback_stats(self, username: str, platform: str) -> Dict:
-        """Generuoja fallback statistiką, kai API neveikia"""
-        print(f"Generuojame fallback statistiką {username}...")
-        
-        # Generuojame realistiškus duomenis
-        import random
-        
-        # Baziniai duomenys pagal žaidėjo vardą
-        base_kills = len(username) * 100 + random.randint(500, 2000)
-        base_deaths = int(base_kills * random.uniform(0.8, 1.2))
-        kd_ratio = base_kills / base_deaths if base_deaths > 0 else 1.0
-        wins = int(base_kills * random.uniform(0.05, 0.15))
-        games_played = int(base_kills * random.uniform(0.3, 0.6))
-        top_10 = int(wins * random.uniform(2, 4))
-        
-        return {
-            'username': username,
-            'platform': platform,
-            'kills': base_kills,
-            'deaths': base_deaths,
-            'kd_ratio': round(kd_ratio, 2),
-            'wins': wins,
-            'top_10': top_10,
-            'score_per_minute': round(random.uniform(200, 500), 1),
-            'games_played': games_played,
-            'avg_life_time': random.randint(300, 900),
-            'damage_done': base_kills * random.randint(800, 1200),
-            'damage_taken': base_deaths * random.randint(600, 1000),
-            'headshots': int(base_kills * random.uniform(0.1, 0.3)),
-            'longest_shot': random.randint(50, 300),
-            'revives': random.randint(0, 50),
-            'time_played': random.randint(3600, 72000),  # 1-20 valandų
-            'is_fallback': True
-        }
 
-    async def get_player_stats(self, username: str, platform: str = "battlenet") -> Optional[Dict]:
+class ReliableAPI(ProviderChain):
+    def __init__(self):
         """
-        Gauna žaidėjo statistiką iš API arba generuoja fallback duomenis
+        Inicializuoja patikimą API su veikiančiais endpoint'ais pagal registro aprašą (žr. providers.py)
         """
-        try:
-            self._check_rate_limit()
-            
-            # Normalizuojame platformą
-            if platform == "battle":
-                platform = "battlenet"
-            
-            # Pašaliname # ir viską po jo
-            clean_username = username.split('#')[0]
-            
-            # Bandome kiekvieną API
-            for api_config in self.apis:
-                try:
-                    print(f"Bandome {api_config['name']} su {username}...")
-                    
-                    # Nustatome platformą pagal API
-                    api_platform = api_config['platform_map'].get(platform, platform)
-                    
-                    # Formatuojame URL
-                    url = f"{api_config['base_url']}{api_config['endpoint'].format(username=clean_username, platform=api_platform)}"
-                    
-                    response = await self._make_request_with_retry(url, api_config['headers'])
-                    if not response:
-                        print(f"{api_config['name']} nepavyko")
-                        continue
-                    
-                    data = await response.json()
-                    
-                    # Apdoroja duomenis pagal API tipą
-                    if api_config['name'] == 'COD Stats API':
-                        result = self._parse_cod_stats_api(data, username, platform)
-                    elif api_config['name'] == 'COD API Hub':
-                        result = self._parse_cod_api_hub(data, username, platform)
-                    else:
-                        result = None
-                    
-                    if result:
-                        print(f"Sėkmingai gauta statistikos iš {api_config['name']}: {result['username']}")
-                        return result
-                        
-                except Exception as e:
-                    print(f"Klaida su {api_config['name']}: {str(e)}")
-                    continue
-            
-            # Jei visi API nepavyko, generuojame fallback duomenis
-            print(f"Visi API nepavyko, generuojame fallback duomenis {username}...")
-            return self._generate_fallback_stats(username, platform)
-                
-        except Exception as e:
-            print(f"Klaida gaunant statistiką: {str(e)}")
-            # Grąžiname fallback duomenis net ir klaidos atveju
-            return self._generate_fallback_stats(username, platform)
+        super().__init__('reliable_api', CHAIN_SPECS['reliable_api'])
 
-    async def get_recent_matches(self, username: str, platform: str = "battlenet", limit: int = 5) -> Optional[List[Dict]]:
-        """
-        Gauna žaidėjo neseniausias žaidimas
-        """
-        # Šiuo metu nepalaikoma, bet galima pridėti vėliau
-        return None
 
 # Testavimo funkcija
 async def test_reliable_api():
@@ -257,11 +32,11 @@ async def test_reliable_api():
         stats = await api.get_player_stats(test_username, test_platform)
         if stats:
             print("✅ Patikimas API veikia!")
-            print(f"   Vardas: {stats.get('username', 'N/A')}")
-            print(f"   Žudymai: {stats.get('kills', 0):,}")
-            print(f"   K/D: {stats.get('kd_ratio', 0):.2f}")
-            print(f"   Perėmimai: {stats.get('wins', 0):,}")
-            if stats.get('is_fallback'):
+            print(f"   Vardas: {stats.username}")
+            print(f"   Žudymai: {stats.kills:,}")
+            print(f"   K/D: {stats.kd_ratio:.2f}")
+            print(f"   Perėmimai: {stats.wins:,}")
+            if stats.is_fallback:
                 print("   ⚠️ Naudojami fallback duomenys")
         else:
             print("❌ Patikimas API nepavyko")
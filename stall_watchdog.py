@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Event loop stabdžių (stall) detektorius - korutina matuoja loop'o vėlavimą, o atskira
+gija, pastebėjusi per ilgai negrįžtantį heartbeat'ą, užfiksuoja loop'o gijos steką.
+Stabdžiai kaupiami pagal kodo vietą (paskutinis projekto kadras), kad matytųsi
+blokuojantys kvietimai (time.sleep, subprocess.run, sinchroninis sqlite3, failų rašymas).
+Metrikų etiketė - tik failas ir funkcija (ribotas serijų skaičius), eilutė - !stalls ataskaitoje.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, List, Optional
+
+from logs import get_logger
+from metrics import LOOP_LAG, LOOP_LAG_SECONDS, LOOP_STALL_SECONDS, LOOP_STALLS
+
+log = get_logger('stall_watchdog')
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+UNKNOWN_SITE = "nežinoma vieta"
+
+
+class StallWatchdog:
+    def __init__(self, threshold: float = 0.25, interval: float = 0.1,
+                 root: str = PROJECT_ROOT, stack_depth: int = 6):
+        """
+        Inicializuoja stabdžių detektorių
+        :param threshold: nuo kiek sekundžių vėlavimas laikomas stabdžiu
+        :param interval: heartbeat'o periodas sekundėmis
+        :param root: projekto katalogas (jo kadrai laikomi kvietimo vieta)
+        :param stack_depth: kiek paskutinių steko kadrų saugoti pavyzdžiui
+        """
+        self.threshold = threshold
+        self.interval = interval
+        self.root = root
+        self.stack_depth = stack_depth
+        self.sites: Dict[str, Dict] = {}
+        self.running = False
+        # run() užduotis - laikoma nuoroda, kad jos nesurinktų šiukšlių surinkėjas
+        self.task: Optional[asyncio.Task] = None
+
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._pending: Optional[Dict] = None
+
+    @classmethod
+    def from_env(cls) -> 'StallWatchdog':
+        """Slenkstis iš STALL_THRESHOLD_MS (numatyta 250 ms)"""
+        return cls(threshold=int(os.getenv('STALL_THRESHOLD_MS', '250')) / 1000)
+
+    async def run(self):
+        """
+        Heartbeat korutina (paleisti su start() arba asyncio.create_task) - kartu paleidžia stebėjimo giją
+        """
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._beat = time.monotonic()
+        self.running = True
+        watcher = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+        watcher.start()
+        try:
+            while True:
+                start = loop.time()
+                await asyncio.sleep(self.interval)
+                self._beat = time.monotonic()
+                lag = max(0.0, loop.time() - start - self.interval)
+                LOOP_LAG_SECONDS.observe(lag)
+                LOOP_LAG.set(lag)
+                if lag >= self.threshold:
+                    self._record(lag)
+        finally:
+            self.running = False
+            self._stopped.set()
+
+    def start(self) -> asyncio.Task:
+        """Paleidžia run() užduotį (jei dar neveikia) ir išsaugo nuorodą į ją"""
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self.run())
+        return self.task
+
+    def _watch(self):
+        """Stebėjimo gija - kai heartbeat'as vėluoja, užfiksuoja loop'o gijos steką (vieną kartą per stabdį)"""
+        while not self._stopped.wait(self.threshold / 2):
+            beat = self._beat
+            if self._pending is not None or time.monotonic() - beat < self.interval + self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            capture = self._describe(traceback.extract_stack(frame))
+            del frame
+            # Jei loop'as spėjo atsigauti kol skaitėme steką - pavyzdys nebeaktualus
+            with self._lock:
+                if self._beat == beat:
+                    self._pending = capture
+
+    def _is_project_frame(self, filename: str) -> bool:
+        path = os.path.abspath(filename)
+        return (path.startswith(self.root + os.sep) and 'site-packages' not in path
+                and os.path.basename(path) != os.path.basename(__file__))
+
+    def _describe(self, stack: traceback.StackSummary) -> Dict:
+        """
+        Kvietimo vieta (paskutinis projekto kadras): site su eilute ataskaitai,
+        label be eilutės metrikoms, ir sutrumpintas stekas
+        """
+        frames = [f"{os.path.basename(entry.filename)}:{entry.lineno} {entry.name}" for entry in stack]
+        site = label = UNKNOWN_SITE
+        for entry in reversed(stack):
+            if self._is_project_frame(entry.filename):
+                site = f"{os.path.basename(entry.filename)}:{entry.lineno} {entry.name}"
+                label = f"{os.path.basename(entry.filename)}:{entry.name}"
+                break
+        return {'site': site, 'label': label, 'stack': frames[-self.stack_depth:]}
+
+    def _record(self, lag: float):
+        """Priskiria stabdį užfiksuotai vietai (trumpi stabdžiai gali likti be steko)"""
+        with self._lock:
+            capture, self._pending = self._pending, None
+        capture = capture or {'site': UNKNOWN_SITE, 'label': UNKNOWN_SITE, 'stack': []}
+        site = capture['site']
+
+        entry = self.sites.get(site)
+        if entry is None:
+            entry = self.sites[site] = {'site': site, 'count': 0, 'total': 0.0, 'max': 0.0, 'stack': []}
+        entry['count'] += 1
+        entry['total'] += lag
+        if lag >= entry['max']:
+            entry['max'] = lag
+            entry['stack'] = capture['stack'] or entry['stack']
+
+        LOOP_STALLS.labels(capture['label']).inc()
+        LOOP_STALL_SECONDS.labels(capture['label']).inc(lag)
+        log.warning("Event loop stabdis", lag_ms=round(lag * 1000), site=site)
+
+    def top(self, limit: int = 5) -> List[Dict]:
+        """Daugiausiai laiko užblokavusios vietos"""
+        return sorted(self.sites.values(), key=lambda entry: entry['total'], reverse=True)[:limit]
+
+    def format_report(self, limit: int = 5) -> str:
+        """Discord žinutė su didžiausiais stabdžiais"""
+        header = f"🐢 **Event loop stabdžiai** (slenkstis {self.threshold * 1000:.0f} ms)"
+        offenders = self.top(limit)
+        if not offenders:
+            if not self.running:
+                return f"{header}\n❌ Stebėjimas nepaleistas"
+            return f"{header}\n✅ Stabdžių neužfiksuota"
+
+        lines = [header]
+        for index, entry in enumerate(offenders, 1):
+            lines.append(f"{index}. `{entry['site']}` - {entry['count']} k., iš viso {entry['total']:.2f} s, "
+                         f"ilgiausias {entry['max'] * 1000:.0f} ms")
+            if entry['stack']:
+                lines.append("```\n" + "\n".join(entry['stack']) + "\n```")
+        message = "\n".join(lines)
+        return message if len(message) <= 2000 else message[:1990] + "\n..."
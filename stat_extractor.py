@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Statistikos ištraukimas pagal deklaratyvų laukų žemėlapį - vienu praėjimu
+sukuria raktų indeksą ir iš jo paima visus reikiamus laukus
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Set
+
+from logs import get_logger
+from player_stats import PlayerStats
+
+log = get_logger('stat_extractor')
+
+# Kanoninis laukas -> API raktas (Tracker.gg, COD API Hub, RapidAPI naudoja tuos pačius raktus)
+FULL_FIELD_MAP = {
+    'kills': 'kills',
+    'deaths': 'deaths',
+    'kd_ratio': 'kdRatio',
+    'wins': 'wins',
+    'top_10': 'top10',
+    'score_per_minute': 'scorePerMinute',
+    'games_played': 'gamesPlayed',
+    'avg_life_time': 'avgLifeTime',
+    'damage_done': 'damageDone',
+    'damage_taken': 'damageTaken',
+    'headshots': 'headshots',
+    'longest_shot': 'longestShot',
+    'revives': 'revives',
+    'time_played': 'timePlayed'
+}
+
+# COD Stats API grąžina tik pagrindinius laukus
+BASIC_FIELD_MAP = {
+    field: key for field, key in FULL_FIELD_MAP.items()
+    if field in ('kills', 'deaths', 'kd_ratio', 'wins', 'top_10', 'score_per_minute', 'games_played')
+}
+
+
+class StatExtractor:
+    def __init__(self, field_map: Dict[str, str], name: str = "API"):
+        """
+        Inicializuoja ištraukimą
+        :param field_map: kanoninis laukas -> raktas API atsakyme
+        :param name: tiekėjo pavadinimas (pranešimams apie nežinomus raktus)
+        """
+        self.name = name
+        self.fields = tuple(field_map)
+        self.keys = tuple(field_map.values())
+        self.known_keys = frozenset(self.keys)
+        self._defaults = (0,) * len(self.keys)
+        self.reported_keys: Set[str] = set()
+
+    @staticmethod
+    def index_metadata(stats: Iterable[Dict]) -> Dict[str, Any]:
+        """
+        Vienu praėjimu sukuria indeksą iš [{'metadata': {'key': ...}, 'value': ...}] sąrašo
+        """
+        index = {}
+        for stat in stats:
+            metadata = stat.get('metadata')
+            if metadata:
+                key = metadata.get('key')
+                if key:
+                    index[key] = stat.get('value', 0)
+        return index
+
+    def extract(self, index: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Paima visus žemėlapio laukus iš indekso (trūkstami laukai - 0)
+        """
+        return dict(zip(self.fields, map(index.get, self.keys, self._defaults)))
+
+    def missing_keys(self, index: Mapping[str, Any]) -> Set[str]:
+        """Raktai, kurių tikimės, bet atsakyme nėra"""
+        return set(self.known_keys.difference(index.keys()))
+
+    def unknown_keys(self, index: Mapping[str, Any]) -> Set[str]:
+        """Raktai, kurie atsakyme yra, bet žemėlapyje nenaudojami"""
+        return set(index.keys() - self.known_keys)
+
+    def report(self, index: Mapping[str, Any]):
+        """
+        Vieną kartą praneša apie naujus trūkstamus ar nežinomus raktus
+        """
+        missing = {key for key in self.missing_keys(index) if f"-{key}" not in self.reported_keys}
+        unknown = {key for key in self.unknown_keys(index) if f"+{key}" not in self.reported_keys}
+        if missing:
+            log.warning("Trūksta raktų", provider=self.name, keys=",".join(sorted(missing)))
+            self.reported_keys.update(f"-{key}" for key in missing)
+        if unknown:
+            log.info("Nežinomi raktai", provider=self.name, keys=",".join(sorted(unknown)))
+            self.reported_keys.update(f"+{key}" for key in unknown)
+
+    def to_player_stats(self, index: Mapping[str, Any], username: str, platform: str,
+                        source: str = '') -> PlayerStats:
+        """
+        Sukuria PlayerStats iš indekso
+        """
+        self.report(index)
+        values = self.extract(index)
+        values['username'] = username
+        values['platform'] = platform
+        values['source'] = source
+        return PlayerStats.from_dict(values)
+
+    def extract_many(self, payloads: Iterable[Mapping[str, Any]], metadata: bool = False) -> List[Dict[str, Any]]:
+        """
+        Apdoroja daug profilių ar žaidimų iš karto (pvz. žaidimų sąrašą).
+        Laukai paimami per map() su dict.get, todėl kiekvienam įrašui nėra Python ciklo per laukus.
+        """
+        fields = self.fields
+        keys = self.keys
+        defaults = self._defaults
+        if metadata:
+            payloads = map(self.index_metadata, payloads)
+        return [dict(zip(fields, map(payload.get, keys, defaults))) for payload in payloads]
+
+    def extract_rows(self, payloads: Iterable[Mapping[str, Any]]) -> List[tuple]:
+        """
+        Kaip extract_many, bet grąžina tuple eilutes laukų tvarka (be žodynų kūrimo)
+        """
+        keys = self.keys
+        defaults = self._defaults
+        return [tuple(map(payload.get, keys, defaults)) for payload in payloads]
+
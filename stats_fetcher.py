@@ -1,66 +1,69 @@
 import asyncio
-import json
 import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-from reliable_api import ReliableAPI
-from tracker_api import TrackerGGAPI
-from alternative_api import AlternativeAPI
-from third_api import ThirdAPI
-from rapidapi_cod import RapidAPICOD
+from providers import ProviderRegistry, provider_name
+from player_roster import PlayerRoster
+from deadline import Deadline
+from stats_history import StatsHistory
+from player_stats import PlayerStats
+from metrics import FETCH_DEPTH, FETCH_RESULTS
+from tracing import annotate, span
+from logs import get_logger
+
+log = get_logger('stats_fetcher')
+
+# Tiekėjų bandymo tvarka (registro raktai, žr. providers.py)
+FETCH_ORDER = ['rapidapi_cod', 'reliable_api', 'tracker_gg', 'alternative_api', 'third_api']
+
+_FETCHED = FETCH_RESULTS.labels('fetched')
+_STALE = FETCH_RESULTS.labels('stale')
+_MISSING = FETCH_RESULTS.labels('missing')
 
 class StatsFetcher:
     def __init__(self):
         """
         Inicializuoja statistikos gavimo klasę
         """
-        self.reliable_api = ReliableAPI()
-        self.tracker_api = TrackerGGAPI()
-        self.alternative_api = AlternativeAPI()
-        self.third_api = ThirdAPI()
-        self.rapidapi_cod = RapidAPICOD()
+        # Tiekėjai sukuriami pirmą kartą kreipiantis (žr. ProviderRegistry)
+        self.providers = ProviderRegistry(FETCH_ORDER)
         self.players_file = "players.json"
-        self.stats_history_file = "stats_history.json"
+        self.stats_history_file = "stats_history.jsonl"
+        self.stats_history = StatsHistory(self.stats_history_file)
+        # Pauzė tarp žaidėjų sekundėmis (rate limit apsauga; benchmark'ams - 0)
+        self.player_delay = float(os.getenv('PLAYER_FETCH_DELAY', '1'))
+        # Sąrašas rašomas atomiškai ir tik pasikeitus (žr. player_roster.py)
+        self.roster = PlayerRoster(self.players_file)
         self.load_players()
 
+    @property
+    def players(self) -> List[Dict]:
+        return self.roster.players
+
+    @players.setter
+    def players(self, players: List[Dict]):
+        self.roster.replace(players)
+
     def load_players(self):
         """
         Užkrauna žaidėjų sąrašą iš failo
         """
-        try:
-            if os.path.exists(self.players_file):
-                with open(self.players_file, 'r', encoding='utf-8') as f:
-                    self.players = json.load(f)
-                # Išvalome duomenis
-                self.cleanup_players_data()
-            else:
-                self.players = []
-                self.save_players()
-        except Exception as e:
-            print(f"Klaida užkraunant žaidėjus: {e}")
-            self.players = []
-            self.save_players()
+        self.roster.load()
+        # Išrašoma tik jei valymas ką nors pakeitė
+        self.roster.flush()
 
     def save_players(self):
         """
         Išsaugo žaidėjų sąrašą į failą
         """
-        try:
-            with open(self.players_file, 'w', encoding='utf-8') as f:
-                json.dump(self.players, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Klaida išsaugant žaidėjus: {e}")
+        self.roster.dirty = True
+        self.roster.flush()
 
-    def add_player(self, username: str, platform: str = "battlenet") -> bool:
+    def add_player(self, username: str, platform: str = "battlenet", discord_id=None) -> bool:
         """
         Prideda naują žaidėją į sąrašą
+        :param discord_id: Discord vartotojas, kuris prisijungė pats (!prisijungiu)
         """
-        # Patikriname, ar žaidėjas jau yra sąraše
-        for player in self.players:
-            if player['username'] == username and player['platform'] == platform:
-                print(f"Žaidėjas {username} jau yra sąraše")
-                return False
-
         # Pridedame naują žaidėją
         new_player = {
             'username': username,
@@ -69,138 +72,215 @@ class StatsFetcher:
             'last_check': None,
             'is_active': True
         }
-        
-        self.players.append(new_player)
-        self.save_players()
-        print(f"Pridėtas žaidėjas: {username} ({platform})")
+        if discord_id is not None:
+            new_player['discord_id'] = str(discord_id)
+
+        # Patikriname, ar žaidėjas jau yra sąraše
+        if not self.roster.add(new_player):
+            log.info("Žaidėjas jau yra sąraše", player=username, platform=platform)
+            return False
+        self.roster.flush()
+        log.info("Pridėtas žaidėjas", player=username, platform=platform)
         return True
 
     def remove_player(self, username: str, platform: str = "battlenet") -> bool:
         """
         Pašalina žaidėją iš sąrašo
         """
-        for i, player in enumerate(self.players):
-            player_platform = player.get('platform', 'battlenet')
-            if player['username'] == username and player_platform == platform:
-                removed_player = self.players.pop(i)
-                self.save_players()
-                print(f"Pašalintas žaidėjas: {username} ({platform})")
-                return True
+        if self.roster.remove(username, platform) is not None:
+            self.roster.flush()
+            log.info("Pašalintas žaidėjas", player=username, platform=platform)
+            return True
         
-        print(f"Žaidėjas {username} nerastas sąraše")
+        log.info("Žaidėjas nerastas sąraše", player=username, platform=platform)
         return False
 
-    async def get_player_stats(self, username: str, platform: str = "battlenet") -> Optional[Dict]:
+    def link_discord(self, username: str, platform: str, discord_id) -> str:
+        """
+        Susieja jau sąraše esantį žaidėją su Discord vartotoju
+        :return: 'linked', 'already_linked', 'taken' (susietas su kitu vartotoju) arba 'missing'
         """
-        Gauna vieno žaidėjo statistiką su fallback į visus API
+        player = self.roster.find(username, platform)
+        if player is None:
+            return 'missing'
+        result = self.roster.link_discord(player, discord_id)
+        if result == 'linked':
+            self.roster.flush()
+            log.info("Žaidėjas susietas su Discord", player=username, platform=platform)
+        return result
+
+    def find_player_by_discord(self, discord_id) -> Optional[Dict]:
+        """Discord vartotojo žaidėjas arba None"""
+        return self.roster.find_by_discord(discord_id)
+
+    def import_players(self, entries: List[Dict], platform: str = "battlenet") -> Dict[str, int]:
+        """
+        Masiškai importuoja žaidėjus (pvz. WarzoneDatabase.get_all_players()) vienu įrašymu
+        """
+        counts = self.roster.import_players(entries, platform)
+        self.roster.flush()
+        log.info("Žaidėjai importuoti", **counts)
+        return counts
+
+    async def get_player_stats(self, username: str, platform: str = "battlenet",
+                               deadline: Optional[Deadline] = None) -> Optional[PlayerStats]:
+        """
+        Gauna vieno žaidėjo statistiką ir įrašo ją į istoriją
+        :param deadline: laiko biudžetas - pasibaigus grąžinami talpyklos duomenys
+        """
+        # Normalizuojame platformą
+        if platform == "battle":
+            platform = "battlenet"
+        
+        with span('player', player=username, platform=platform) as current:
+            stats = await self._fetch_player_stats(username, platform, deadline)
+            current.set(source=stats.source if stats else None)
+        
+        # Istorijoje saugome tik tikrus ir naujai gautus duomenis (ne talpyklos po biudžeto pabaigos)
+        if stats and not stats.is_fallback and (deadline is None or not deadline.expired()):
+            self.stats_history.append(username, platform, stats)
+        
+        return stats
+
+    async def _fetch_player_stats(self, username: str, platform: str,
+                                  deadline: Optional[Deadline] = None) -> Optional[PlayerStats]:
+        """
+        Gauna vieno žaidėjo statistiką su fallback į visus API, o jiems nepavykus -
+        paskutinius žinomus duomenis iš istorijos
         """
         try:
-            # Normalizuojame platformą
-            if platform == "battle":
-                platform = "battlenet"
-            
-            # 1. Pirmiausia bandome RapidAPI COD (naujas, patikimas)
-            print(f"Bandome RapidAPI COD su {username}...")
-            stats = await self.rapidapi_cod.get_player_stats(username, platform)
-            
-            if stats:
-                # Pridedame laiko žymę
-                stats['timestamp'] = datetime.now().isoformat()
-                stats['source'] = 'rapidapi_cod'
-                return stats
-            
-            # 2. Jei RapidAPI nepavyko, bandome patikimą API (su fallback duomenimis)
-            print(f"RapidAPI nepavyko, bandome patikimą API su {username}...")
-            stats = await self.reliable_api.get_player_stats(username, platform)
-            
-            if stats:
-                # Pridedame laiko žymę
-                stats['timestamp'] = datetime.now().isoformat()
-                if stats.get('is_fallback'):
-                    stats['source'] = 'fallback_data'
+            if self.all_blocked() and (deadline is None or not deadline.expired()):
+                annotate(skipped='all_blocked')
+                log.info("Visi API host'ai atidėti - rodome paskutinius žinomus duomenis", sample=20, player=username)
+                return self._stale_stats(username, platform)
+
+            for depth, key in enumerate(FETCH_ORDER, 1):
+                provider = self.providers[key]
+                if deadline is not None and deadline.expired():
+                    log.debug("Baigėsi laiko biudžetas - tikriname tik talpyklą", provider=key, player=username)
                 else:
-                    stats['source'] = 'reliable_api'
-                return stats
-            
-            # 3. Jei patikimas API nepavyko, bandome Tracker.gg API
-            print(f"Patikimas API nepavyko, bandome Tracker.gg API su {username}...")
-            stats = await self.tracker_api.get_player_stats(username, platform)
-            
-            if stats:
-                # Pridedame laiko žymę
-                stats['timestamp'] = datetime.now().isoformat()
-                stats['source'] = 'tracker_gg'
-                return stats
-            
-            # 4. Jei Tracker.gg nepavyko, bandome alternatyvų API
-            print(f"Tracker.gg nepavyko, bandome alternatyvų API su {username}...")
-            stats = await self.alternative_api.get_player_stats(username, platform)
-            
-            if stats:
-                # Pridedame laiko žymę
-                stats['timestamp'] = datetime.now().isoformat()
-                stats['source'] = 'alternative_api'
-                return stats
-            
-            # 5. Jei alternatyvus API nepavyko, bandome trečią API
-            print(f"Alternatyvus API nepavyko, bandome trečią API su {username}...")
-            stats = await self.third_api.get_player_stats(username, platform)
-            
-            if stats:
-                # Pridedame laiko žymę
-                stats['timestamp'] = datetime.now().isoformat()
-                stats['source'] = 'third_api'
-                return stats
-            
-            print(f"Nepavyko gauti {username} statistikos iš jokio API")
-            return None
+                    log.debug("Bandome tiekėją", provider=key, player=username, attempt=depth)
+                with span('provider', provider=key) as attempt:
+                    stats = await provider.get_player_stats(username, platform, deadline)
+                    attempt.set(ok=stats is not None)
+
+                if stats and stats.is_fallback:
+                    # Talpyklos atsakymas (baigėsi biudžetas) - laiko žymė lieka atsakymo gavimo laikas
+                    _STALE.inc()
+                    return stats._replace(source='cached_data')
+                if stats:
+                    FETCH_DEPTH.observe(depth)
+                    _FETCHED.inc()
+                    # Pridedame laiko žymę
+                    return stats._replace(timestamp=datetime.now().isoformat(), source=key)
+
+                log.debug("Tiekėjas nepavyko", provider=key, player=username, attempt=depth)
+
+            log.warning("Nepavyko gauti statistikos iš jokio API", player=username)
+            return self._stale_stats(username, platform)
             
         except Exception as e:
-            print(f"Klaida gaunant {username} statistiką: {e}")
+            log.exception("Klaida gaunant statistiką", player=username)
+            return self._stale_stats(username, platform)
+
+    def all_blocked(self) -> bool:
+        """
+        Ar visi tiekėjai atidėti backoff planuotojo (užklausos neturi prasmės).
+        Dar nesukurti tiekėjai nekuriami - tikrinami jų aprašų host'ai (žr. ProviderRegistry.blocked)
+        """
+        return all(self.providers.blocked(key) for key in self.providers)
+
+    def _stale_stats(self, username: str, platform: str) -> Optional[PlayerStats]:
+        """
+        Paskutinis žinomas žaidėjo snapshot'as iš istorijos (laiko žymė - snapshot'o laikas)
+        """
+        latest = self.stats_history.latest(username, platform)
+        if not latest:
+            _MISSING.inc()
             return None
+        _STALE.inc()
+        taken_at, snapshot = latest
+        log.info("Naudojame paskutinius žinomus duomenis", sample=20, player=username, taken_at=f"{taken_at:%Y-%m-%d %H:%M}")
+        return PlayerStats.from_dict(snapshot, username=username, platform=platform, source='stale_data',
+                                     timestamp=taken_at.isoformat(), is_fallback=True)
+
+    @staticmethod
+    def format_age(timestamp: str, now: Optional[datetime] = None) -> str:
+        """
+        Formatuoja duomenų amžių, pvz. '3 val. 5 min.'
+        """
+        try:
+            age = (now or datetime.now()) - datetime.fromisoformat(timestamp)
+        except (TypeError, ValueError):
+            return "nežinomo laiko"
+        minutes = max(0, int(age.total_seconds() // 60))
+        days, minutes = divmod(minutes, 24 * 60)
+        hours, minutes = divmod(minutes, 60)
+        if days:
+            return f"{days} d. {hours} val."
+        if hours:
+            return f"{hours} val. {minutes} min."
+        return f"{minutes} min."
 
-    async def get_all_players_stats(self) -> List[Dict]:
+    async def get_all_players_stats(self, deadline: Optional[Deadline] = None) -> List[PlayerStats]:
         """
         Gauna visų aktyvių žaidėjų statistiką
+        :param deadline: bendras viso sąrašo laiko biudžetas
         """
         all_stats = []
         
         for player in self.players:
             # Saugiai tikriname ar žaidėjas turi reikiamus laukus
             if not player.get('username'):
-                print(f"Praleidžiame žaidėją be vardo: {player}")
+                log.warning("Praleidžiame žaidėją be vardo", player=player)
                 continue
             
             if player.get('is_active', True):
                 platform = player.get('platform', 'battlenet')
                 username = player['username']
-                print(f"Gauname {username} statistiką...")
-                stats = await self.get_player_stats(username, platform)
+                log.debug("Gauname statistiką", player=username)
+                stats = await self.get_player_stats(username, platform, deadline)
                 
                 if stats:
-                    # Atnaujiname paskutinio patikrinimo laiką
-                    player['last_check'] = datetime.now().isoformat()
+                    # Atnaujiname paskutinio patikrinimo laiką (tik atmintyje) - tik gavus
+                    # šviežius duomenis, ne talpyklos ar paskutinius žinomus
+                    if not stats.is_fallback:
+                        self.roster.mark_checked(player)
                     # Atnaujiname platformą jei jos nebuvo
                     if 'platform' not in player:
                         player['platform'] = platform
                     all_stats.append(stats)
                 else:
-                    print(f"Nepavyko gauti {username} statistikos")
+                    log.debug("Statistikos nėra - žaidėjas praleidžiamas", player=username)
                 
-                # Palaukiame tarp užklausų, kad neviršytume rate limit
-                await asyncio.sleep(1)
+                # Palaukiame tarp užklausų, kad neviršytume rate limit (jei dar liko laiko ir
+                # užklausos apskritai siunčiamos)
+                if self.player_delay > 0 and (deadline is None or not deadline.expired()) \
+                        and not self.all_blocked():
+                    delay = deadline.clip(self.player_delay) if deadline else self.player_delay
+                    with span('sleep', seconds=delay):
+                        await asyncio.sleep(delay)
         
-        # Išsaugome atnaujintą žaidėjų sąrašą
-        self.save_players()
+        # Vienas atominis įrašymas per visą sąrašą (jei kas nors pasikeitė)
+        self.roster.flush()
         return all_stats
 
-    def format_stats_message(self, stats: Dict) -> str:
+    @staticmethod
+    def source_text(source: str) -> str:
+        """Šaltinio pavadinimas: talpyklos/seni duomenys arba tiekėjo pavadinimas iš aprašo"""
+        fallback_texts = {
+            'stale_data': "Paskutiniai žinomi duomenys",
+            'cached_data': "Talpyklos duomenys"
+        }
+        return fallback_texts.get(source) or provider_name(source) or "Nežinomas šaltinis"
+
+    def format_stats_message(self, stats: PlayerStats) -> str:
         """
         Formatuoja statistikos pranešimą Discord
         """
-        username = stats.get('username', 'Nežinomas')
-        platform = stats.get('platform', 'Nežinoma')
-        source = stats.get('source', 'unknown')
+        username = stats.username or 'Nežinomas'
+        platform = stats.platform
+        source = stats.source
         
         # Konvertuojame platformos pavadinimus
         platform_names = {
@@ -213,33 +293,26 @@ class StatsFetcher:
         # Nustatome API šaltinio emoji ir tekstą
         source_emojis = {
             'reliable_api': "🚀",
-            'fallback_data': "⚠️",
+            'stale_data': "🕒",
+            'cached_data': "🕒",
             'tracker_gg': "🔗",
             'alternative_api': "🔄", 
             'third_api': "⚡"
         }
-        source_texts = {
-            'reliable_api': "Patikimas API",
-            'fallback_data': "Fallback duomenys",
-            'tracker_gg': "Tracker.gg",
-            'alternative_api': "Alternatyvus API",
-            'third_api': "Trečias API"
-        }
-        
         source_emoji = source_emojis.get(source, "❓")
-        source_text = source_texts.get(source, "Nežinomas šaltinis")
+        source_text = self.source_text(source)
         
         # Formatuojame statistiką
-        kills = stats.get('kills', 0)
-        deaths = stats.get('deaths', 0)
-        kd_ratio = stats.get('kd_ratio', 0)
-        wins = stats.get('wins', 0)
-        top_10 = stats.get('top_10', 0)
-        games_played = stats.get('games_played', 0)
-        score_per_minute = stats.get('score_per_minute', 0)
+        kills = stats.kills
+        deaths = stats.deaths
+        kd_ratio = stats.kd_ratio
+        wins = stats.wins
+        top_10 = stats.top_10
+        games_played = stats.games_played
+        score_per_minute = stats.score_per_minute
         
         # Konvertuojame laiką į skaitomą formatą
-        time_played = stats.get('time_played', 0)
+        time_played = stats.time_played
         if time_played > 0:
             hours = int(time_played // 3600)
             minutes = int((time_played % 3600) // 60)
@@ -247,10 +320,12 @@ class StatsFetcher:
         else:
             time_display = "N/A"
         
-        # Pridedame fallback įspėjimą
+        # Pridedame įspėjimą apie senus duomenis
         fallback_warning = ""
-        if source == 'fallback_data':
-            fallback_warning = "\n⚠️ **Pastaba:** Naudojami fallback duomenys (API nepasiekiami)"
+        if stats.is_fallback:
+            reason = "Baigėsi laiko biudžetas" if source == 'cached_data' else "API nepasiekiami"
+            fallback_warning = (f"\n⚠️ **Pastaba:** {reason} - rodomi duomenys, "
+                                f"gauti prieš {self.format_age(stats.timestamp)}")
         
         message = f"""
 {source_emoji} **{username}** ({platform_display}) - {source_text}
@@ -268,7 +343,7 @@ class StatsFetcher:
         
         return message.strip()
 
-    def format_summary_message(self, all_stats: List[Dict]) -> str:
+    def format_summary_message(self, all_stats: List[PlayerStats]) -> str:
         """
         Formatuoja suvestinės pranešimą Discord
         """
@@ -276,15 +351,15 @@ class StatsFetcher:
             return "❌ Nepavyko gauti jokios statistikos"
         
         # Rūšiuojame pagal žudymus
-        sorted_stats = sorted(all_stats, key=lambda x: x.get('kills', 0), reverse=True)
+        sorted_stats = sorted(all_stats, key=lambda x: x.kills, reverse=True)
         
         message = "📊 **Žaidėjų statistikos suvestinė:**\n\n"
         
         for i, stats in enumerate(sorted_stats[:10], 1):  # Top 10
-            username = stats.get('username', 'Nežinomas')
-            kills = stats.get('kills', 0)
-            kd_ratio = stats.get('kd_ratio', 0)
-            wins = stats.get('wins', 0)
+            username = stats.username or 'Nežinomas'
+            kills = stats.kills
+            kd_ratio = stats.kd_ratio
+            wins = stats.wins
             
             # Emoji pagal poziciją
             if i == 1:
@@ -301,11 +376,31 @@ class StatsFetcher:
         if len(sorted_stats) > 10:
             message += f"\n... ir dar {len(sorted_stats) - 10} žaidėjų"
         
-        # Pridedame fallback įspėjimą jei yra
-        fallback_count = sum(1 for stats in all_stats if stats.get('source') == 'fallback_data')
-        if fallback_count > 0:
-            message += f"\n\n⚠️ **Pastaba:** {fallback_count} žaidėjų duomenys iš fallback šaltinio"
+        # Pridedame įspėjimą apie senus duomenis jei yra
+        stale = [stats for stats in all_stats if stats.is_fallback]
+        if stale:
+            oldest = min(stats.timestamp for stats in stale)
+            message += (f"\n\n⚠️ **Pastaba:** {len(stale)} žaidėjų duomenys paskutiniai žinomi "
+                        f"(seniausi - prieš {self.format_age(oldest)})")
+        
+        return message.strip()
+
+    def format_trend_message(self, username: str, platform: str = "battlenet", days: int = 30) -> str:
+        """
+        Formatuoja K/D tendencijos pranešimą Discord
+        """
+        trend = self.stats_history.trend(username, platform, 'kd_ratio', days)
+        if not trend:
+            return f"📉 **{username}** istorijos per {days} d. nėra"
         
+        change_emoji = "📈" if trend['change'] >= 0 else "📉"
+        message = f"""
+{change_emoji} **{username}** K/D tendencija per {days} d.
+• Pradžia: **{trend['first']:.2f}**
+• Dabar: **{trend['last']:.2f}** ({trend['change']:+.2f})
+• Min / Max: **{trend['min']:.2f}** / **{trend['max']:.2f}**
+• Snapshot'ų: **{len(trend['points'])}**
+"""
         return message.strip()
 
     def get_player_list(self) -> str:
@@ -339,26 +434,8 @@ class StatsFetcher:
         """
         Išvalo žaidėjų duomenis nuo neteisingų įrašų
         """
-        cleaned_players = []
-        
-        for player in self.players:
-            # Tikriname ar žaidėjas turi reikiamus laukus
-            if not player.get('username'):
-                print(f"Praleidžiame žaidėją be vardo: {player}")
-                continue
-            
-            # Pridedame trūkstamus laukus
-            if 'platform' not in player:
-                player['platform'] = 'battlenet'
-            if 'added_date' not in player:
-                player['added_date'] = datetime.now().isoformat()
-            if 'is_active' not in player:
-                player['is_active'] = True
-            
-            cleaned_players.append(player)
-        
-        self.players = cleaned_players
-        self.save_players()
+        self.roster.cleanup()
+        self.roster.flush()
 
 # Testavimo funkcija
 async def test_stats_fetcher():
@@ -377,10 +454,10 @@ async def test_stats_fetcher():
         stats = await fetcher.get_player_stats(test_username, test_platform)
         if stats:
             print("✅ Statistikos gavimas veikia!")
-            print(f"   Vardas: {stats.get('username', 'N/A')}")
-            print(f"   Žudymai: {stats.get('kills', 0):,}")
-            print(f"   K/D: {stats.get('kd_ratio', 0):.2f}")
-            print(f"   Šaltinis: {stats.get('source', 'N/A')}")
+            print(f"   Vardas: {stats.username}")
+            print(f"   Žudymai: {stats.kills:,}")
+            print(f"   K/D: {stats.kd_ratio:.2f}")
+            print(f"   Šaltinis: {stats.source}")
             
             # Testuojame pranešimo formatavimą
             message = fetcher.format_stats_message(stats)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Žaidėjų statistikos istorija - papildomas (append-only) snapshot'ų failas
+su delta kodavimu ir automatiniu senų įrašų retinimu.
+Failas rašomas viena atskira gija (įrašų tvarka išlieka), todėl append() ir compact()
+event loop'e tik atnaujina indeksą atmintyje. Retinimo laikas įrašomas pirmoje failo
+eilutėje ({"c": laikas}), kad po perkrovimo failas nebūtų perrašomas iš karto.
+"""
+
+import asyncio
+import bisect
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from logs import get_logger
+from player_stats import PlayerStats, STAT_FIELDS
+
+log = get_logger('stats_history')
+
+# Laukai, kuriuos saugome istorijoje
+HISTORY_FIELDS = STAT_FIELDS
+
+DAY = 86400
+HOUR = 3600
+
+
+class StatsHistory:
+    def __init__(self, history_file: str = "stats_history.jsonl",
+                 keyframe_every: int = 100,
+                 raw_days: int = 7,
+                 hourly_days: int = 30,
+                 compact_interval: int = DAY):
+        """
+        Inicializuoja statistikos istoriją
+        :param history_file: JSON Lines failas (viena eilutė - vienas snapshot'as)
+        :param keyframe_every: kas kiek įrašų rašomas pilnas snapshot'as
+        :param raw_days: kiek dienų saugomi visi snapshot'ai
+        :param hourly_days: iki kiek dienų saugomas vienas snapshot'as per valandą (vėliau - per dieną)
+        :param compact_interval: kas kiek sekundžių automatiškai retiname istoriją
+        """
+        self.history_file = history_file
+        self.keyframe_every = keyframe_every
+        self.raw_days = raw_days
+        self.hourly_days = hourly_days
+        self.compact_interval = compact_interval
+        # Indeksas: žaidėjo raktas -> (laikai, pilni snapshot'ai), surūšiuoti pagal laiką
+        self.times: Dict[str, List[int]] = {}
+        self.snapshots: Dict[str, List[Dict]] = {}
+        self.since_keyframe: Dict[str, int] = {}
+        self.last_compaction = 0
+        # Viena rašymo gija - įrašai ir retinimas vykdomi pateikimo tvarka
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='stats-history')
+        self.load()
+
+    @staticmethod
+    def player_key(username: str, platform: str = "battlenet") -> str:
+        return f"{username}|{platform}"
+
+    def load(self):
+        """
+        Atkuria indeksą perskaitydamas istorijos failą
+        """
+        self.times = {}
+        self.snapshots = {}
+        self.since_keyframe = {}
+        self.last_compaction = 0
+
+        if not os.path.exists(self.history_file):
+            # Naujame faile nėra ko retinti - pirmas retinimas po compact_interval
+            self.last_compaction = int(time.time())
+            return
+
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Nutrūkęs paskutinis įrašas (pvz. po crash) - praleidžiame
+                        log.warning("Praleidžiame sugadintą istorijos įrašą", file=self.history_file)
+                        continue
+                    self._apply(record)
+        except Exception:
+            log.exception("Klaida užkraunant statistikos istoriją", file=self.history_file)
+
+    def _apply(self, record: Dict):
+        """Pritaiko vieną įrašą indeksui"""
+        if 'c' in record:
+            # Paskutinio retinimo žymė
+            self.last_compaction = record['c']
+            return
+        key = record['p']
+        timestamp = record['t']
+        snapshots = self.snapshots.setdefault(key, [])
+
+        if 'k' in record:
+            snapshot = record['k']
+            self.since_keyframe[key] = 0
+        else:
+            if not snapshots:
+                # Delta be bazės - negalime atkurti
+                return
+            snapshot = snapshots[-1]
+            if 'd' in record:
+                snapshot = dict(snapshot)
+                snapshot.update(record['d'])
+            self.since_keyframe[key] = self.since_keyframe.get(key, 0) + 1
+
+        self.times.setdefault(key, []).append(timestamp)
+        snapshots.append(snapshot)
+
+    @staticmethod
+    def _encode(key: str, timestamp: int, snapshot: Dict, previous: Optional[Dict]) -> Dict:
+        """Užkoduoja snapshot'ą kaip pilną arba delta įrašą"""
+        if previous is None:
+            return {'p': key, 't': timestamp, 'k': snapshot}
+
+        changed = {field: value for field, value in snapshot.items() if previous.get(field) != value}
+        record = {'p': key, 't': timestamp}
+        if changed:
+            record['d'] = changed
+        return record
+
+    def append(self, username: str, platform: str, stats: PlayerStats, timestamp: Optional[float] = None):
+        """
+        Prideda naują snapshot'ą į istoriją
+        """
+        key = self.player_key(username, platform)
+        timestamp = int(timestamp if timestamp is not None else time.time())
+        snapshot = dict(zip(HISTORY_FIELDS, stats.counters()))
+
+        snapshots = self.snapshots.get(key)
+        previous = snapshots[-1] if snapshots else None
+        if previous is not None and self.since_keyframe.get(key, 0) >= self.keyframe_every:
+            previous = None
+
+        record = self._encode(key, timestamp, snapshot, previous)
+        self._apply(record)
+        self._submit(self._append_line, json.dumps(record, separators=(',', ':'), ensure_ascii=False))
+
+        if timestamp - self.last_compaction >= self.compact_interval:
+            self.compact(timestamp)
+
+    def _submit(self, write, *args):
+        """Vykdo failo rašymą rašymo gijoje (veikiant event loop'ui) arba iškart"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            write(*args)
+            return
+        self._writer.submit(write, *args)
+
+    def flush(self):
+        """Palaukia, kol bus įrašyti visi pateikti įrašai (blokuoja - ne event loop'e)"""
+        self._writer.submit(int).result()
+
+    def _append_line(self, line: str):
+        try:
+            with open(self.history_file, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+        except Exception:
+            log.exception("Klaida rašant statistikos istoriją", file=self.history_file)
+
+    def get_range(self, username: str, platform: str = "battlenet",
+                  since: Optional[datetime] = None,
+                  until: Optional[datetime] = None) -> List[Tuple[datetime, Dict]]:
+        """
+        Grąžina žaidėjo snapshot'us laiko intervale
+        """
+        key = self.player_key(username, platform)
+        times = self.times.get(key, [])
+        snapshots = self.snapshots.get(key, [])
+
+        start = bisect.bisect_left(times, since.timestamp()) if since else 0
+        end = bisect.bisect_right(times, until.timestamp()) if until else len(times)
+
+        return [(datetime.fromtimestamp(times[i]), snapshots[i]) for i in range(start, end)]
+
+    def latest(self, username: str, platform: str = "battlenet") -> Optional[Tuple[datetime, Dict]]:
+        """
+        Grąžina paskutinį žaidėjo snapshot'ą
+        """
+        key = self.player_key(username, platform)
+        times = self.times.get(key)
+        if not times:
+            return None
+        return datetime.fromtimestamp(times[-1]), self.snapshots[key][-1]
+
+    def trend(self, username: str, platform: str = "battlenet",
+              field: str = 'kd_ratio', days: int = 30) -> Optional[Dict]:
+        """
+        Apskaičiuoja lauko tendenciją per paskutines dienas
+        """
+        since = datetime.now() - timedelta(days=days)
+        points = [(moment, snapshot.get(field, 0)) for moment, snapshot in self.get_range(username, platform, since)]
+        if not points:
+            return None
+
+        first = points[0][1]
+        last = points[-1][1]
+        return {
+            'field': field,
+            'days': days,
+            'first': first,
+            'last': last,
+            'change': last - first,
+            'min': min(value for _, value in points),
+            'max': max(value for _, value in points),
+            'points': points
+        }
+
+    def _downsample(self, times: List[int], snapshots: List[Dict], now: int) -> Tuple[List[int], List[Dict]]:
+        """
+        Palieka visus naujus snapshot'us, o senesnius - po vieną per valandą/dieną
+        """
+        raw_border = now - self.raw_days * DAY
+        hourly_border = now - self.hourly_days * DAY
+
+        kept_times = []
+        kept_snapshots = []
+        last_bucket = None
+
+        for timestamp, snapshot in zip(times, snapshots):
+            if timestamp >= raw_border:
+                bucket = None
+            elif timestamp >= hourly_border:
+                bucket = ('h', timestamp // HOUR)
+            else:
+                bucket = ('d', timestamp // DAY)
+
+            # Tame pačiame intervale paliekame paskutinį snapshot'ą
+            if bucket is not None and bucket == last_bucket:
+                kept_times[-1] = timestamp
+                kept_snapshots[-1] = snapshot
+            else:
+                kept_times.append(timestamp)
+                kept_snapshots.append(snapshot)
+            last_bucket = bucket
+
+        return kept_times, kept_snapshots
+
+    def compact(self, now: Optional[float] = None):
+        """
+        Išretina senus snapshot'us ir perrašo failą atomiškai (rašymo gijoje)
+        """
+        now = int(now if now is not None else time.time())
+        self.last_compaction = now
+
+        for key in list(self.times):
+            self.times[key], self.snapshots[key] = self._downsample(self.times[key], self.snapshots[key], now)
+            self.since_keyframe[key] = (len(self.times[key]) - 1) % self.keyframe_every
+
+        # Rašymo gijai perduodamos sąrašų kopijos - indeksas toliau keičiamas event loop'e
+        players = [(key, list(self.times[key]), list(self.snapshots[key])) for key in self.times]
+        self._submit(self._rewrite, players, now)
+
+    def _rewrite(self, players: List[Tuple[str, List[int], List[Dict]]], now: int):
+        tmp_file = f"{self.history_file}.tmp"
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'c': now}) + "\n")
+                for key, times, snapshots in players:
+                    previous = None
+                    for index, (timestamp, snapshot) in enumerate(zip(times, snapshots)):
+                        if index % self.keyframe_every == 0:
+                            previous = None
+                        record = self._encode(key, timestamp, snapshot, previous)
+                        f.write(json.dumps(record, separators=(',', ':'), ensure_ascii=False) + "\n")
+                        previous = snapshot
+            os.replace(tmp_file, self.history_file)
+        except Exception:
+            log.exception("Klaida retinant statistikos istoriją", file=self.history_file)
@@ -28,10 +28,10 @@ async def test_403_fix():
             stats = await api.get_player_stats(test_case['username'], test_case['platform'])
             if stats:
                 print("✅ Statistikos gavimas sėkmingas!")
-                print(f"   Vardas: {stats.get('username', 'N/A')}")
-                print(f"   Žudymai: {stats.get('kills', 0):,}")
-                print(f"   K/D: {stats.get('kd_ratio', 0):.2f}")
-                print(f"   Perėmimai: {stats.get('wins', 0):,}")
+                print(f"   Vardas: {stats.username}")
+                print(f"   Žudymai: {stats.kills:,}")
+                print(f"   K/D: {stats.kd_ratio:.2f}")
+                print(f"   Perėmimai: {stats.wins:,}")
             else:
                 print("❌ Statistikos gavimas nepavyko")
                 
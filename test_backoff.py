@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Backoff planuotojo testavimas (be interneto)
+"""
+
+import asyncio
+import time
+from email.utils import formatdate
+from aiohttp import web
+from backoff import BackoffScheduler
+from http_client import HTTPClient
+from providers import HTTPProvider, PROVIDER_SPECS
+
+def test_headers_and_exponential_backoff():
+    """Testuoja Retry-After, x-ratelimit-* ir eksponentinį atidėjimą"""
+    print("🧪 Testuojame atidėjimo skaičiavimą...")
+
+    now = time.time()
+    scheduler = BackoffScheduler(base_delay=2, jitter=0)
+
+    assert scheduler.record_failure('a', 429, {'Retry-After': '120'}, now=now) == 120
+    assert scheduler.remaining('a', now + 20) == 100
+
+    retry_date = formatdate(now + 300, usegmt=True)
+    assert 298 <= scheduler.record_failure('b', 503, {'Retry-After': retry_date}, now=now) <= 301
+
+    # RapidAPI ribos antraštės: likutis 0 - laukiame iki reset
+    scheduler.record_success('c', {'x-ratelimit-requests-remaining': '0', 'x-ratelimit-requests-reset': '45'}, now=now)
+    assert scheduler.remaining('c', now) == 45
+
+    # Be antraščių - 2, 4, 8 s
+    delays = [scheduler.record_failure('d', 502, {}, now=now) for _ in range(3)]
+    assert delays == [2, 4, 8]
+    scheduler.record_success('d', {}, now=now)
+    assert scheduler.remaining('d', now) == 0 and scheduler.failures('d') == 0
+
+    jittered = BackoffScheduler(base_delay=10, jitter=0.5).record_failure('e', 500, {}, now=now)
+    assert 5 <= jittered <= 10
+    print(scheduler.format_status(now))
+
+    print("✅ Atidėjimas skaičiuojamas teisingai")
+
+def test_provider_skips_blocked_host():
+    """Testuoja, kad po 429 tiekėjas iškart grąžina valdymą ir nekartoja užklausų"""
+    print("🧪 Testuojame tiekėjo atidėjimą...")
+
+    hits = []
+
+    async def limited(request):
+        hits.append(request.path)
+        return web.Response(status=429, headers={'Retry-After': '120'})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get('/warzone/{username}/{platform}', limited)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        spec = {**PROVIDER_SPECS['alternative_api'], 'base_url': f"http://127.0.0.1:{port}"}
+        provider = HTTPProvider('test_api', spec)
+        provider.scheduler = BackoffScheduler()
+        provider.client = HTTPClient()
+        try:
+            start = time.perf_counter()
+            first = await provider.get_player_stats('m1nd3#2311')
+            second = await provider.get_player_stats('m1nd3#2311')
+            elapsed = time.perf_counter() - start
+        finally:
+            await provider.client.close()
+            await runner.cleanup()
+        return first, second, elapsed, provider.scheduler.remaining(provider.host)
+
+    first, second, elapsed, remaining = asyncio.run(run())
+    assert first is None and second is None
+    assert len(hits) == 1
+    assert elapsed < 5
+    assert 100 < remaining <= 120
+
+    print("✅ Atidėtas host'as praleidžiamas be laukimo")
+
+if __name__ == "__main__":
+    test_headers_and_exponential_backoff()
+    test_provider_skips_blocked_host()
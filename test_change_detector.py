@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Pokyčių aptikimo testavimas (be tinklo)
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+from change_detector import ChangeDetector, parse_thresholds
+from player_stats import PlayerStats
+
+def make_stats(kills, deaths, wins, games_played, top_10=0):
+    return PlayerStats(
+        username='m1nd3#2311',
+        platform='battlenet',
+        kills=kills,
+        deaths=deaths,
+        kd_ratio=kills / deaths if deaths else kills,
+        wins=wins,
+        top_10=top_10,
+        games_played=games_played,
+        source='rapidapi_cod'
+    )
+
+def test_only_real_deltas_are_posted():
+    """Testuoja, kad pranešama tik viršijus ribas"""
+    print("🧪 Testuojame pokyčių ribas...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, 'state.json')
+        detector = ChangeDetector(state_file, thresholds=parse_thresholds("kills=5,games_played=0,wins=1"))
+        now = datetime(2024, 6, 22, 20, 0)
+
+        # Pirmas matymas - tik bazė
+        updates, recaps = detector.process([make_stats(100, 50, 3, 40)], now)
+        assert updates == [] and recaps == []
+
+        # Nepasikeitė - nieko nesiunčiame
+        updates, _ = detector.process([make_stats(100, 50, 3, 40)], now + timedelta(minutes=5))
+        assert updates == []
+
+        # Mažas pokytis kaupiamas, bet dar nesiunčiamas
+        updates, _ = detector.process([make_stats(103, 51, 3, 41)], now + timedelta(minutes=10))
+        assert updates == []
+
+        # Sukauptas pokytis pasiekia ribą
+        updates, _ = detector.process([make_stats(106, 52, 3, 42)], now + timedelta(minutes=15))
+        assert len(updates) == 1
+        assert updates[0]['deltas']['kills'] == 6
+        assert updates[0]['deltas']['games_played'] == 2
+        print(detector.format_updates_message(updates)[0])
+
+    print("✅ Ribos veikia")
+
+def test_recap_and_persistence():
+    """Testuoja sesijos suvestinę ir būsenos išsaugojimą"""
+    print("🧪 Testuojame sesijos suvestinę...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, 'state.json')
+        now = datetime(2024, 6, 22, 20, 0)
+
+        detector = ChangeDetector(state_file, quiet_after=1800)
+        detector.process([make_stats(100, 50, 3, 40)], now)
+        detector.process([make_stats(110, 55, 4, 43)], now + timedelta(minutes=20))
+
+        # Nauja instancija turi matyti tą pačią būseną
+        detector = ChangeDetector(state_file, quiet_after=1800)
+        _, recaps = detector.process([make_stats(110, 55, 4, 43)], now + timedelta(minutes=40))
+        assert recaps == []
+
+        _, recaps = detector.process([make_stats(110, 55, 4, 43)], now + timedelta(minutes=55))
+        assert len(recaps) == 1
+        assert recaps[0]['totals']['kills'] == 10
+        assert recaps[0]['totals']['games_played'] == 3
+        print(detector.format_recap_message(recaps[0]))
+
+    print("✅ Sesijos suvestinė veikia")
+
+if __name__ == "__main__":
+    test_only_real_deltas_are_posted()
+    test_recap_and_persistence()
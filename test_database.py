@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+WarzoneDatabase testavimas su sintetiniais žaidimais (be tinklo)
+"""
+
+import tempfile
+from bench.database import TracedDatabase, run_size
+from bench.synthetic_games import populate
+
+def test_synthetic_games():
+    """Testuoja, kad sugeneruoti žaidimai tenkina schemos apribojimus ir randami užklausomis"""
+    print("🧪 Testuojame sintetinius žaidimus...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = TracedDatabase(f"{tmp}/warzone.db")
+        players = populate(db, 20, 2000, days=30)['players']
+
+        with db._connect() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM wz_valid_games").fetchone()[0] == 2000
+            assert conn.execute("SELECT COUNT(*) FROM raw_games").fetchone()[0] == 2000
+            placement_ok = conn.execute(
+                "SELECT COUNT(*) FROM wz_valid_games WHERE teamPlacement > numberOfTeams"
+            ).fetchone()[0]
+            assert placement_ok == 0
+
+        summary = db.get_player_summary_stats(players[0]['player_id'], 30)
+        print(f"   {players[0]['player_id']}: {summary}")
+        assert summary['total_games'] == 100
+        assert 0 <= summary['win_rate'] <= 100
+
+    print("✅ Sintetiniai žaidimai tikroviški")
+
+def test_database_benchmark_smoke():
+    """Testuoja benchmark'ą su mažu duomenų kiekiu"""
+    print("🧪 Testuojame DB benchmark'ą...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run = run_size(3000, 30, 60, 5, tmp)
+
+    recent = run['operations']['get_player_recent_stats']
+    assert recent['calls'] == 5 and recent['p50_ms'] > 0
+    assert any('idx_wz_valid_games_player_uno_id' in detail
+               for query in recent['query_plans'] for detail in query['plan'])
+    assert run['operations']['save_game_stats']['calls'] == 5
+
+    print("✅ DB benchmark'as veikia")
+
+if __name__ == "__main__":
+    test_synthetic_games()
+    test_database_benchmark_smoke()
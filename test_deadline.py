@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Laiko biudžeto (deadline) testavimas (be interneto)
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime
+from aiohttp import web
+from backoff import BackoffScheduler
+from deadline import Deadline
+from http_cache import HTTPCache
+from http_client import HTTPClient
+from providers import HTTPProvider, PROVIDER_SPECS
+
+PAYLOAD = {"stats": {"username": "m1nd3", "kills": 1500, "deaths": 750, "kdRatio": 2.0}}
+
+def test_deadline_clips_and_serves_cache():
+    """Testuoja, kad biudžetas apriboja užklausą, o pasibaigus grąžinami talpyklos duomenys"""
+    print("🧪 Testuojame laiko biudžetą...")
+
+    hits = []
+    slow = {'delay': 0}
+
+    async def profile(request):
+        hits.append(request.path)
+        await asyncio.sleep(slow['delay'])
+        return web.json_response(PAYLOAD, headers={'ETag': '"v1"'})
+
+    async def run(db_path):
+        app = web.Application()
+        app.router.add_get('/warzone/{username}/{platform}', profile)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        spec = {**PROVIDER_SPECS['alternative_api'], 'base_url': f"http://127.0.0.1:{port}"}
+        provider = HTTPProvider('test_api', spec)
+        provider.scheduler = BackoffScheduler()
+        provider.client = HTTPClient(cache=HTTPCache(db_path))
+        try:
+            fresh = await provider.get_player_stats('m1nd3#2311', deadline=Deadline(10))
+
+            # Lėtas host'as - užklausa nutraukiama pagal biudžetą
+            slow['delay'] = 3
+            start = time.perf_counter()
+            clipped = await provider.get_player_stats('m1nd3#2311', deadline=Deadline(1))
+            clipped_time = time.perf_counter() - start
+
+            # Pasibaigęs biudžetas - užklausa nesiunčiama
+            before = len(hits)
+            expired = await provider.get_player_stats('m1nd3#2311', deadline=Deadline(0))
+            sent_after_expiry = len(hits) - before
+        finally:
+            await provider.client.close()
+            await runner.cleanup()
+        return fresh, clipped, clipped_time, expired, sent_after_expiry, provider.scheduler.failures(provider.host)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fresh, clipped, clipped_time, expired, sent_after_expiry, failures = asyncio.run(
+            run(os.path.join(tmp, 'cache.db'))
+        )
+
+    assert fresh and fresh.kills == 1500 and not fresh.is_fallback
+    assert clipped and clipped.kills == 1500
+    assert clipped_time < 2
+    assert expired and expired.kills == 1500
+    # Talpyklos duomenys pažymimi ir turi atsakymo gavimo laiką, o ne dabartinį
+    assert clipped.is_fallback and expired.is_fallback
+    assert expired.timestamp and (datetime.now() - datetime.fromisoformat(expired.timestamp)).total_seconds() >= 1
+    assert sent_after_expiry == 0
+    # Biudžeto pabaiga nėra host'o klaida
+    assert failures == 0
+
+    print("✅ Biudžetas apriboja užklausas ir grąžina talpyklos duomenis")
+
+def test_deadline_remaining():
+    """Testuoja likusio laiko skaičiavimą"""
+    deadline = Deadline(5)
+    assert 4 < deadline.remaining() <= 5
+    assert deadline.clip(20) <= 5 and deadline.clip(1) == 1
+    assert not deadline.expired()
+    assert Deadline(0.1).expired()
+    print("✅ Likęs laikas skaičiuojamas teisingai")
+
+if __name__ == "__main__":
+    test_deadline_remaining()
+    test_deadline_clips_and_serves_cache()
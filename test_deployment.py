@@ -61,10 +61,10 @@ async def test_api():
         
         if stats:
             print("✅ API veikia!")
-            print(f"   Vardas: {stats.get('username', 'N/A')}")
-            print(f"   Žudymai: {stats.get('kills', 0):,}")
-            print(f"   K/D: {stats.get('kd_ratio', 0):.2f}")
-            if stats.get('is_fallback'):
+            print(f"   Vardas: {stats.username}")
+            print(f"   Žudymai: {stats.kills:,}")
+            print(f"   K/D: {stats.kd_ratio:.2f}")
+            if stats.is_fallback:
                 print("   ⚠️ Naudojami fallback duomenys")
             return True
         else:
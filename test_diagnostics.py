@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+API diagnostikos testavimas prieš API imitatorių (be interneto)
+"""
+
+import asyncio
+import glob
+import os
+import tempfile
+import time
+from activision_api import ACTIVISION_HOST, ActivisionAPI
+from backoff import BackoffScheduler
+from diagnostics import ProviderDiagnostics
+from http_client import HTTPClient
+from mock_upstream import MockUpstream
+
+def run_diagnostics(latency, timeout):
+    """Paleidžia diagnostiką prieš imitatorių, grąžina rezultatus, trukmę ir užklausų skaičius"""
+
+    async def run():
+        upstream = MockUpstream(seed=1, latency=latency)
+        await upstream.start()
+        os.environ['PROVIDER_BASE_URLS'] = upstream.env()
+        diagnostics = ProviderDiagnostics(None, timeout=timeout)
+        diagnostics.client = HTTPClient()
+        diagnostics.activision_api.sso_token = None
+        try:
+            probes = diagnostics._http_probes('m1nd3#2311', 'battlenet')
+            start = time.perf_counter()
+            results = await diagnostics.run('m1nd3#2311', 'battle')
+            elapsed = time.perf_counter() - start
+        finally:
+            del os.environ['PROVIDER_BASE_URLS']
+            await diagnostics.client.close()
+            await upstream.stop()
+        unique = {(probe['url'], tuple(sorted(probe['headers'].items()))) for probe in probes}
+        return results, elapsed, len(probes), len(unique), upstream.calls()
+
+    return asyncio.run(run())
+
+def test_probes_run_concurrently_and_dedup_urls():
+    """Testuoja, kad tiekėjai tikrinami lygiagrečiai, o tas pats URL užklausiamas vieną kartą"""
+    print("🧪 Testuojame lygiagrečią diagnostiką...")
+
+    results, elapsed, probes, unique, calls = run_diagnostics(('fixed', 0.3), timeout=10)
+    print(f"   {probes} tiekėjų, {unique} skirtingų URL, {calls} užklausų, {elapsed:.2f} s")
+
+    http_results = results[:-1]
+    assert len(http_results) == probes and all(result['parsed'] for result in http_results)
+    assert calls == unique
+    # Nuoseklus tikrinimas užtruktų bent probes * 0.3 s
+    assert elapsed < 0.3 * unique / 2
+    assert results[-1]['name'] == 'Activision' and results[-1]['error'] == 'nėra SSO'
+    print("✅ Tiekėjai tikrinami lygiagrečiai, URL nesikartoja")
+
+def test_shared_timeout():
+    """Testuoja, kad lėti tiekėjai nutraukiami pagal bendrą laiko limitą"""
+    print("🧪 Testuojame bendrą diagnostikos laiko limitą...")
+
+    results, elapsed, probes, unique, calls = run_diagnostics(('fixed', 5), timeout=0.5)
+    assert elapsed < 1.5
+    assert all(result['error'] == 'timeout' for result in results[:-1])
+    print(f"✅ Diagnostika nutraukta po {elapsed:.2f} s")
+
+def test_cancelled_node_script_is_killed():
+    """Testuoja, kad atšaukus Activision užklausą Node.js procesas nutraukiamas prieš trinant skriptą"""
+    print("🧪 Testuojame Node.js proceso nutraukimą...")
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            pid_file = os.path.join(tmp, 'node.pid')
+            script = (f"require('fs').writeFileSync({pid_file!r}, String(process.pid));"
+                      "setTimeout(() => {}, 10000);")
+
+            async def run():
+                api = ActivisionAPI()
+                task = asyncio.ensure_future(api._run_node_script(script))
+                while not os.path.exists(pid_file) or not os.path.getsize(pid_file):
+                    await asyncio.sleep(0.05)
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+            asyncio.run(asyncio.wait_for(run(), 10))
+            with open(pid_file) as f:
+                pid = int(f.read())
+            leftovers = glob.glob(os.path.join(tmp, 'temp_activision_*.js'))
+        finally:
+            os.chdir(cwd)
+
+    try:
+        os.kill(pid, 0)
+        alive = True
+    except ProcessLookupError:
+        alive = False
+    assert not alive, "Node.js procesas liko veikti"
+    assert not leftovers
+    print("✅ Procesas nutrauktas, laikinas skriptas ištrintas")
+
+def test_activision_backoff_does_not_block():
+    """Testuoja, kad Activision API naudoja bendrą planuotoją ir nelaukia event loop'e"""
+    print("🧪 Testuojame Activision API atidėjimą...")
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            api = ActivisionAPI(sso_token='bandymas')
+            api.scheduler = BackoffScheduler(jitter=0)
+
+            # Nepavykęs Node.js paleidimas atideda host'ą
+            assert asyncio.run(api._run_node_script("process.exit(3)")) is None
+            assert api.last_returncode == 3
+            assert api.scheduler.remaining(ACTIVISION_HOST) > 0
+
+            # Atidėtas host'as ir išnaudotas limitas - grąžinama iškart, Node.js nepaleidžiamas
+            start = time.perf_counter()
+            assert asyncio.run(api.get_player_stats('m1nd3#2311')) is None
+            api.scheduler = BackoffScheduler()
+            api.max_requests_per_minute = 1
+            api.request_times = [time.time()]
+            assert asyncio.run(api.search_player('m1nd3#2311')) is None
+            elapsed = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+
+    assert elapsed < 0.5 and api.last_returncode == 3
+    print(f"✅ Activision užklausos praleistos per {elapsed * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    test_probes_run_concurrently_and_dedup_urls()
+    test_shared_timeout()
+    test_cancelled_node_script_is_killed()
+    test_activision_backoff_does_not_block()
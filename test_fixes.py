@@ -33,7 +33,7 @@ async def test_platform_normalization():
             stats = await api.get_player_stats(test_case['username'], test_case['platform'])
             if stats:
                 print(f"   ✅ Statistikos gavimas sėkmingas!")
-                print(f"   Platforma rezultate: {stats.get('platform', 'N/A')}")
+                print(f"   Platforma rezultate: {stats.platform}")
             else:
                 print("   ❌ Statistikos gavimas nepavyko")
                 
@@ -57,8 +57,8 @@ async def test_stats_fetcher():
         
         if stats:
             print("✅ StatsFetcher veikia!")
-            print(f"   Šaltinis: {stats.get('source', 'N/A')}")
-            print(f"   Platforma: {stats.get('platform', 'N/A')}")
+            print(f"   Šaltinis: {stats.source}")
+            print(f"   Platforma: {stats.platform}")
         else:
             print("❌ StatsFetcher nepavyko")
             
@@ -81,8 +81,8 @@ async def test_alternative_api():
         stats = await api.get_player_stats(test_username, test_platform)
         if stats:
             print("✅ Alternatyvus API veikia!")
-            print(f"   Vardas: {stats.get('username', 'N/A')}")
-            print(f"   Žudymai: {stats.get('kills', 0):,}")
+            print(f"   Vardas: {stats.username}")
+            print(f"   Žudymai: {stats.kills:,}")
         else:
             print("❌ Alternatyvus API nepavyko")
             
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Bendro HTTP kliento testavimas su lokaliu serveriu (be interneto)
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+from aiohttp import web
+from cassette import Cassette, CassetteMiss
+from http_cache import HTTPCache
+from http_client import HTTPClient, RequestNotAdmitted, ResponseTooLarge
+from providers import create_provider
+
+SMALL = {'stats': {'kills': 10}}
+LARGE = {'matches': [{'id': i, 'kills': i % 20, 'mode': 'br_quads'} for i in range(20000)]}
+
+def respond(payload, status=200):
+    async def handler(request):
+        return web.json_response(payload, status=status)
+    return handler
+
+async def profile(request):
+    """Profilis su ETag - jei klientas turi tą pačią versiją, grąžiname 304"""
+    if request.headers.get('If-None-Match') == '"v1"':
+        return web.Response(status=304, headers={'ETag': '"v1"'})
+    return web.json_response(SMALL, headers={'ETag': '"v1"', 'Cache-Control': 'max-age=0'})
+
+async def fresh(request):
+    return web.json_response(SMALL, headers={'Cache-Control': 'public, max-age=60'})
+
+async def start_server():
+    app = web.Application()
+    app.router.add_get('/profile', profile)
+    app.router.add_get('/fresh', fresh)
+    app.router.add_get('/small', respond(SMALL))
+    app.router.add_get('/large', respond(LARGE))
+    app.router.add_get('/missing', respond(None, 404))
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+def test_decode_and_usage():
+    """Testuoja JSON dekodavimą, didelių atsakymų perkėlimą į giją ir statistiką"""
+    print("🧪 Testuojame JSON dekodavimą...")
+
+    async def run():
+        runner, base = await start_server()
+        client = HTTPClient(offload_threshold=64 * 1024)
+        try:
+            assert await client.get_json(f"{base}/small", label='small') == (200, SMALL)
+            status, data = await client.get_json(f"{base}/large", label='large')
+            assert status == 200 and len(data['matches']) == 20000
+            assert await client.get_json(f"{base}/missing", label='small') == (404, None)
+        finally:
+            await client.close()
+            await runner.cleanup()
+        return client
+
+    client = asyncio.run(run())
+    assert client.usage['small']['requests'] == 2
+    assert client.usage['large']['offloaded'] == 1
+    assert client.usage['large']['parsed_bytes'] == len(json.dumps(LARGE))
+    print(client.format_usage())
+
+    print("✅ Dekodavimas veikia")
+
+def test_body_size_limit():
+    """Testuoja atsakymo dydžio ribą"""
+    print("🧪 Testuojame dydžio ribą...")
+
+    async def run():
+        runner, base = await start_server()
+        client = HTTPClient(max_body_size=1024)
+        try:
+            await client.get(f"{base}/large", label='large')
+            return False
+        except ResponseTooLarge:
+            return client.usage['large']['too_large'] == 1
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    assert asyncio.run(run())
+    print("✅ Dydžio riba veikia")
+
+def test_conditional_requests():
+    """Testuoja ETag sąlygines užklausas ir max-age"""
+    print("🧪 Testuojame HTTP talpyklą...")
+
+    async def run(db_path):
+        runner, base = await start_server()
+        client = HTTPClient(cache=HTTPCache(db_path))
+        connections = set()
+        try:
+            for _ in range(3):
+                assert await client.get_json(f"{base}/profile", label='profile') == (200, SMALL)
+                assert await client.get_json(f"{base}/fresh", label='fresh') == (200, SMALL)
+                connections.add(id(client.cache.conn))
+            # Visos užklausos naudoja tą patį talpyklos ryšį
+            assert len(connections) == 1 and client.cache.conn is not None
+        finally:
+            await client.close()
+            await runner.cleanup()
+        # Uždarant klientą uždaromas ir talpyklos ryšys
+        assert client.cache.conn is None
+        return client
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client = asyncio.run(run(os.path.join(tmp, 'cache.db')))
+
+    # Pirmą kartą pilnas atsakymas, vėliau 304 be body
+    assert client.usage['profile']['requests'] == 3
+    assert client.usage['profile']['cache_revalidated'] == 2
+    assert client.usage['profile']['bytes'] == len(json.dumps(SMALL))
+    # Kol galioja max-age, užklausa nesiunčiama
+    assert client.usage['fresh']['requests'] == 1
+    assert client.usage['fresh']['cache_fresh'] == 2
+    print(client.format_usage())
+
+    print("✅ HTTP talpykla veikia")
+
+def test_fresh_cache_skips_rate_limit():
+    """Testuoja, kad galiojantis talpyklos atsakymas nenaudoja tiekėjo minutės limito"""
+    print("🧪 Testuojame limitą su talpykla...")
+
+    async def run(db_path):
+        runner, base = await start_server()
+        client = HTTPClient(cache=HTTPCache(db_path))
+        provider = create_provider('tracker_gg')
+        provider.client = client
+        provider.limiter.per_minute = 1
+        admitted = []
+
+        def admit():
+            admitted.append(True)
+            return False
+
+        try:
+            # Klientas: admit kviečiamas tik einant į tinklą
+            try:
+                await client.get(f"{base}/small", admit=admit)
+                assert False, "Neleista užklausa turi mesti RequestNotAdmitted"
+            except RequestNotAdmitted:
+                pass
+            assert len(admitted) == 1 and client.usage['']['requests'] == 0
+
+            # Tiekėjas: pirma užklausa užima vienintelę vietą, kitos - iš talpyklos (max-age)
+            for _ in range(3):
+                assert await provider.request(f"{base}/fresh", admit=provider.admit) == SMALL
+            assert len(provider.limiter.request_times) == 1
+            # Talpykloje nesantis atsakymas limito nebeturi
+            assert await provider.request(f"{base}/small", admit=provider.admit) is None
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(os.path.join(tmp, 'cache.db')))
+
+    print("✅ Talpyklos atsakymai limito nenaudoja")
+
+def test_record_and_replay():
+    """Testuoja atsakymų įrašymą į kasetę ir atkūrimą be tinklo"""
+    print("🧪 Testuojame kasetes...")
+
+    async def record(path):
+        runner, base = await start_server()
+        client = HTTPClient(cassette=Cassette(path, 'record'))
+        try:
+            small = await client.get(f"{base}/small")
+            missing = await client.get(f"{base}/missing")
+        finally:
+            await client.close()
+            await runner.cleanup()
+        return base, small, missing
+
+    async def replay(path, base, timing_scale=0.0, timeout=20):
+        client = HTTPClient(cassette=Cassette(path, 'replay', timing_scale))
+        small = await client.get(f"{base}/small", timeout=timeout)
+        missing = await client.get(f"{base}/missing")
+        try:
+            await client.get(f"{base}/large")
+            miss = False
+        except CassetteMiss:
+            miss = True
+        return small, missing, miss
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'providers.jsonl.gz')
+        base, recorded_small, recorded_missing = asyncio.run(record(path))
+
+        # Serveris jau sustabdytas - atsakymai tik iš kasetės
+        small, missing, miss = asyncio.run(replay(path, base))
+        assert small.status == 200 and small.body == recorded_small.body
+        assert small.headers['content-type'] == recorded_small.headers['Content-Type']
+        assert missing.status == 404 and missing.body == recorded_missing.body
+        assert miss
+
+        # Įrašytas vėlinimas ilgesnis už timeout - atkuriama kaip timeout
+        try:
+            asyncio.run(replay(path, base, timing_scale=1e6, timeout=0.05))
+            timed_out = False
+        except asyncio.TimeoutError:
+            timed_out = True
+        assert timed_out
+
+    print("✅ Kasetės įrašomos ir atkuriamos baitas į baitą")
+
+if __name__ == "__main__":
+    test_decode_and_usage()
+    test_body_size_limit()
+    test_conditional_requests()
+    test_fresh_cache_skips_rate_limit()
+    test_record_and_replay()
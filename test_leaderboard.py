@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Gyvos lyderių lentelės testavimas - redaguojama tik pasikeitus turiniui, ne dažniau nei
+leidžia intervalas, o ištrinta žinutė siunčiama iš naujo
+"""
+
+import asyncio
+import os
+import tempfile
+from types import SimpleNamespace
+
+import discord
+
+from leaderboard import LiveLeaderboard
+
+class FakeMessage:
+    def __init__(self, message_id: int, channel):
+        self.id = message_id
+        self.channel = channel
+
+    async def edit(self, content: str):
+        if self.channel.edit_error is not None:
+            raise self.channel.edit_error
+        self.channel.edits.append((self.id, content))
+
+class FakeChannel:
+    def __init__(self):
+        self.id = 42
+        self.sent = []
+        self.edits = []
+        self.edit_error = None
+
+    async def send(self, content: str):
+        self.sent.append(content)
+        return FakeMessage(len(self.sent), self)
+
+    def get_partial_message(self, message_id: int):
+        return FakeMessage(message_id, self)
+
+def http_error(cls, status: int):
+    return cls(SimpleNamespace(status=status, reason='Discord'), 'klaida')
+
+def test_hash_and_throttle():
+    """Testuoja, kad nepakitęs turinys neredaguojamas, o redagavimai ribojami intervalu"""
+    print("🧪 Testuojame lentelės redagavimo ribojimą...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        board = LiveLeaderboard(os.path.join(tmp, 'state.json'), min_edit_interval=30)
+        channel = FakeChannel()
+
+        assert asyncio.run(board.update(channel, "A")) == 'posted'
+        assert asyncio.run(board.update(channel, "A")) == 'unchanged'
+        assert asyncio.run(board.update(channel, "B")) == 'throttled'
+        assert channel.sent == ["A"] and channel.edits == []
+
+        board.state['channels'][str(channel.id)]['last_edit'] -= 31
+        assert asyncio.run(board.update(channel, "B")) == 'edited'
+        assert channel.edits == [(1, "B")]
+
+        # Būsena išlieka po perkrovimo - ta pati žinutė, tas pats hash
+        restored = LiveLeaderboard(board.state_file, min_edit_interval=30)
+        entry = restored.state['channels'][str(channel.id)]
+        assert entry['message_id'] == 1
+        assert entry['content_hash'] == LiveLeaderboard.content_hash("B")
+
+    print("✅ Redaguojama tik pasikeitus turiniui ir ne dažniau nei leidžiama")
+
+def test_repost_when_message_deleted():
+    """Testuoja, kad ištrinta lentelės žinutė siunčiama iš naujo"""
+    with tempfile.TemporaryDirectory() as tmp:
+        board = LiveLeaderboard(os.path.join(tmp, 'state.json'), min_edit_interval=0)
+        channel = FakeChannel()
+        assert asyncio.run(board.update(channel, "A")) == 'posted'
+
+        channel.edit_error = http_error(discord.NotFound, 404)
+        assert asyncio.run(board.update(channel, "B")) == 'posted'
+        assert channel.sent == ["A", "B"]
+        assert board.state['channels'][str(channel.id)]['message_id'] == 2
+    print("✅ Ištrinta žinutė išsiųsta iš naujo")
+
+def test_edit_errors():
+    """Testuoja, kad kitos Discord klaidos nelaikomos ribojimu ir redagavimas kartojamas"""
+    with tempfile.TemporaryDirectory() as tmp:
+        board = LiveLeaderboard(os.path.join(tmp, 'state.json'), min_edit_interval=0)
+        channel = FakeChannel()
+        asyncio.run(board.update(channel, "A"))
+
+        channel.edit_error = http_error(discord.HTTPException, 429)
+        assert asyncio.run(board.update(channel, "B")) == 'throttled'
+        channel.edit_error = http_error(discord.Forbidden, 403)
+        assert asyncio.run(board.update(channel, "B")) == 'error'
+        channel.edit_error = http_error(discord.HTTPException, 500)
+        assert asyncio.run(board.update(channel, "B")) == 'error'
+        assert channel.sent == ["A"]
+
+        # Klaida nepažymi turinio kaip parodyto - kitas tikrinimas bando vėl
+        channel.edit_error = None
+        assert asyncio.run(board.update(channel, "B")) == 'edited'
+    print("✅ Redagavimo klaidos atskirtos nuo ribojimo")
+
+if __name__ == "__main__":
+    test_hash_and_throttle()
+    test_repost_when_message_deleted()
+    test_edit_errors()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Struktūruoto žurnalo testavimas
+"""
+
+import io
+import json
+import logging
+from logs import ROOT_LOGGER, configure_logging, get_logger, parse_levels, shutdown_logging
+
+def _reset():
+    """Grąžina žurnalą į nesukonfigūruotą būseną (kitiems testams)"""
+    shutdown_logging()
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(logging.NOTSET)
+    root.propagate = True
+    logging.getLogger(f"{ROOT_LOGGER}.providers").setLevel(logging.NOTSET)
+
+def test_key_value_levels_and_sampling():
+    """Testuoja laukus, lygius, retinimą ir traceback"""
+    print("🧪 Testuojame struktūruotą žurnalą...")
+
+    stream = io.StringIO()
+    configure_logging('INFO', 'text', {'providers': 'DEBUG'}, stream)
+    try:
+        log = get_logger('test')
+        providers_log = get_logger('providers')
+
+        log.info("HTTP klaida", provider='tracker_gg', status=429, player='m1nd3 #2311')
+        log.debug("Užklausa", url='http://x')
+        providers_log.debug("Užklausa", provider='rapidapi_cod')
+        for _ in range(10):
+            log.info("Dažnas pranešimas", sample=5)
+        try:
+            raise ValueError("blogas JSON")
+        except ValueError:
+            log.exception("Klaida apdorojant duomenis", provider='tracker_gg')
+    finally:
+        shutdown_logging()
+        _reset()
+
+    lines = stream.getvalue().splitlines()
+    assert any(line.endswith('INFO    test: HTTP klaida provider=tracker_gg status=429 player="m1nd3 #2311"')
+               for line in lines), lines
+    # DEBUG išjungtas numatytai, bet įjungtas providers moduliui
+    assert not any("url=http://x" in line for line in lines)
+    assert any("providers: Užklausa provider=rapidapi_cod" in line for line in lines)
+    sampled = [line for line in lines if "Dažnas pranešimas" in line]
+    assert len(sampled) == 2 and all("sampled=1/5" in line for line in sampled)
+    assert "ValueError: blogas JSON" in stream.getvalue()
+
+    print("✅ Žurnalas rašo laukus, gerbia lygius ir retina")
+
+def test_json_format():
+    """Testuoja JSON formatą"""
+    stream = io.StringIO()
+    configure_logging('DEBUG', 'json', {}, stream)
+    try:
+        get_logger('test').warning("Host'as atidėtas", provider='reliable_api', delay_s=30)
+    finally:
+        shutdown_logging()
+        _reset()
+
+    record = json.loads(stream.getvalue().strip())
+    assert record['level'] == 'WARNING' and record['logger'] == 'test'
+    assert record['provider'] == 'reliable_api' and record['delay_s'] == 30
+    assert parse_levels("providers=debug, http_cache=WARNING,blogas") == {'providers': 'DEBUG', 'http_cache': 'WARNING'}
+    print("✅ JSON formatas veikia")
+
+if __name__ == "__main__":
+    test_key_value_levels_and_sampling()
+    test_json_format()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Išeinančių žinučių eilės testavimas (be Discord)
+"""
+
+import asyncio
+import gc
+from message_queue import DISCORD_MESSAGE_LIMIT, OutboundQueue, split_message
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+        self.edits = []
+
+    async def edit(self, content):
+        self.edits.append(content)
+        self.content = content
+
+class FakeChannel:
+    def __init__(self, channel_id=1, fail=False):
+        self.id = channel_id
+        self.fail = fail
+        self.sent = []
+
+    async def send(self, content):
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("Discord nepasiekiamas")
+        self.sent.append(content)
+        return FakeMessage(content)
+
+class FakeContext:
+    def __init__(self, channel):
+        self.channel = channel
+
+def test_split_message():
+    """Testuoja ilgų žinučių dalijimą pagal eilutes"""
+    print("🧪 Testuojame žinučių dalijimą...")
+
+    assert split_message("trumpa") == ["trumpa"]
+    lines = [f"eilutė {i} " + "x" * 90 for i in range(60)]
+    parts = split_message("\n".join(lines))
+    assert len(parts) > 1 and all(len(part) <= DISCORD_MESSAGE_LIMIT for part in parts)
+    assert "\n".join(parts) == "\n".join(lines)
+
+    long_line = "y" * (DISCORD_MESSAGE_LIMIT * 2 + 10)
+    parts = split_message(long_line)
+    assert [len(part) for part in parts] == [DISCORD_MESSAGE_LIMIT, DISCORD_MESSAGE_LIMIT, 10]
+    print("✅ Žinutės dalijamos neviršijant limito")
+
+def test_coalescing_and_split_sends():
+    """Testuoja tos pačios grupės žinučių sujungimą ir padalytos žinutės future"""
+    print("🧪 Testuojame žinučių sujungimą...")
+
+    async def run():
+        queue = OutboundQueue()
+        channel = FakeChannel()
+        group = object()
+        futures = [queue.send(channel, f"eilutė {i}", group=group) for i in range(5)]
+        other = queue.send(channel, "kita grupė")
+        long_future = queue.send(channel, "z" * (DISCORD_MESSAGE_LIMIT + 5))
+        await asyncio.gather(*futures, other, long_future)
+        return channel, futures, long_future
+
+    channel, futures, long_future = asyncio.run(run())
+    # Penkios grupės žinutės - viena Discord žinutė, kita grupė - atskirai, ilga - dviem dalimis
+    assert channel.sent[0] == "\n".join(f"eilutė {i}" for i in range(5))
+    assert channel.sent[1] == "kita grupė"
+    assert [len(content) for content in channel.sent[2:]] == [DISCORD_MESSAGE_LIMIT, 5]
+    assert all(future.result() is futures[0].result() for future in futures)
+    # Ilgos žinutės future išsipildo paskutine dalimi
+    assert long_future.result().content == "z" * 5
+    print("✅ Sujungta į 4 žinutes")
+
+def test_command_output():
+    """Testuoja komandos išvestį - būsenos žinutė redaguojama, rezultatai sujungiami"""
+    print("🧪 Testuojame komandos išvestį...")
+
+    async def run():
+        queue = OutboundQueue()
+        channel = FakeChannel()
+        async with queue.command(FakeContext(channel)) as out:
+            await out.status("🔄 Gauname...")
+            await out.status("✅ Gauta")
+            out.send("pirmas")
+            out.send("antras")
+        return channel, out
+
+    channel, out = asyncio.run(run())
+    assert channel.sent == ["🔄 Gauname...", "pirmas\nantras"]
+    assert out.status_message.edits == ["✅ Gauta"]
+    print("✅ Būsena redaguojama, rezultatai išsiųsti viena žinute")
+
+def test_failed_send_without_waiter():
+    """Testuoja, kad niekieno nelaukiamo siuntimo klaida nesukelia 'never retrieved' įspėjimo"""
+    print("🧪 Testuojame nepavykusį siuntimą...")
+
+    unhandled = []
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda loop, context: unhandled.append(context))
+        queue = OutboundQueue()
+        channel = FakeChannel(fail=True)
+        queue.send(channel, "niekas nelaukia")
+        awaited = queue.send(channel, "laukiama")
+        try:
+            await awaited
+            assert False, "Klaida turi būti perduota laukiančiajam"
+        except RuntimeError:
+            pass
+        gc.collect()
+
+    asyncio.run(run())
+    gc.collect()
+    assert not unhandled, unhandled
+    print("✅ Klaida perduodama laukiančiajam, o nelaukiama - neįspėja")
+
+if __name__ == "__main__":
+    test_split_message()
+    test_coalescing_and_split_sends()
+    test_command_output()
+    test_failed_send_without_waiter()
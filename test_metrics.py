@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Prometheus metrikų testavimas (be interneto)
+"""
+
+import asyncio
+import os
+import tempfile
+import aiohttp
+from aiohttp import web
+from backoff import BackoffScheduler
+from http_cache import HTTPCache
+from http_client import HTTPClient
+from metrics import MetricsRegistry, PROVIDER_REQUESTS, start_metrics_server
+from providers import HTTPProvider, PROVIDER_SPECS
+
+PAYLOAD = {"stats": {"username": "m1nd3", "kills": 1500, "deaths": 750, "kdRatio": 2.0}}
+
+def test_render_format():
+    """Testuoja tekstinį formatą ir kaupiamąsias histogramos reikšmes"""
+    print("🧪 Testuojame metrikų formatą...")
+
+    metrics = MetricsRegistry()
+    requests = metrics.counter('test_requests_total', "Užklausos", ('provider', 'status'))
+    latency = metrics.histogram('test_seconds', "Trukmė", buckets=(0.1, 1))
+    lag = metrics.gauge('test_lag', "Vėlavimas")
+
+    requests.labels('api', 200).inc()
+    requests.labels('api', 200).inc(2)
+    requests.labels('api', 'timeout').inc()
+    for value in (0.05, 0.5, 5):
+        latency.observe(value)
+    lag.set(0.25)
+
+    text = metrics.render()
+    assert '# TYPE test_requests_total counter' in text
+    assert 'test_requests_total{provider="api",status="200"} 3' in text
+    assert 'test_requests_total{provider="api",status="timeout"} 1' in text
+    assert 'test_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_seconds_bucket{le="1"} 2' in text
+    assert 'test_seconds_bucket{le="+Inf"} 3' in text
+    assert 'test_seconds_count 3' in text
+    assert 'test_lag 0.25' in text
+    # Tas pats vaikas grąžinamas pakartotinai
+    assert requests.labels('api', 200) is requests.labels('api', '200')
+
+    print("✅ Metrikos atvaizduojamos Prometheus formatu")
+
+def test_provider_metrics_endpoint():
+    """Testuoja, kad tiekėjo užklausos matomos /metrics endpoint'e"""
+    print("🧪 Testuojame /metrics endpoint'ą...")
+
+    async def profile(request):
+        return web.json_response(PAYLOAD)
+
+    async def run(db_path):
+        app = web.Application()
+        app.router.add_get('/warzone/{username}/{platform}', profile)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        spec = {**PROVIDER_SPECS['alternative_api'], 'base_url': f"http://127.0.0.1:{port}"}
+        provider = HTTPProvider('metrics_test_api', spec)
+        provider.scheduler = BackoffScheduler()
+        provider.client = HTTPClient(cache=HTTPCache(db_path))
+
+        metrics_runner = await start_metrics_server('127.0.0.1', 0)
+        metrics_port = metrics_runner.addresses[0][1]
+        try:
+            stats = await provider.get_player_stats('m1nd3#2311')
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://127.0.0.1:{metrics_port}/metrics") as response:
+                    content_type = response.headers['Content-Type']
+                    text = await response.text()
+        finally:
+            await provider.client.close()
+            await metrics_runner.cleanup()
+            await runner.cleanup()
+        return stats, content_type, text
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stats, content_type, text = asyncio.run(run(os.path.join(tmp, 'cache.db')))
+
+    assert stats and stats.kills == 1500
+    assert content_type.startswith('text/plain; version=0.0.4')
+    assert 'warzone_provider_requests_total{provider="metrics_test_api",status="200"} 1' in text
+    assert 'warzone_provider_request_seconds_count{provider="metrics_test_api"} 1' in text
+    assert 'warzone_http_cache_total{result="miss"}' in text
+    assert PROVIDER_REQUESTS.labels('metrics_test_api', 200).value == 1
+    assert '# TYPE warzone_event_loop_lag_seconds histogram' in text
+
+    print("✅ Tiekėjo užklausos matomos /metrics")
+
+if __name__ == "__main__":
+    test_render_format()
+    test_provider_metrics_endpoint()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+API imitatoriaus testavimas - visi tiekėjai prieš mock_upstream.py (be interneto)
+"""
+
+import asyncio
+import os
+import tempfile
+from backoff import BackoffScheduler
+from cassette import Cassette
+from http_client import HTTPClient
+from mock_upstream import MockUpstream, synthetic_stats
+from providers import PROVIDER_SPECS, ProviderChain, create_provider
+
+def make_provider(key, base_urls, scheduler, cassette=None):
+    """Sukuria tiekėją, nukreiptą į imitatorių, su atskiru klientu ir planuotoju"""
+    os.environ['PROVIDER_BASE_URLS'] = ",".join(f"{k}={url}" for k, url in base_urls.items())
+    try:
+        provider = create_provider(key)
+    finally:
+        del os.environ['PROVIDER_BASE_URLS']
+    provider.client = HTTPClient(cassette=cassette)
+    provider.scheduler = scheduler
+    return provider
+
+def test_all_providers_parse_mock_payloads():
+    """Testuoja, kad kiekvieno tiekėjo parseris supranta imitatoriaus atsakymus"""
+    print("🧪 Testuojame visus tiekėjus prieš imitatorių...")
+
+    async def run():
+        upstream = MockUpstream(seed=1, latency=('fixed', 0))
+        base_urls = await upstream.start()
+        results = {}
+        try:
+            for key in PROVIDER_SPECS:
+                provider = make_provider(key, base_urls, BackoffScheduler())
+                try:
+                    results[key] = await provider.get_player_stats('m1nd3#2311', 'battlenet')
+                    if 'matches' in provider.endpoints:
+                        results[f"{key}/matches"] = await provider.get_recent_matches('m1nd3#2311', 'battlenet')
+                    if 'profile' in provider.endpoints:
+                        results[f"{key}/profile"] = await provider.get_player_info('m1nd3#2311', 'battlenet')
+                finally:
+                    await provider.client.close()
+        finally:
+            await upstream.stop()
+        return results, upstream.calls()
+
+    results, calls = asyncio.run(run())
+    expected = synthetic_stats('m1nd3')
+    for key in PROVIDER_SPECS:
+        stats = results[key]
+        print(f"   {key}: {stats.kills if stats else None}")
+        assert stats and stats.kills == expected['kills'] and stats.kd_ratio == expected['kd_ratio']
+    assert len(results['rapidapi_cod/matches']) == 5
+    assert results['tracker_gg/profile']['username'] == 'm1nd3#2311'
+    assert calls == len(results)
+
+    print("✅ Visi parseriai supranta imitatoriaus atsakymus")
+
+def test_chain_matches_fall_through():
+    """Testuoja, kad sudėtinis tiekėjas žaidimų ieško pas narius iš eilės"""
+    print("🧪 Testuojame sudėtinio tiekėjo žaidimus...")
+
+    async def run():
+        upstream = MockUpstream(seed=1, latency=('fixed', 0))
+        base_urls = await upstream.start()
+        os.environ['PROVIDER_BASE_URLS'] = ",".join(f"{k}={url}" for k, url in base_urls.items())
+        try:
+            # cod_stats_api žaidimų neturi, tracker_gg - atidėtas, rapidapi_cod - grąžina
+            chain = ProviderChain('bandomasis', {'name': 'Bandomasis',
+                                                 'members': ['cod_stats_api', 'tracker_gg', 'rapidapi_cod']})
+        finally:
+            del os.environ['PROVIDER_BASE_URLS']
+        client = HTTPClient()
+        scheduler = BackoffScheduler()
+        for member in chain.members:
+            member.client = client
+            member.scheduler = scheduler
+        scheduler.record_failure(chain.members[1].host, 429, {'Retry-After': '300'})
+        try:
+            matches = await chain.get_recent_matches('m1nd3#2311', 'battlenet', limit=3)
+        finally:
+            await client.close()
+            await upstream.stop()
+        return matches, upstream.calls()
+
+    matches, calls = asyncio.run(run())
+    assert len(matches) == 3 and calls == 1
+    print("✅ Žaidimai gauti iš pirmo juos palaikančio nario")
+
+def test_fault_injection():
+    """Testuoja 429 su Retry-After ir nežinomo žaidėjo 404"""
+    print("🧪 Testuojame klaidų injekciją...")
+
+    async def run():
+        upstream = MockUpstream(seed=1, latency=('fixed', 0))
+        base_urls = await upstream.start()
+        scheduler = BackoffScheduler()
+        upstream.configure('api.tracker.gg', errors={429: 1.0}, retry_after=90)
+        upstream.configure('cod-api.uno', players={'m1nd3'})
+        tracker = make_provider('tracker_gg', base_urls, scheduler)
+        third = make_provider('third_api', base_urls, scheduler)
+        try:
+            limited = await tracker.get_player_stats('m1nd3#2311', 'battlenet')
+            unknown = await third.get_player_stats('nezinomas', 'battlenet')
+            known = await third.get_player_stats('m1nd3#2311', 'battlenet')
+        finally:
+            await tracker.client.close()
+            await third.client.close()
+            await upstream.stop()
+        return limited, unknown, known, scheduler.remaining(tracker.host), upstream.hits
+
+    limited, unknown, known, remaining, hits = asyncio.run(run())
+    print(f"   Atsakymai: {hits}")
+    assert limited is None and 80 < remaining <= 90
+    assert unknown is None and known is not None
+    assert hits['api.tracker.gg'] == {429: 1}
+    assert hits['cod-api.uno'] == {404: 1, 200: 1}
+
+    print("✅ Klaidų injekcija veikia")
+
+def test_replay_matches_recording():
+    """Testuoja, kad iš kasetės atkurti atsakymai apdorojami taip pat kaip įrašyti"""
+    print("🧪 Testuojame parserius su kasete...")
+
+    async def fetch_all(base_urls, cassette):
+        results = {}
+        for key in PROVIDER_SPECS:
+            provider = make_provider(key, base_urls, BackoffScheduler(), cassette)
+            try:
+                results[key] = await provider.get_player_stats('m1nd3#2311', 'battlenet')
+            finally:
+                await provider.client.close()
+        return results
+
+    async def record(path):
+        upstream = MockUpstream(seed=1, latency=('fixed', 0))
+        base_urls = await upstream.start()
+        try:
+            return base_urls, await fetch_all(base_urls, Cassette(path, 'record'))
+        finally:
+            await upstream.stop()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'providers.jsonl.gz')
+        base_urls, recorded = asyncio.run(record(path))
+        replayed = asyncio.run(fetch_all(base_urls, Cassette(path, 'replay')))
+
+    for key in PROVIDER_SPECS:
+        assert recorded[key] is not None and replayed[key] == recorded[key]
+
+    print("✅ Atkurti atsakymai apdorojami identiškai")
+
+def test_fetch_benchmark_smoke():
+    """Testuoja benchmark'o paleidimą su mažu žaidėjų sąrašu"""
+    print("🧪 Testuojame benchmark'ą...")
+
+    from bench.fetch import sweep
+
+    result = asyncio.run(sweep([5], ['none'], ['instant']))[0]
+    print(f"   {result}")
+    assert result['fetched'] == 5 and result['missing'] == 0
+    assert result['calls_per_player'] == 1.0
+    assert result['p50_ms'] > 0 and result['peak_rss_mb'] > 0
+
+    print("✅ Benchmark'as veikia")
+
+def test_peak_rss_per_run():
+    """Testuoja, kad RSS pikas matuojamas kiekvienam paleidimui atskirai"""
+    from bench.common import peak_rss_mb, reset_peak_rss
+
+    if reset_peak_rss() != 'run':
+        print("⚠️ RSS piko atstatyti negalima - praleidžiama")
+        return
+    ballast = bytearray(200 * 1024 * 1024)
+    for i in range(0, len(ballast), 4096):
+        ballast[i] = 1
+    large = peak_rss_mb()
+    del ballast
+
+    assert reset_peak_rss() == 'run'
+    assert peak_rss_mb() < large - 100
+    print("✅ RSS pikas neapima ankstesnio paleidimo")
+
+if __name__ == "__main__":
+    test_all_providers_parse_mock_payloads()
+    test_chain_matches_fall_through()
+    test_fault_injection()
+    test_replay_matches_recording()
+    test_fetch_benchmark_smoke()
+    test_peak_rss_per_run()
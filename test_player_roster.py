@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Žaidėjų sąrašo saugyklos testavimas - atomiškas rašymas ir sukaupti pakeitimai
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+from player_roster import PlayerRoster
+
+def test_load_does_not_rewrite_clean_file():
+    """Testuoja, kad tvarkingas failas užkraunant neperrašomas, o trūkstami laukai papildomi"""
+    print("🧪 Testuojame sąrašo užkrovimą...")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'players.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump([{'username': 'm1nd3#2311', 'platform': 'battlenet', 'added_date': '2025-01-01',
+                        'last_check': None, 'is_active': True}], f)
+
+        roster = PlayerRoster(path)
+        assert not roster.flush() and roster.writes == 0
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump([{'username': 'senas'}, {'platform': 'psn'}], f)
+        roster.load()
+        assert [player['username'] for player in roster.players] == ['senas']
+        assert roster.players[0]['platform'] == 'battlenet' and roster.dirty
+        assert roster.flush() and roster.writes == 1
+    print("✅ Užkrovimas rašo tik pakeitus duomenis")
+
+def test_checks_are_flushed_once():
+    """Testuoja, kad last_check atnaujinimai išrašomi vienu atominiu įrašymu"""
+    print("🧪 Testuojame sukauptus last_check atnaujinimus...")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'players.json')
+        roster = PlayerRoster(path)
+        for i in range(50):
+            roster.add({'username': f"zaidejas{i}", 'platform': 'battlenet', 'is_active': True})
+        roster.flush()
+
+        for player in roster.players:
+            roster.mark_checked(player, '2026-01-01T12:00:00')
+        assert roster.writes == 1
+        assert roster.flush() and roster.writes == 2
+        assert not roster.flush()
+        assert not os.path.exists(f"{path}.tmp")
+
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        assert len(saved) == 50 and all(player['last_check'] == '2026-01-01T12:00:00' for player in saved)
+
+        assert roster.remove('zaidejas0') is not None and roster.remove('zaidejas0') is None
+        roster.flush()
+        assert len(PlayerRoster(path).players) == 49
+    print("✅ Tikrinimų laikai išrašomi vieną kartą")
+
+def test_writes_run_off_event_loop():
+    """Testuoja, kad veikiant event loop'ui sąrašas rašomas rašymo gijoje"""
+    print("🧪 Testuojame sąrašo rašymą ne event loop'e...")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'players.json')
+        roster = PlayerRoster(path)
+        writers = []
+        original = roster._write
+
+        def write(content, target):
+            writers.append(threading.current_thread().name)
+            return original(content, target)
+
+        roster._write = write
+
+        async def run():
+            roster.add({'username': 'm1nd3#2311', 'platform': 'battlenet', 'is_active': True})
+            assert roster.flush() and not roster.dirty
+            roster.mark_checked(roster.players[0], '2026-01-01T12:00:00')
+            assert roster.flush()
+
+        async def flush():
+            return roster.flush()
+
+        asyncio.run(run())
+        roster.wait()
+        assert writers == ['player-roster_0', 'player-roster_0'] and roster.writes == 2
+        assert PlayerRoster(path).players[0]['last_check'] == '2026-01-01T12:00:00'
+
+        # Nepavykęs įrašymas paliekamas kitam flush
+        roster.players_file = os.path.join(workdir, 'nera', 'players.json')
+        roster.mark_checked(roster.players[0])
+        asyncio.run(flush())
+        roster.wait()
+        assert roster.dirty and roster.writes == 2
+
+        # Pateiktas įrašymas rašo į pateikimo metu nustatytą kelią, net pasikeitus katalogui
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            roster.players_file = 'players.json'
+            roster.mark_checked(roster.players[0], '2026-02-01T12:00:00')
+            asyncio.run(flush())
+        finally:
+            os.chdir(cwd)
+        roster.wait()
+        assert PlayerRoster(path).players[0]['last_check'] == '2026-02-01T12:00:00'
+
+    print("✅ Sąrašas rašomas atskiroje gijoje")
+
+def test_corrupt_file_is_kept():
+    """Testuoja, kad sugadintas failas neperrašomas tuščiu sąrašu"""
+    print("🧪 Testuojame sugadintą žaidėjų failą...")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'players.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('[{"username": "m1nd3#23')
+
+        roster = PlayerRoster(path)
+        assert roster.players == [] and not os.path.exists(path)
+        with open(f"{path}.corrupt", 'r', encoding='utf-8') as f:
+            assert 'm1nd3' in f.read()
+    print("✅ Sugadintas failas išsaugotas kaip .corrupt")
+
+def test_indexes():
+    """Testuoja paiešką pagal vardą, Discord ID ir uno_id"""
+    print("🧪 Testuojame žaidėjų indeksus...")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'players.json')
+        roster = PlayerRoster(path)
+        assert roster.add({'username': 'M1nd3#2311', 'platform': 'battlenet', 'discord_id': '42'})
+        assert not roster.add({'username': ' m1nd3#2311', 'platform': 'battle'})
+        assert roster.find('m1nd3#2311', 'battle')['username'] == 'M1nd3#2311'
+        assert roster.find_by_discord(42) is roster.find('M1nd3#2311')
+        assert roster.find('M1nd3#2311', 'psn') is None
+
+        other = {'username': 'kitas', 'platform': 'psn'}
+        roster.add(other)
+        assert roster.link_discord(roster.find('M1nd3#2311'), 7) == 'taken'
+        assert roster.link_discord(roster.find('M1nd3#2311'), 42) == 'already_linked'
+        assert roster.link_discord(other, 42) == 'linked'
+        assert roster.find_by_discord(42) is other and 'discord_id' not in roster.find('M1nd3#2311')
+
+        roster.remove('KITAS', 'psn')
+        assert roster.find_by_discord(42) is None and len(roster) == 1
+        roster.flush()
+        assert PlayerRoster(path).find('m1nd3#2311') is not None
+    print("✅ Indeksai atnaujinami pridedant, susiejant ir šalinant")
+
+def test_bulk_import():
+    """Testuoja masinį importą iš WarzoneDatabase formato"""
+    print("🧪 Testuojame masinį importą...")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'players.json')
+        roster = PlayerRoster(path)
+        roster.add({'username': 'm1nd3#2311', 'platform': 'battlenet'})
+        roster.flush()
+
+        rows = [{'uno_id': str(1000 + i), 'player_id': f"zaidejas{i}", 'activision_tag': f"Zaidejas{i}#1",
+                 'is_core': False} for i in range(1000)]
+        rows.append({'uno_id': '77', 'activision_tag': 'M1ND3#2311'})
+        rows.append({'player_id': 'be_vardo'})
+        counts = roster.import_players(rows)
+        assert counts == {'added': 1000, 'updated': 1, 'skipped': 1}
+        assert roster.find_by_uno(77)['username'] == 'm1nd3#2311'
+        assert roster.find_by_uno('1999')['username'] == 'Zaidejas999#1'
+        assert roster.import_players(rows)['skipped'] == len(rows)
+
+        assert roster.flush() and roster.writes == 2
+        reloaded = PlayerRoster(path)
+        assert len(reloaded) == 1001 and reloaded.find_by_uno('1500')['username'] == 'Zaidejas500#1'
+    print("✅ Importuota vienu įrašymu, uno_id priskirti")
+
+if __name__ == "__main__":
+    test_load_does_not_rewrite_clean_file()
+    test_checks_are_flushed_once()
+    test_writes_run_off_event_loop()
+    test_corrupt_file_is_kept()
+    test_indexes()
+    test_bulk_import()
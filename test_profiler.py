@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Event loop profiliavimo testavimas
+"""
+
+import asyncio
+import marshal
+import time
+from profiler import LoopProfiler
+
+def busy_parse():
+    """Imituoja CPU darbą event loop'e"""
+    end = time.perf_counter() + 0.02
+    while time.perf_counter() < end:
+        sum(range(1000))
+
+async def busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        busy_parse()
+        await asyncio.sleep(0)
+
+def test_sampling_profile():
+    """Testuoja, kad sampling profilis randa CPU darbą event loop'e"""
+    print("🧪 Testuojame sampling profiliavimą...")
+
+    profiler = LoopProfiler(interval=0.005)
+
+    async def run():
+        worker = asyncio.create_task(busy_loop(0.6))
+        result = await profiler.run(0.5)
+        await worker
+        return result
+
+    result = asyncio.run(run())
+    assert result.filename.endswith('.folded')
+    text = result.data.decode('utf-8')
+    assert 'test_profiler.py:busy_parse' in text
+    for line in text.strip().splitlines():
+        stack, count = line.rsplit(' ', 1)
+        assert int(count) > 0 and ';' in stack
+    assert 'mėginių' in result.summary
+    assert not profiler.busy
+
+    print("✅ Sampling profilis rado busy_parse")
+
+def test_cprofile_and_limits():
+    """Testuoja cProfile režimą ir ribas"""
+    print("🧪 Testuojame cProfile režimą...")
+
+    profiler = LoopProfiler(max_seconds=5)
+
+    async def run():
+        worker = asyncio.create_task(busy_loop(0.3))
+        result = await profiler.run(0.3, 'cprofile')
+        await worker
+        errors = []
+        for seconds, mode in ((10, 'sampling'), (0, 'sampling'), (1, 'nezinomas')):
+            try:
+                await profiler.run(seconds, mode)
+            except ValueError as e:
+                errors.append(str(e))
+        return result, errors
+
+    result, errors = asyncio.run(run())
+    assert result.filename.endswith('.pstats')
+    stats = marshal.loads(result.data)
+    assert any(function[2] == 'busy_parse' for function in stats)
+    assert 'cProfile' in result.summary
+    assert len(errors) == 3
+
+    print("✅ cProfile režimas ir ribos veikia")
+
+if __name__ == "__main__":
+    test_sampling_profile()
+    test_cprofile_and_limits()
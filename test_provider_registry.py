@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Paleidimo testavimas - tiekėjai kuriami tik prireikus, importtime išvestis suprantama
+"""
+
+import os
+import tempfile
+
+from bench.startup import parse_importtime
+from diagnostics import ProviderDiagnostics
+from backoff import shared_scheduler
+from providers import ProviderRegistry, provider_hosts
+from stats_fetcher import FETCH_ORDER, StatsFetcher
+
+def test_registry_creates_providers_lazily():
+    """Testuoja, kad registras kuria tiekėją tik pirmą kartą jo prireikus"""
+    print("🧪 Testuojame tingų tiekėjų registrą...")
+
+    registry = ProviderRegistry(FETCH_ORDER)
+    assert not registry.loaded
+    assert len(registry) == len(FETCH_ORDER)
+    assert FETCH_ORDER[0] in registry and 'nera' not in registry
+
+    provider = registry[FETCH_ORDER[0]]
+    assert registry[FETCH_ORDER[0]] is provider
+    assert list(registry.loaded) == [FETCH_ORDER[0]]
+
+    try:
+        registry['nera']
+        assert False, "Nežinomas raktas turi mesti KeyError"
+    except KeyError:
+        pass
+
+    assert len(registry.values()) == len(FETCH_ORDER)
+    assert registry.values()[0] is provider
+    print("✅ Tiekėjai kuriami tik prireikus ir vėliau pakartotinai naudojami")
+
+def test_all_blocked_keeps_providers_lazy():
+    """Testuoja, kad all_blocked() nekuria tiekėjų, bet mato jų atidėtus host'us"""
+    cwd = os.getcwd()
+    saved_hosts = dict(shared_scheduler.hosts)
+    shared_scheduler.hosts.clear()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            fetcher = StatsFetcher()
+            assert not fetcher.all_blocked()
+            assert not fetcher.providers.loaded
+
+            # Sukurtas tiekėjas tikrinamas pats, kiti - pagal aprašų host'us
+            fetcher.providers[FETCH_ORDER[0]]
+            hosts = {host for key in FETCH_ORDER for host in provider_hosts(key)}
+            for host in hosts:
+                assert not fetcher.all_blocked()
+                shared_scheduler.record_failure(host, 429, {'Retry-After': '300'})
+            assert fetcher.all_blocked()
+            assert list(fetcher.providers.loaded) == [FETCH_ORDER[0]]
+        finally:
+            os.chdir(cwd)
+            shared_scheduler.hosts.clear()
+            shared_scheduler.hosts.update(saved_hosts)
+    print("✅ all_blocked() nekuria tiekėjų")
+
+def test_source_names_from_specs():
+    """Testuoja, kad šaltinių pavadinimai imami iš tiekėjų aprašų"""
+    assert StatsFetcher.source_text('rapidapi_cod') == 'RapidAPI COD'
+    assert StatsFetcher.source_text('reliable_api') == 'Patikimas API'
+    assert StatsFetcher.source_text('cod_stats_api') == 'COD Stats API'
+    assert StatsFetcher.source_text('stale_data') == 'Paskutiniai žinomi duomenys'
+    assert StatsFetcher.source_text('nera') == 'Nežinomas šaltinis'
+    assert all(StatsFetcher.source_text(key) != 'Nežinomas šaltinis' for key in FETCH_ORDER)
+    print("✅ Šaltinių pavadinimai iš aprašų")
+
+def test_diagnostics_created_lazily():
+    """Testuoja, kad diagnostika nekuria tiekėjų ir Activision API iki pirmo !test"""
+    diagnostics = ProviderDiagnostics(stats_fetcher=None)
+    assert not diagnostics.providers.loaded and diagnostics._activision_api is None
+
+    api = diagnostics.activision_api
+    assert diagnostics.activision_api is api
+    print("✅ Diagnostikos tiekėjai kuriami tik prireikus")
+
+def test_parse_importtime():
+    """Testuoja -X importtime išvesties nuskaitymą"""
+    print("🧪 Testuojame importtime išvesties nuskaitymą...")
+
+    output = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        120 |     logs\n"
+              "import time:      2500 |      31000 | stats_fetcher\n"
+              "kita eilutė\n")
+    modules = parse_importtime(output)
+    assert [entry['module'] for entry in modules] == ['logs', 'stats_fetcher']
+    assert modules[1]['self_ms'] == 2.5 and modules[1]['cumulative_ms'] == 31.0
+    print("✅ Importtime eilutės nuskaitomos")
+
+if __name__ == "__main__":
+    test_registry_creates_providers_lazily()
+    test_all_blocked_keeps_providers_lazy()
+    test_source_names_from_specs()
+    test_diagnostics_created_lazily()
+    test_parse_importtime()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Event loop stabdžių detektoriaus testavimas
+"""
+
+import asyncio
+import time
+from metrics import LOOP_STALLS
+from stall_watchdog import StallWatchdog
+
+def blocking_save():
+    """Imituoja sinchroninį failo rašymą event loop'e"""
+    time.sleep(0.4)
+
+def test_stall_attributed_to_call_site():
+    """Testuoja, kad stabdis priskiriamas blokuojančiam kvietimui"""
+    print("🧪 Testuojame event loop stabdžių detektorių...")
+
+    watchdog = StallWatchdog(threshold=0.1, interval=0.02)
+
+    async def run():
+        task = asyncio.create_task(watchdog.run())
+        await asyncio.sleep(0.1)
+        blocking_save()
+        await asyncio.sleep(0.1)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(run())
+
+    top = watchdog.top()
+    assert top, "stabdis neužfiksuotas"
+    site = top[0]
+    assert site['site'].startswith('test_stall_watchdog.py:') and site['site'].endswith('blocking_save')
+    assert site['count'] == 1 and site['max'] >= 0.3
+    assert any('run' in frame for frame in site['stack'])
+    # Metrikos etiketėje nėra eilutės numerio (ribotas serijų skaičius)
+    assert LOOP_STALLS.labels('test_stall_watchdog.py:blocking_save').value == 1
+    assert not watchdog.running
+
+    report = watchdog.format_report()
+    assert 'blocking_save' in report
+
+    print("✅ Stabdis priskirtas blokuojančiai vietai")
+
+def test_report_without_stalls():
+    """Testuoja ataskaitą, kai stabdžių nėra"""
+    watchdog = StallWatchdog()
+    assert "nepaleistas" in watchdog.format_report()
+    watchdog.running = True
+    assert "neužfiksuota" in watchdog.format_report()
+    print("✅ Ataskaita be stabdžių")
+
+if __name__ == "__main__":
+    test_report_without_stalls()
+    test_stall_attributed_to_call_site()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Statistikos ištraukimo testavimas (be tinklo)
+"""
+
+from stat_extractor import StatExtractor, FULL_FIELD_MAP, BASIC_FIELD_MAP
+from tracker_api import TrackerGGAPI
+
+def make_tracker_payload(kills, deaths):
+    stats = [
+        {'metadata': {'key': 'kills'}, 'value': kills},
+        {'metadata': {'key': 'deaths'}, 'value': deaths},
+        {'metadata': {'key': 'kdRatio'}, 'value': round(kills / deaths, 2)},
+        {'metadata': {'key': 'wins'}, 'value': 12},
+        {'metadata': {'key': 'gamesPlayed'}, 'value': 300},
+        {'metadata': {'key': 'newStatFromApi'}, 'value': 1}
+    ]
+    return {'data': {'platformInfo': {'platformUserId': 'm1nd3#2311'}, 'stats': stats}}
+
+def test_tracker_payload():
+    """Testuoja Tracker.gg atsakymo apdorojimą"""
+    print("🧪 Testuojame Tracker.gg atsakymo apdorojimą...")
+
+    stats = TrackerGGAPI().parse_stats(make_tracker_payload(1500, 600), 'm1nd3', 'battlenet')
+    assert stats.username == 'm1nd3#2311'
+    assert stats.kills == 1500 and stats.deaths == 600
+    assert stats.kd_ratio == 2.5
+    assert stats.games_played == 300
+    assert stats.revives == 0
+
+    print("✅ Tracker.gg atsakymas apdorotas")
+
+def test_missing_and_unknown_keys():
+    """Testuoja trūkstamų ir nežinomų raktų aptikimą"""
+    print("🧪 Testuojame raktų ataskaitą...")
+
+    extractor = StatExtractor(BASIC_FIELD_MAP, "Test")
+    index = extractor.index_metadata(make_tracker_payload(10, 5)['data']['stats'])
+    assert extractor.missing_keys(index) == {'top10', 'scorePerMinute'}
+    assert extractor.unknown_keys(index) == {'newStatFromApi'}
+
+    extractor.report(index)
+    assert '+newStatFromApi' in extractor.reported_keys
+
+    print("✅ Raktų ataskaita veikia")
+
+def test_extract_many():
+    """Testuoja daugelio įrašų apdorojimą vienu kartu"""
+    print("🧪 Testuojame paketinį apdorojimą...")
+
+    extractor = StatExtractor(FULL_FIELD_MAP)
+    flat = [{'kills': i, 'deaths': i + 1, 'kdRatio': 0.5} for i in range(1000)]
+    rows = extractor.extract_many(flat)
+    assert len(rows) == 1000
+    assert rows[999]['kills'] == 999 and rows[999]['wins'] == 0
+
+    nested = [make_tracker_payload(20, 10)['data']['stats']] * 3
+    rows = extractor.extract_many(nested, metadata=True)
+    assert [row['kd_ratio'] for row in rows] == [2.0, 2.0, 2.0]
+
+    tuples = extractor.extract_rows(flat[:2])
+    assert tuples[1][:3] == (1, 2, 0.5)
+
+    print("✅ Paketinis apdorojimas veikia")
+
+if __name__ == "__main__":
+    test_tracker_payload()
+    test_missing_and_unknown_keys()
+    test_extract_many()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Statistikos istorijos testavimas (be tinklo)
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from backoff import BackoffScheduler
+from stats_fetcher import StatsFetcher
+from stats_history import StatsHistory
+from player_stats import PlayerStats
+
+def make_stats(kills, deaths):
+    return PlayerStats(
+        username='m1nd3#2311',
+        platform='battlenet',
+        kills=kills,
+        deaths=deaths,
+        kd_ratio=round(kills / deaths, 2),
+        games_played=kills // 3
+    )
+
+def test_delta_encoding_and_reload():
+    """Testuoja delta kodavimą ir indekso atkūrimą"""
+    print("🧪 Testuojame delta kodavimą...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history_file = os.path.join(tmp, 'history.jsonl')
+        history = StatsHistory(history_file)
+        now = time.time()
+
+        history.append('m1nd3#2311', 'battlenet', make_stats(100, 50), now - 120)
+        first_size = os.path.getsize(history_file)
+        history.append('m1nd3#2311', 'battlenet', make_stats(100, 50), now - 60)
+        unchanged_size = os.path.getsize(history_file) - first_size
+        history.append('m1nd3#2311', 'battlenet', make_stats(110, 52), now)
+
+        print(f"   Pilnas įrašas: {first_size} B, nepakitęs: {unchanged_size} B")
+        assert unchanged_size < 50
+
+        reloaded = StatsHistory(history_file)
+        points = reloaded.get_range('m1nd3#2311', 'battlenet')
+        assert len(points) == 3
+        assert points[-1][1]['kills'] == 110
+        assert points[-1][1]['deaths'] == 52
+
+        trend = reloaded.trend('m1nd3#2311', 'battlenet', 'kd_ratio', days=30)
+        assert trend['first'] == 2.0 and trend['last'] == 2.12
+
+    print("✅ Delta kodavimas veikia")
+
+def test_downsampling():
+    """Testuoja senų snapshot'ų retinimą"""
+    print("🧪 Testuojame istorijos retinimą...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history_file = os.path.join(tmp, 'history.jsonl')
+        history = StatsHistory(history_file, compact_interval=10 ** 9)
+        now = datetime.now()
+
+        # 60 dienų po snapshot'ą kas 10 minučių
+        start = now - timedelta(days=60)
+        for i in range(60 * 24 * 6):
+            moment = start + timedelta(minutes=10 * i)
+            history.append('m1nd3#2311', 'battlenet', make_stats(100 + i, 50 + i // 2), moment.timestamp())
+
+        before = len(history.get_range('m1nd3#2311', 'battlenet'))
+        history.compact(now.timestamp())
+        after = len(history.get_range('m1nd3#2311', 'battlenet'))
+        print(f"   Snapshot'ų prieš: {before}, po: {after}")
+        assert after < before
+
+        # Naujausi duomenys lieka nepaliesti
+        last_week = history.get_range('m1nd3#2311', 'battlenet', now - timedelta(days=6))
+        assert len(last_week) >= 6 * 24 * 6 - 1
+
+        reloaded = StatsHistory(history_file)
+        assert len(reloaded.get_range('m1nd3#2311', 'battlenet')) == after
+        assert reloaded.latest('m1nd3#2311', 'battlenet')[1] == history.latest('m1nd3#2311', 'battlenet')[1]
+
+    print("✅ Retinimas veikia")
+
+def test_compaction_survives_restart():
+    """Testuoja, kad retinimo laikas išsaugomas ir po perkrovimo failas neperrašomas"""
+    print("🧪 Testuojame retinimo laiką po perkrovimo...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history_file = os.path.join(tmp, 'history.jsonl')
+        now = time.time()
+        history = StatsHistory(history_file)
+        history.append('m1nd3#2311', 'battlenet', make_stats(100, 50), now - 3600)
+        history.compact(now - 60)
+
+        reloaded = StatsHistory(history_file)
+        assert reloaded.last_compaction == int(now - 60)
+        compacted_at = os.stat(history_file).st_ino
+        reloaded.append('m1nd3#2311', 'battlenet', make_stats(110, 52), now)
+        # Papildyta, o ne perrašyta (os.replace pakeistų failo inode)
+        assert os.stat(history_file).st_ino == compacted_at
+        assert len(StatsHistory(history_file).get_range('m1nd3#2311', 'battlenet')) == 2
+
+    print("✅ Retinimas po perkrovimo nekartojamas")
+
+def test_writes_run_off_event_loop():
+    """Testuoja, kad veikiant event loop'ui failas rašomas rašymo gijoje"""
+    print("🧪 Testuojame istorijos rašymą ne event loop'e...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history_file = os.path.join(tmp, 'history.jsonl')
+        history = StatsHistory(history_file)
+        writers = []
+        original = history._append_line
+
+        def append_line(line):
+            writers.append(threading.current_thread().name)
+            original(line)
+
+        history._append_line = append_line
+
+        async def run():
+            for i in range(20):
+                history.append('m1nd3#2311', 'battlenet', make_stats(100 + i, 50), time.time() + i)
+            # Indeksas atnaujinamas iškart, failas - rašymo gijoje
+            assert len(history.get_range('m1nd3#2311', 'battlenet')) == 20
+
+        asyncio.run(run())
+        history.flush()
+        assert writers and all(name.startswith('stats-history') for name in writers)
+        assert len(StatsHistory(history_file).get_range('m1nd3#2311', 'battlenet')) == 20
+
+    print("✅ Istorija rašoma atskiroje gijoje")
+
+def test_serve_stale_when_all_blocked():
+    """Testuoja, kad visiems API host'ams atidėtiems grąžinami paskutiniai žinomi duomenys be užklausų"""
+    print("🧪 Testuojame paskutinių žinomų duomenų grąžinimą...")
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            fetcher = StatsFetcher()
+            scheduler = BackoffScheduler()
+            for provider in fetcher.providers.values():
+                for member in getattr(provider, 'members', [provider]):
+                    member.scheduler = scheduler
+                    scheduler.record_failure(member.host, 429, {'Retry-After': '300'})
+
+            assert fetcher.all_blocked()
+            assert asyncio.run(fetcher.get_player_stats('naujokas', 'battlenet')) is None
+
+            two_hours_ago = (datetime.now() - timedelta(hours=2, minutes=5)).timestamp()
+            fetcher.stats_history.append('m1nd3#2311', 'battlenet', make_stats(100, 50), two_hours_ago)
+
+            start = time.perf_counter()
+            stats = asyncio.run(fetcher.get_player_stats('m1nd3#2311', 'battlenet'))
+            elapsed = time.perf_counter() - start
+
+            # Seni duomenys nelaikomi patikrinimu - last_check nekeičiamas
+            fetcher.roster.add({'username': 'm1nd3#2311', 'platform': 'battlenet', 'last_check': None})
+            all_stats = asyncio.run(fetcher.get_all_players_stats())
+            assert [entry.source for entry in all_stats] == ['stale_data']
+            assert fetcher.roster.find('m1nd3#2311')['last_check'] is None
+            fetcher.roster.wait()
+        finally:
+            os.chdir(cwd)
+
+        assert stats.kills == 100 and stats.is_fallback and stats.source == 'stale_data'
+        assert elapsed < 1
+        # Seni duomenys į istoriją neįrašomi pakartotinai
+        assert len(fetcher.stats_history.get_range('m1nd3#2311', 'battlenet')) == 1
+
+        message = fetcher.format_stats_message(stats)
+        print(message)
+        assert "prieš 2 val. 5 min." in message
+
+    print("✅ Paskutiniai žinomi duomenys grąžinami iškart")
+
+if __name__ == "__main__":
+    test_delta_encoding_and_reload()
+    test_downsampling()
+    test_compaction_survives_restart()
+    test_writes_run_off_event_loop()
+    test_serve_stale_when_all_blocked()
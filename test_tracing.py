@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Užklausų sekimo (tracing) testavimas (be interneto)
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+from aiohttp import web
+from backoff import BackoffScheduler
+from http_cache import HTTPCache
+from http_client import HTTPClient
+from message_queue import OutboundQueue
+from providers import HTTPProvider, PROVIDER_SPECS
+from tracing import NOOP_SPAN, Tracer, collapse, current_span, span
+
+PAYLOAD = {"stats": {"username": "m1nd3", "kills": 1500, "deaths": 750, "kdRatio": 2.0}}
+
+class FakeChannel:
+    id = 1
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content):
+        self.sent.append(content)
+        return content
+
+def _names(data):
+    names = [data['name']]
+    for child in data.get('children', []):
+        names.extend(_names(child))
+    return names
+
+def _find(data, name):
+    if data['name'] == name:
+        return data
+    for child in data.get('children', []):
+        found = _find(child, name)
+        if found:
+            return found
+    return None
+
+def test_spans_nest_across_tasks():
+    """Testuoja span'ų medį, lygiagrečias užduotis ir eksportą"""
+    print("🧪 Testuojame span'ų medį...")
+
+    with span('be_sekos') as orphan:
+        assert orphan is NOOP_SPAN
+
+    async def attempt(name):
+        with span('provider', provider=name) as current:
+            await asyncio.sleep(0.01)
+            current.set(status=200)
+
+    async def run(tracer):
+        with tracer.trace('!test', args='m1nd3') as root:
+            await asyncio.gather(attempt('a'), attempt('b'))
+            try:
+                with span('parse'):
+                    raise ValueError("blogas JSON")
+            except ValueError:
+                pass
+        assert current_span() is None
+        return root
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'traces.jsonl')
+        tracer = Tracer(capacity=2, export_path=path)
+        root = asyncio.run(run(tracer))
+        with open(path, 'r', encoding='utf-8') as f:
+            exported = [json.loads(line) for line in f]
+
+    data = root.to_dict()
+    assert [child['name'] for child in data['children']] == ['provider', 'provider', 'parse']
+    assert data['children'][0]['attributes'] == {'provider': 'a', 'status': 200}
+    assert data['children'][2]['error'] == 'ValueError'
+    assert exported and exported[0]['name'] == '!test'
+
+    folded = collapse(exported[0])
+    assert '!test;provider' in folded and '!test;parse' in folded
+
+    assert tracer.recent() is root
+    assert 'provider' in tracer.format_trace()
+    assert 'Sekos nėra' in tracer.format_trace(5)
+
+    print("✅ Span'ai sudaro medį ir eksportuojami")
+
+def test_provider_and_send_spans():
+    """Testuoja tiekėjo, HTTP, talpyklos, parsinimo ir Discord siuntimo span'us"""
+    print("🧪 Testuojame tiekėjo sekas...")
+
+    async def profile(request):
+        return web.json_response(PAYLOAD)
+
+    async def run(db_path):
+        app = web.Application()
+        app.router.add_get('/warzone/{username}/{platform}', profile)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        spec = {**PROVIDER_SPECS['alternative_api'], 'base_url': f"http://127.0.0.1:{port}"}
+        provider = HTTPProvider('trace_test_api', spec)
+        provider.scheduler = BackoffScheduler()
+        provider.client = HTTPClient(cache=HTTPCache(db_path))
+        queue = OutboundQueue()
+        channel = FakeChannel()
+        tracer = Tracer()
+        try:
+            with tracer.trace('!statistika') as root:
+                stats = await provider.get_player_stats('m1nd3#2311')
+                await queue.send(channel, f"Kills: {stats.kills}")
+        finally:
+            await provider.client.close()
+            await runner.cleanup()
+        return root.to_dict(), channel.sent
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data, sent = asyncio.run(run(os.path.join(tmp, 'cache.db')))
+
+    names = _names(data)
+    for name in ('http', 'cache.lookup', 'decode', 'parse', 'discord.send'):
+        assert name in names, f"{name} nėra: {names}"
+    http = _find(data, 'http')
+    assert http['attributes']['status'] == 200
+    assert http['attributes']['bytes'] > 0
+    assert _find(data, 'cache.lookup')['attributes']['result'] == 'miss'
+    assert _find(data, 'discord.send')['attributes']['bytes'] == len("Kills: 1500")
+    assert sent == ["Kills: 1500"]
+
+    print("✅ Tiekėjo ir siuntimo span'ai užfiksuoti")
+
+if __name__ == "__main__":
+    test_spans_nest_across_tasks()
+    test_provider_and_send_spans()
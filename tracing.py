@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Užklausų sekimas (tracing) - kiekviena komanda ar stebėjimo ciklas yra šakninis span'as,
+o tiekėjų bandymai, HTTP užklausos, talpyklos paieška, parsinimas ir Discord siuntimas -
+vaikiniai span'ai. Dabartinis span'as perduodamas per contextvars, todėl jis pasiekiamas
+ir lygiagrečiose užduotyse. Paskutinės sekos laikomos žiedo buferyje (!trace), o nurodžius
+TRACE_EXPORT - papildomai rašomos į JSONL failą.
+
+Konvertavimas į flame graph formatą (collapsed stacks):
+    python tracing.py traces.jsonl > traces.folded
+"""
+
+import asyncio
+import contextvars
+import json
+import os
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Deque, Dict, Iterator, List, Optional
+
+from logs import get_logger
+
+log = get_logger('tracing')
+
+MAX_SPANS_PER_TRACE = 2000
+
+_current: contextvars.ContextVar = contextvars.ContextVar('trace_span', default=None)
+
+
+class Span:
+    __slots__ = ('name', 'attributes', 'root', 'children', 'start', 'duration', 'started_at',
+                 'error', 'span_count', 'dropped', 'token')
+
+    def __init__(self, name: str, attributes: Dict, root: Optional['Span'] = None):
+        self.name = name
+        self.attributes = attributes
+        self.root = root or self
+        self.children: List['Span'] = []
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.started_at = datetime.now()
+        self.error: Optional[str] = None
+        self.span_count = 1
+        self.dropped = 0
+        self.token = None
+
+    def set(self, **attributes):
+        """Prideda atributus (pvz. status, bytes)"""
+        self.attributes.update(attributes)
+
+    def finish(self):
+        if self.duration is None:
+            self.duration = time.perf_counter() - self.start
+
+    def to_dict(self, origin: Optional[float] = None) -> Dict:
+        """Span'as su vaikais (laikai milisekundėmis nuo šakninio span'o pradžios)"""
+        origin = self.start if origin is None else origin
+        data = {
+            'name': self.name,
+            'start_ms': round((self.start - origin) * 1000, 2),
+            'duration_ms': round((self.duration if self.duration is not None
+                                  else time.perf_counter() - self.start) * 1000, 2),
+            'attributes': self.attributes
+        }
+        if self.error:
+            data['error'] = self.error
+        if self.root is self:
+            data['started_at'] = self.started_at.isoformat()
+            if self.dropped:
+                data['dropped_spans'] = self.dropped
+        if self.children:
+            data['children'] = [child.to_dict(origin) for child in self.children]
+        return data
+
+
+class _NoopSpan:
+    """Span'as, kai seka neaktyvi - atributai ignoruojami"""
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def current_span() -> Optional[Span]:
+    """Aktyvus span'as (None - seka neaktyvi)"""
+    return _current.get()
+
+
+def annotate(**attributes):
+    """Prideda atributus aktyviam span'ui (jei seka aktyvi)"""
+    current = _current.get()
+    if current is not None:
+        current.attributes.update(attributes)
+
+
+@contextmanager
+def span(name: str, parent: Optional[Span] = None, **attributes) -> Iterator:
+    """
+    Vaikinis span'as - be aktyvios sekos nieko nematuoja
+    :param parent: tėvinis span'as (numatyta - dabartinis), pvz. užfiksuotas įdedant į eilę
+    """
+    parent = parent or _current.get()
+    if parent is None:
+        yield NOOP_SPAN
+        return
+
+    root = parent.root
+    if root.span_count >= MAX_SPANS_PER_TRACE:
+        root.dropped += 1
+        yield NOOP_SPAN
+        return
+    root.span_count += 1
+
+    child = Span(name, attributes, root)
+    parent.children.append(child)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.error = type(e).__name__
+        raise
+    finally:
+        child.finish()
+        _current.reset(token)
+
+
+class Tracer:
+    def __init__(self, capacity: int = 50, export_path: Optional[str] = None):
+        """
+        Inicializuoja sekų saugyklą
+        :param capacity: kiek paskutinių sekų laikyti atmintyje
+        :param export_path: JSONL failas baigtoms sekoms (None - neeksportuojama)
+        """
+        self.traces: Deque[Span] = deque(maxlen=capacity)
+        self.export_path = export_path
+
+    @classmethod
+    def from_env(cls) -> 'Tracer':
+        """Nustatymai iš TRACE_BUFFER ir TRACE_EXPORT"""
+        return cls(int(os.getenv('TRACE_BUFFER', '50')), os.getenv('TRACE_EXPORT') or None)
+
+    def start(self, name: str, **attributes) -> Span:
+        """
+        Pradeda šakninį span'ą dabartiniame kontekste (baigti su finish tame pačiame task'e)
+        """
+        root = Span(name, attributes)
+        root.token = _current.set(root)
+        return root
+
+    def finish(self, root: Span):
+        """Baigia šakninį span'ą, įdeda į buferį ir eksportuoja"""
+        root.finish()
+        if root.token is not None:
+            try:
+                _current.reset(root.token)
+            except ValueError:
+                # Baigta kitame kontekste - dabartinio konteksto nekeičiame
+                pass
+            root.token = None
+        self.traces.append(root)
+        if self.export_path:
+            self._export(json.dumps(root.to_dict(), ensure_ascii=False, default=str))
+
+    @contextmanager
+    def trace(self, name: str, **attributes) -> Iterator[Span]:
+        """Šakninis span'as kaip context manager"""
+        root = self.start(name, **attributes)
+        try:
+            yield root
+        except BaseException as e:
+            root.error = type(e).__name__
+            raise
+        finally:
+            self.finish(root)
+
+    def _export(self, line: str):
+        """Rašo eilutę į JSONL ne event loop'e (jei jis veikia)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(line)
+            return
+        loop.run_in_executor(None, self._write, line)
+
+    def _write(self, line: str):
+        try:
+            with open(self.export_path, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+        except Exception as e:
+            log.exception("Klaida eksportuojant seką", path=self.export_path)
+
+    def recent(self, index: int = 1) -> Optional[Span]:
+        """n-ta nuo galo baigta seka (1 - naujausia)"""
+        if index < 1 or index > len(self.traces):
+            return None
+        return self.traces[-index]
+
+    def format_trace(self, index: int = 1) -> str:
+        """Discord žinutė su sekos medžiu"""
+        root = self.recent(index)
+        if root is None:
+            return f"❌ Sekos nėra (saugoma {len(self.traces)})"
+
+        data = root.to_dict()
+        header = (f"🔎 **{data['name']}** {data['duration_ms']:.0f} ms "
+                  f"({root.started_at:%H:%M:%S}, {index}/{len(self.traces)})")
+        lines: List[str] = []
+        _tree_lines(data, 0, lines)
+        if root.dropped:
+            lines.append(f"... ir dar {root.dropped} span'ų neįrašyta")
+
+        body = ""
+        for line in lines:
+            if len(header) + len(body) + len(line) + 16 > 2000:
+                body += "...\n"
+                break
+            body += line + "\n"
+        return f"{header}\n```\n{body}```"
+
+
+def _tree_lines(data: Dict, depth: int, lines: List[str]):
+    attributes = " ".join(f"{key}={value}" for key, value in data['attributes'].items())
+    error = f" ❌{data['error']}" if data.get('error') else ""
+    lines.append(f"{'  ' * depth}{data['name']} +{data['start_ms']:.0f} {data['duration_ms']:.0f}ms"
+                 f"{error} {attributes}".rstrip())
+    for child in data.get('children', []):
+        _tree_lines(child, depth + 1, lines)
+
+
+def collapse(data: Dict, prefix: str = '', out: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """
+    Sekos medis collapsed stacks formatu: 'šaknis;vaikas;anūkas' -> savas laikas (ms).
+    Lygiagrečių vaikų suma gali viršyti tėvo trukmę - tada tėvo savas laikas 0.
+    """
+    out = {} if out is None else out
+    path = f"{prefix};{data['name']}" if prefix else data['name']
+    children = data.get('children', [])
+    own = data['duration_ms'] - sum(child['duration_ms'] for child in children)
+    out[path] = out.get(path, 0.0) + max(0.0, own)
+    for child in children:
+        collapse(child, path, out)
+    return out
+
+
+# Bendra boto sekų saugykla
+tracer = Tracer.from_env()
+
+
+def main():
+    """JSONL eksportas -> collapsed stacks (flamegraph.pl, speedscope)"""
+    if len(sys.argv) != 2:
+        print("Naudojimas: python tracing.py traces.jsonl > traces.folded")
+        sys.exit(1)
+    totals: Dict[str, float] = {}
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                collapse(json.loads(line), out=totals)
+    for path, ms in totals.items():
+        # flamegraph.pl tikisi sveikų skaičių - mikrosekundės
+        if ms > 0:
+            print(f"{path.replace(' ', '_')} {int(ms * 1000)}")
+
+
+if __name__ == "__main__":
+    main()